@@ -0,0 +1,201 @@
+# arena.py Contiguous state for many filter channels
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# The state of every channel is allocated from one preallocated integer array
+# so that creating hundreds of channels does not fragment the heap. A channel
+# is identified by a handle: the offset of its state in the array. States are
+# allocated upwards from the start of the array and coefficients downwards
+# from the end, so all state lies in one region which may be reset, saved or
+# restored with a single copy. Channels sharing a coefficient array share one
+# copy of it.
+# A bulk step advances every channel with one new sample each in a single
+# Viper call.
+
+# Channel state:
+# FIR [FIR, ncoeffs, shift, insertion index, coeffs offset, ring buffer...]
+# AVG [AVG, n, shift (-1 == divide), insertion index, sum, ring buffer...]
+# Coefficients are in fir order (the last applies to the newest sample).
+
+from array import array
+
+FIR = const(0)
+AVG = const(1)
+_HDR = const(5)
+
+
+# Advance each channel in table [nchans, handle...] with the corresponding
+# sample in src, writing the results to dst.
+@micropython.viper
+def arena_step(arena, table, src, dst):
+    p = ptr32(arena)
+    t = ptr32(table)
+    s = ptr32(src)
+    d = ptr32(dst)
+    nch: int = t[0]
+    c: int = 0
+    while c < nch:
+        h: int = t[c + 1]
+        x: int = s[c]
+        n: int = p[h + 1]
+        shift: int = p[h + 2]
+        i: int = p[h + 3]
+        ring: int = h + _HDR
+        end: int = n - 1
+        res: int = 0
+        if p[h] == FIR:
+            co: int = p[h + 4]
+            p[ring + i] = x
+            i = (i + 1) if (i < end) else 0
+            p[h + 3] = i
+            for k in range(n):
+                res += (p[co + k] * p[ring + i]) >> shift
+                i = (i + 1) if (i < end) else 0
+        else:
+            res = p[h + 4] - p[ring + i] + x
+            p[h + 4] = res
+            p[ring + i] = x
+            p[h + 3] = (i + 1) if (i < end) else 0
+            if shift < 0:  # Truncate towards zero as avg does
+                if res >= 0:
+                    res //= n
+                else:
+                    res = 0 - ((0 - res) // n)
+            else:
+                res >>= shift
+        d[c] = res
+        c += 1
+
+
+# Zero the history of each channel in table.
+@micropython.viper
+def arena_reset(arena, table):
+    p = ptr32(arena)
+    t = ptr32(table)
+    nch: int = t[0]
+    for c in range(nch):
+        h: int = t[c + 1]
+        p[h + 3] = 0
+        if p[h] == AVG:
+            p[h + 4] = 0
+        for k in range(p[h + 1]):
+            p[h + _HDR + k] = 0
+
+
+@micropython.viper
+def _copy(dst, src, n: int):
+    d = ptr32(dst)
+    s = ptr32(src)
+    for i in range(n):
+        d[i] = s[i]
+
+
+class Arena:
+    # size: no. of integers in the arena. maxchans: capacity of the channel
+    # table.
+    def __init__(self, size, maxchans=128):
+        self._buf = array('i', (0 for _ in range(size)))
+        self._table = array('i', (0 for _ in range(maxchans + 1)))
+        self._top = 0  # End of state region
+        self._bot = size  # Start of coefficient region
+        self._coeffs = {}  # id(coeffs): (coeffs, offset)
+        # Single channel step without allocation
+        self._one = array('i', (1, 0))
+        self._x = array('i', (0,))
+        self._y = array('i', (0,))
+
+    def _alloc(self, n):
+        if self._top + n > self._bot:
+            raise ValueError('Arena full.')
+        if self._table[0] >= len(self._table) - 1:
+            raise ValueError('Channel table full.')
+        h = self._top
+        self._top += n
+        t = self._table
+        t[0] += 1
+        t[t[0]] = h
+        return h
+
+    # Add an FIR channel. coeffs, shift: as per fir. Returns a handle.
+    def fir(self, coeffs, shift=0):
+        n = len(coeffs)
+        if n < 1:
+            raise ValueError('At least one coefficient is required.')
+        if not 0 <= shift <= 31:
+            raise ValueError('Shift must be in range 0-31.')
+        key = id(coeffs)
+        if key in self._coeffs:  # Shared
+            co = self._coeffs[key][1]
+        else:
+            if self._bot - n < self._top + _HDR + n:
+                raise ValueError('Arena full.')
+            self._bot -= n
+            co = self._bot
+            for i in range(n):
+                self._buf[co + i] = coeffs[i]
+            self._coeffs[key] = (coeffs, co)  # Retain: ids must stay unique
+        h = self._alloc(_HDR + n)
+        b = self._buf
+        b[h] = FIR
+        b[h + 1] = n
+        b[h + 2] = shift
+        b[h + 4] = co
+        return h
+
+    # Add a moving average of n samples. The sum is divided by n if shift is
+    # -1, otherwise shifted right by shift bits. Returns a handle.
+    def avg(self, n, shift=-1):
+        if n < 1:
+            raise ValueError('n must be >= 1.')
+        if not -1 <= shift <= 31:
+            raise ValueError('Shift must be in range -1 to 31.')
+        h = self._alloc(_HDR + n)
+        b = self._buf
+        b[h] = AVG
+        b[h + 1] = n
+        b[h + 2] = shift
+        return h
+
+    # Step one channel. May be called from a hard ISR.
+    def __call__(self, handle, x):
+        self._one[1] = handle
+        self._x[0] = x
+        arena_step(self._buf, self._one, self._x, self._y)
+        return self._y[0]
+
+    # Step all channels in order of creation: src[i] is the sample for
+    # channel i and the result is written to dst[i]. src and dst are integer
+    # arrays (they may be the same). May be called from a hard ISR.
+    def step(self, src, dst):
+        arena_step(self._buf, self._table, src, dst)
+
+    def __len__(self):
+        return self._table[0]
+
+    # Clear the history of all channels.
+    def reset(self):
+        arena_reset(self._buf, self._table)
+
+    # No. of integers of state: the size of a snapshot.
+    def statelen(self):
+        return self._top
+
+    # No. of unallocated integers.
+    def free(self):
+        return self._bot - self._top
+
+    # Copy the state of all channels to an integer array of at least
+    # statelen() elements.
+    def snapshot(self, buf):
+        if len(buf) < self._top:
+            raise ValueError('Snapshot buffer must have at least {} elements.'.format(self._top))
+        _copy(buf, self._buf, self._top)
+        return buf
+
+    # Restore all states from a snapshot of this arena.
+    def restore(self, buf):
+        b = self._buf
+        if len(buf) < self._top or any(buf[h] != b[h] or buf[h + 1] != b[h + 1]
+                                        for h in self._table[1:self._table[0] + 1]):
+            raise ValueError('Snapshot does not match arena.')
+        _copy(b, buf, self._top)
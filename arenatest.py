@@ -0,0 +1,96 @@
+# arenatest.py Test/demo of the filter state arena
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# 120 channels (FIR filters sharing two coefficient sets, and moving averages)
+# are stepped together and compared with individual filter objects. Bulk
+# reset, snapshot and restore are checked. Runs on any platform.
+
+from array import array
+from time import ticks_us, ticks_diff
+from arena import Arena
+from filters import FIR, MovingAverage
+
+lpf = array('i', (-251, -449, -545, -309, 444, 1819, 3788, 6118, 8431, 10292,
+                  11287, 10292, 8431, 6118, 3788, 1819, 444, -309, -545, -449, -251))
+diff = array('i', (1, 0, -1))
+NCH = 120
+NSTEPS = 200
+
+
+def make():
+    ar = Arena(4000, NCH)
+    refs = []
+    for c in range(NCH):
+        sel = c % 4
+        if sel == 0:
+            ar.fir(lpf, 16)
+            refs.append(FIR(lpf, 16))
+        elif sel == 1:
+            ar.fir(diff)
+            refs.append(FIR(diff))
+        elif sel == 2:
+            ar.avg(10)
+            refs.append(MovingAverage(10))
+        else:
+            ar.avg(8, 3)
+            refs.append(MovingAverage(8, 3))
+    return ar, refs
+
+
+def sample(c, n):
+    return ((c * 7 + n * 13) % 97) * 3 - 143  # Averages leave remainders
+
+
+def run(ar, start, nsteps, refs=None):
+    src = array('i', (0 for _ in range(NCH)))
+    dst = array('i', (0 for _ in range(NCH)))
+    ok = True
+    out = []
+    for n in range(start, start + nsteps):
+        for c in range(NCH):
+            src[c] = sample(c, n)
+        ar.step(src, dst)
+        out.append(bytes(dst))
+        if refs is not None:
+            ok = ok and all(dst[c] == refs[c](src[c]) for c in range(NCH))
+    return ok, out
+
+
+def test():
+    ar, refs = make()
+    print('{} channels, {} integers of state, {} free'.format(len(ar), ar.statelen(), ar.free()))
+    ok, _ = run(ar, 0, NSTEPS, refs)
+    print('Bulk step matches filter objects', 'Pass' if ok else 'FAIL')
+    snap = ar.snapshot(array('i', (0 for _ in range(ar.statelen()))))
+    _, a = run(ar, NSTEPS, 50)
+    ar.restore(snap)
+    _, b = run(ar, NSTEPS, 50)
+    good = a == b
+    print('Snapshot and restore', 'Pass' if good else 'FAIL')
+    ok = ok and good
+    ar.reset()
+    fresh, _ = make()
+    _, a = run(ar, 0, 30)
+    _, b = run(fresh, 0, 30)
+    good = a == b
+    print('Bulk reset', 'Pass' if good else 'FAIL')
+    ok = ok and good
+    # Single channel: handle 0 is the first channel (FIR)
+    ar.reset()
+    ref = FIR(lpf, 16)
+    good = all(ar(0, sample(0, n)) == ref(sample(0, n)) for n in range(50))
+    print('Single channel', 'Pass' if good else 'FAIL')
+    ok = ok and good
+    src = array('i', (0 for _ in range(NCH)))
+    t = ticks_us()
+    ar.step(src, src)
+    print('Time to step {} channels {}μs'.format(NCH, ticks_diff(ticks_us(), t)))
+    try:
+        ar.avg(1000)
+        ok = False
+    except ValueError:
+        pass
+    return ok
+
+print('All tests pass' if test() else 'FAILURES')
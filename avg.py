@@ -11,7 +11,8 @@
 
 # Return value: the current moving average
 
-# array[0] is array length, array[1] is the current sum, array[2] the insertion point
+# array[0] is array length, array[1] is the current sum, array[2] the insertion
+# point as a byte offset into the ring buffer
 # r2 holds the length of the coefficient array
 # Pointers (byte addresses)
 # r3 start of ring buffer
@@ -29,11 +30,8 @@ def avg(r0, r1):
     add(r2, r2, r2)
     add(r2, r2, r2)     # convert to bytes
     add(r5, r2, r3)     # r5 points to ring buffer end (last valid address)
-    ldr(r4, [r0, 8])    # Current insertion point address
-    cmp(r4, 0)          # If it's zero we need to initialise
-    bne(INIT)
-    mov(r4, r3)         # Initialise: point to buffer start
-    label(INIT)
+    ldr(r4, [r0, 8])    # Current insertion point offset
+    add(r4, r4, r3)     # Convert to address
     ldr(r7, [r0, 4])    # get current sum
     ldr(r6, [r4, 0])
     sub(r7, r7, r6)     # deduct oldest value
@@ -45,7 +43,8 @@ def avg(r0, r1):
     ble(NOLOOP)
     mov(r4, r3)         # Incremented past end: point to start
     label(NOLOOP)
-    str(r4, [r0, 8])    # Save the insertion point for next call
+    sub(r6, r4, r3)
+    str(r6, [r0, 8])    # Save the insertion point offset for next call
     ldr(r1, [r0, 0])    # Element count
     sub(r1, 3)          # No. of data points
     mov(r0, r7)         # The sum
@@ -0,0 +1,24 @@
+# avg_py.py Moving average filter implemented with Viper
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Portable equivalent of avg.py and avg_pico.py using the same scratchpad.
+# data[0] array length (no. of values to average + 3), data[1] current sum,
+# data[2] insertion point (byte offset), data[3:] ring buffer.
+# Initially all elements other than data[0] must be zero.
+# If shift >= 0 the sum is scaled by a right shift (as per avg_pico) otherwise
+# it is divided by the number of entries (as per avg).
+
+@micropython.viper
+def avg(data, val : int, shift : int) -> int:
+    d = ptr32(data)
+    n : int = d[0] - 3
+    i : int = d[2] >> 2
+    s : int = d[1] - d[3 + i] + val
+    d[1] = s
+    d[3 + i] = val
+    i += 1
+    d[2] = (i << 2) if (i < n) else 0
+    if shift >= 0:
+        return s >> shift
+    return (s // n) if (s >= 0) else -((-s) // n)  # Truncate like sdiv
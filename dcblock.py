@@ -0,0 +1,96 @@
+# dcblock.py Streaming DC blocker and bias tracker implemented with Viper
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# The bias (DC level) of a signal is tracked by a leaky integrator (one pole
+# lowpass) with a time constant of 2**k samples:
+# bias += (x - bias) / 2**k
+# Subtracting the bias from each sample gives a DC blocker (one pole highpass
+# with a -3dB frequency of about fs / (2 * pi * 2**k)). The bias is held with
+# frac fractional bits so that it tracks slow drift without a deadband. The
+# estimate carries across calls and blocks, so the bias is known without a
+# pass over the data: in front of fir it preserves accumulator headroom and
+# for dcf it replaces the offset of -1 (mean) with a running estimate.
+# Samples must be in range +-2**bits where frac + bits <= 30. By default frac
+# is 30 - bits, e.g. 14 for the unsigned half words of read_timed (bits == 16)
+# or 18 for a 12 bit ADC.
+
+# State (integer array of 4 elements):
+# 0 k, 1 frac, 2 bias * 2**frac, 3 primed (0 == bias set by next sample).
+
+from array import array
+
+
+# Update the bias with a sample and return the sample less the bias.
+@micropython.viper
+def dcb(state, val: int) -> int:
+    s = ptr32(state)
+    f: int = s[1]
+    x: int = val << f
+    if not s[3]:
+        s[2] = x
+        s[3] = 1
+    b: int = s[2]
+    b += (x - b) >> s[0]
+    s[2] = b
+    return val - ((b + ((1 << f) >> 1)) >> f)
+
+
+# Update the bias from n unsigned half words (e.g. from read_timed) returning
+# the new estimate, rounded.
+@micropython.viper
+def dcb_track(state, buf, n: int) -> int:
+    s = ptr32(state)
+    p = ptr16(buf)
+    k: int = s[0]
+    f: int = s[1]
+    b: int = s[2]
+    i: int = 0
+    if not s[3] and n:
+        b = int(p[0]) << f
+        s[3] = 1
+    while i < n:
+        b += ((int(p[i]) << f) - b) >> k
+        i += 1
+    s[2] = b
+    return (b + ((1 << f) >> 1)) >> f
+
+
+class BiasTracker:
+    # k: time constant is 2**k samples. frac: fractional bits of the estimate.
+    # bias: initial estimate or None to use the first sample. bits: samples
+    # are in range +-2**bits. frac defaults to 30 - bits.
+    def __init__(self, k, frac=None, bias=None, bits=16):
+        if not 0 <= k <= 24:
+            raise ValueError('k must be in range 0-24.')
+        if not 1 <= bits <= 30:
+            raise ValueError('bits must be in range 1-30.')
+        frac = min(30 - bits, 20) if frac is None else frac
+        if not 0 <= frac <= 20:
+            raise ValueError('frac must be in range 0-20.')
+        if frac + bits > 30:
+            raise ValueError('frac + bits must not exceed 30.')
+        self._state = array('i', (k, frac, 0, 0))
+        self.reset(bias)
+
+    # Return x less the bias, updating the estimate. May be called from a hard
+    # ISR, e.g. fir(data, coeffs, tracker(adc.read())).
+    def __call__(self, x):
+        return dcb(self._state, x)
+
+    # Update the estimate from n (default all) unsigned half words in buf
+    # without modifying it. Returns the estimate.
+    def track(self, buf, n=None):
+        return dcb_track(self._state, buf, len(buf) if n is None else n)
+
+    # Current estimate, rounded: e.g. for setup[4] of dcf.
+    @property
+    def bias(self):
+        s = self._state
+        return (s[2] + ((1 << s[1]) >> 1)) >> s[1]
+
+    # Set the estimate or, if bias is None, take it from the next sample.
+    def reset(self, bias=None):
+        s = self._state
+        s[2] = 0 if bias is None else bias << s[1]
+        s[3] = bias is not None
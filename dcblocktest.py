@@ -0,0 +1,83 @@
+# dcblocktest.py Test/demo of the DC blocker and bias tracker
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# A sine wave on a drifting bias (as from a 12 bit ADC) is passed through the
+# DC blocker, which is compared with a float model. Block tracking is checked
+# for independence of block size and 16 bit samples are checked. Runs on any
+# platform.
+
+from array import array
+from math import sin, pi
+from dcblock import BiasTracker
+
+K = 8  # Time constant 256 samples
+
+
+def signal(n):  # Bias drifts from 2048 to 2148 over 2000 samples
+    return 2048 + min(n, 2000) // 20 + int(500 * sin(2 * pi * n / 50))
+
+
+def realtime():
+    bt = BiasTracker(K)
+    bias = None
+    err = 0
+    for n in range(4000):
+        x = signal(n)
+        y = bt(x)
+        bias = x if bias is None else bias + (x - bias) / (1 << K)
+        err = max(err, abs(y - (x - bias)))
+    ok = err <= 1
+    print('Realtime max error vs model {:4.2f} {}'.format(err, 'Pass' if ok else 'FAIL'))
+    # Mean of output over the last few cycles is near zero
+    m = sum(bt(signal(n)) for n in range(4000, 4500)) / 500
+    good = abs(m) < 1
+    print('Output mean {:5.2f} {}'.format(m, 'Pass' if good else 'FAIL'))
+    return ok and good
+
+
+def blocks():
+    buf = array('H', (signal(n) for n in range(4000)))
+    a = BiasTracker(K)
+    a.track(buf)
+    b = BiasTracker(K)
+    for start in range(0, 4000, 500):  # Blocks of 500
+        b.track(memoryview(buf)[start:start + 500])
+    bias = buf[0]  # Float model
+    for x in buf:
+        bias += (x - bias) / (1 << K)
+    ok = a.bias == b.bias and abs(a.bias - bias) <= 1
+    print('Block tracking: bias {} {}'.format(b.bias, 'Pass' if ok else 'FAIL'))
+    # The running estimate replaces the mean: e.g. setup[4] = b.bias for dcf
+    c = BiasTracker(K, bias=2048)
+    good = c.bias == 2048 and c(2048) == 0
+    c.reset()
+    good = good and c(3000) == 0 and c.bias == 3000  # Primed by first sample
+    print('Initial estimate', 'Pass' if good else 'FAIL')
+    return ok and good
+
+
+def wide():  # Full scale unsigned half words with the default frac
+    bt = BiasTracker(K)
+    bias = None
+    err = 0
+    for n in range(2000):
+        x = 60000 + int(5000 * sin(2 * pi * n / 50))
+        y = bt(x)
+        bias = x if bias is None else bias + (x - bias) / (1 << K)
+        err = max(err, abs(y - (x - bias)))
+    ok = err <= 1
+    print('16 bit samples max error {:4.2f} {}'.format(err, 'Pass' if ok else 'FAIL'))
+    try:
+        BiasTracker(K, 16)  # 16 + 16 bits would overflow
+        good = False
+    except ValueError:
+        good = True
+    print('frac too large for bits', 'Pass' if good else 'FAIL')
+    return ok and good
+
+
+ok = realtime()
+ok = blocks() and ok
+ok = wide() and ok
+print('All tests pass' if ok else 'FAILURES')
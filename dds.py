@@ -0,0 +1,245 @@
+# dds.py Direct digital synthesis of test signals
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Each tone has a 32 bit phase accumulator whose top bits index a quarter wave
+# sine table (shared by all instances) with linear interpolation, so any
+# frequency may be produced with a resolution of fs / 2**32 and no rounding of
+# the period. Signals:
+# TONE     One or more tones (multitone), each with its own amplitude.
+# LINEAR   Linear chirp: the phase increment changes by a constant each
+#          sample. On reaching the end frequency it restarts at the start.
+# LOG      Logarithmic chirp: the increment is multiplied by a constant ratio
+#          every 64 samples and interpolated linearly between.
+# PRBS     Pseudo random binary sequence from a Galois LFSR: +-amplitude.
+# The phase is continuous between calls, so a signal may be produced in blocks
+# of any size. Output is offset + the sum of the tones, clipped to the range
+# of the buffer: unsigned bytes (e.g. DAC in 8 bit mode), unsigned half words
+# (12 bit DAC) or signed integers.
+
+# Control array (integer):
+# 0 mode, 1 no. of tones, 2 offset, 3 buffer width (bytes), 4 no. of samples,
+# 5 start increment, 6 end increment, 7 increment delta (per sample),
+# 8 LOG ratio per 64 samples (Q30), 9 LOG segment count, 10 PRBS state,
+# 11 PRBS mask, 12... tones: [phase, increment, amplitude] each.
+
+from array import array
+from math import sin, pi, log, exp
+
+TONE = const(0)
+LINEAR = const(1)
+LOG = const(2)
+PRBS = const(3)
+_HDR = const(12)
+_SEG = const(64)  # LOG segment length (power of 2)
+_SEGBITS = const(6)
+PRBS15 = const(0x6000)  # x**15 + x**14 + 1: period 32767
+PRBS23 = const(0x420000)  # x**23 + x**18 + 1: period 8388607
+
+# Quarter wave sine Q15: the extra element simplifies interpolation
+_QWAVE = array('h', (round(32767 * sin(pi * i / 512)) for i in range(257)))
+_QWAVE.append(32767)
+
+
+# Fill buf with ctl[4] samples, returning the last.
+@micropython.viper
+def dds_fill(buf, ctl, table) -> int:
+    c = ptr32(ctl)
+    t = ptr16(table)
+    b8 = ptr8(buf)
+    b16 = ptr16(buf)
+    b32 = ptr32(buf)
+    mode: int = c[0]
+    ntones: int = c[1]
+    offs: int = c[2]
+    width: int = c[3]
+    ns: int = c[4]
+    up: int = 0
+    if c[6] > c[5]:
+        up = 1
+    out: int = 0
+    j: int = 0
+    while j < ns:
+        acc: int = 0
+        if mode == PRBS:
+            s: uint = uint(c[10])
+            if s & 1:
+                acc = c[_HDR + 2]
+                c[10] = int((s >> 1) ^ uint(c[11]))
+            else:
+                acc = 0 - c[_HDR + 2]
+                c[10] = int(s >> 1)
+        else:
+            if mode == LOG:
+                if c[9] == 0:  # Start of segment: increment at its end
+                    a: uint = uint(c[_HDR + 1])
+                    r: uint = uint(c[8])
+                    a1: uint = a >> 16
+                    a0: uint = a & 0xffff
+                    r1: uint = r >> 16
+                    r0: uint = r & 0xffff
+                    tgt: uint = ((a1 * r1) << 2) + ((a1 * r0) >> 14) + ((a0 * r1) >> 14) + ((a0 * r0) >> 30)
+                    c[7] = int(tgt - a) >> _SEGBITS
+                    c[9] = _SEG
+                c[9] -= 1
+            if mode != TONE:
+                # Unsigned: a step past either limit cannot wrap undetected
+                inc: uint = uint(c[_HDR + 1] + c[7])
+                end: int = 0
+                if up:
+                    if inc > uint(c[6]) or inc < uint(c[5]):
+                        end = 1
+                elif inc < uint(c[6]) or inc > uint(c[5]):
+                    end = 1
+                if end:  # Restart sweep
+                    inc = uint(c[5])
+                    c[9] = 0
+                c[_HDR + 1] = int(inc)
+            k: int = 0
+            p: int = _HDR
+            while k < ntones:
+                ph: uint = uint(c[p])
+                c[p] = int(ph + uint(c[p + 1]))
+                q: uint = ph >> 30  # Quadrant
+                x: uint = (ph >> 14) & 0xffff  # Position in quadrant
+                if q & uint(1):
+                    x = uint(0x10000) - x
+                i: int = int(x >> 8)
+                f: int = int(x & 0xff)
+                v: int = int(t[i])
+                v += ((int(t[i + 1]) - v) * f) >> 8
+                if q & uint(2):
+                    v = 0 - v
+                acc += (v * c[p + 2]) >> 15
+                k += 1
+                p += 3
+        out = offs + acc
+        if width == 1:
+            if out < 0:
+                out = 0
+            if out > 255:
+                out = 255
+            b8[j] = out
+        elif width == 2:
+            if out < 0:
+                out = 0
+            if out > 0xffff:
+                out = 0xffff
+            b16[j] = out
+        else:
+            b32[j] = out
+        j += 1
+    return out
+
+
+class DDS:
+    # fs: sample rate. width: bytes per buffer element (1, 2 or 4).
+    # offset: added to each sample. maxtones: capacity for multitone.
+    def __init__(self, fs, width=2, offset=2048, maxtones=4):
+        if width not in (1, 2, 4):
+            raise ValueError('Width must be 1, 2 or 4.')
+        if maxtones < 1:
+            raise ValueError('maxtones must be >= 1.')
+        self.fs = fs
+        self._ctl = array('i', (0 for _ in range(_HDR + 3 * maxtones)))
+        self._ctl[2] = offset
+        self._ctl[3] = width
+        self._one = array('i', (0,))  # For single samples
+        self.tone(0, 0)
+
+    # Phase increment. Below fs/2 so it fits the signed control array.
+    def _inc(self, freq):
+        if not 0 <= freq < self.fs / 2:
+            raise ValueError('Frequency must be in range 0 to fs/2.')
+        return min(round(freq * 4294967296 / self.fs), 0x7fffffff)
+
+    def _amp(self, amp):
+        if not 0 <= amp < 0x8000:
+            raise ValueError('Amplitude must be in range 0-32767.')
+        return int(amp)
+
+    def _set(self, mode, tones):
+        c = self._ctl
+        if len(tones) > (len(c) - _HDR) // 3:
+            raise ValueError('Too many tones.')
+        c[0] = mode
+        c[1] = len(tones)
+        c[7] = 0
+        c[9] = 0
+        p = _HDR
+        for inc, amp in tones:
+            c[p + 1] = inc
+            c[p + 2] = amp
+            p += 3
+
+    # A single tone. Phase continues from the previous signal.
+    def tone(self, freq, amp):
+        self._set(TONE, ((self._inc(freq), self._amp(amp)),))
+
+    # Several tones: tones is a sequence of (freq, amplitude) pairs. Initial
+    # phases are 0.
+    def multitone(self, tones):
+        self._set(TONE, [(self._inc(f), self._amp(a)) for f, a in tones])
+        self.reset_phase()
+
+    # Chirp from f0 to f1 Hz over duration s, repeating. mode: LINEAR or LOG
+    # (frequency varies exponentially with time).
+    def chirp(self, f0, f1, duration, amp, mode=LINEAR):
+        if mode not in (LINEAR, LOG):
+            raise ValueError('Mode must be LINEAR or LOG.')
+        i0 = self._inc(f0)
+        i1 = self._inc(f1)
+        n = duration * self.fs
+        if n < _SEG or i0 == i1:
+            raise ValueError('Duration too short or f0 == f1.')
+        self._set(mode, ((i0, self._amp(amp)),))
+        c = self._ctl
+        c[5] = i0
+        c[6] = i1
+        if mode == LOG:
+            if not (i0 and i1):
+                raise ValueError('Log chirp cannot include 0Hz.')
+            c[8] = round(exp(log(f1 / f0) * _SEG / n) * (1 << 30))
+        else:
+            c[7] = round((i1 - i0) / n) or (1 if i1 > i0 else -1)
+
+    # PRBS of +-amp. mask: LFSR taps (PRBS15 or PRBS23). seed: nonzero.
+    def prbs(self, amp, mask=PRBS15, seed=1):
+        if not seed:
+            raise ValueError('Seed must be nonzero.')
+        self._set(PRBS, ((0, self._amp(amp)),))
+        self._ctl[10] = seed
+        self._ctl[11] = mask
+
+    # Set the phase of all tones (degrees).
+    def reset_phase(self, phase=0):
+        v = round((phase % 360) * 4294967296 / 360) & 0xffffffff
+        v = v - 4294967296 if v & 0x80000000 else v
+        c = self._ctl
+        for p in range(_HDR, len(c), 3):
+            c[p] = v
+
+    # Fill buf with n samples (default len(buf)) returning the last. buf is a
+    # bytearray or array of the configured width.
+    def fill(self, buf, n=None):
+        c = self._ctl
+        n = len(buf) if n is None else n
+        if n > len(buf):
+            raise ValueError('Buffer too small.')
+        c[4] = n
+        return dds_fill(buf, c, _QWAVE)
+
+    # Return the next sample. May be called from a hard ISR.
+    def __call__(self):
+        c = self._ctl
+        w = c[3]
+        c[3] = 4
+        c[4] = 1
+        r = dds_fill(self._one, c, _QWAVE)
+        c[3] = w
+        return r
+
+    # Current frequency of the first tone (Hz).
+    @property
+    def freq(self):
+        return (self._ctl[_HDR + 1] & 0xffffffff) * self.fs / 4294967296
@@ -0,0 +1,120 @@
+# ddstest.py Tests for the DDS signal generator
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Runs on any platform.
+
+from array import array
+from math import sin, pi
+from time import ticks_us, ticks_diff
+from dds import DDS, LINEAR, LOG, PRBS15
+
+FS = 10000
+
+
+def tone():
+    d = DDS(FS, width=4, offset=0)
+    d.tone(123.4, 30000)
+    buf = array('i', (0 for _ in range(1000)))
+    err = 0
+    for blk in range(3):  # Phase continuous across blocks
+        d.fill(buf)
+        for n in range(1000):
+            ref = 30000 * sin(2 * pi * 123.4 * (n + 1000 * blk) / FS)
+            err = max(err, abs(buf[n] - ref))
+    print('Tone max error {:4.1f}'.format(err))
+    return err < 5
+
+
+def multitone():
+    d = DDS(FS, width=2, offset=2048)
+    d.multitone(((100, 1000), (250, 500)))
+    buf = array('H', (0 for _ in range(200)))
+    d.fill(buf)
+    err = max(abs(buf[n] - 2048 - 1000 * sin(2 * pi * 100 * n / FS)
+                  - 500 * sin(2 * pi * 250 * n / FS)) for n in range(200))
+    print('Multitone max error {:4.1f}'.format(err))
+    return err < 3
+
+
+def chirp(mode):
+    d = DDS(FS, width=4, offset=0)
+    d.chirp(10, 400, 2, 1000, mode)
+    buf = array('i', (0 for _ in range(1000)))
+    ok = True
+    for k in range(1, 20):  # Check frequency every 100ms
+        d.fill(buf)
+        t = k / 10
+        ref = 10 * 40 ** (t / 2) if mode == LOG else 10 + 390 * t / 2
+        ok = ok and abs(d.freq - ref) < ref / 100
+    for _ in range(2):  # Sweep restarts
+        d.fill(buf)
+    ok = ok and d.freq < 50
+    print('LOG' if mode == LOG else 'LINEAR', 'chirp', 'Pass' if ok else 'FAIL')
+    return ok
+
+
+# Sweeps ending just below fs/2 need increments near 2**31: the frequency must
+# stay within the sweep range and restart at each end.
+def nyquist():
+    ok = True
+    buf = array('i', (0 for _ in range(100)))
+    for f0, f1, mode in ((FS / 4, FS * 0.49999, LINEAR), (FS * 0.49999, FS / 4, LINEAR),
+                         (FS / 4, FS * 0.49999, LOG)):
+        d = DDS(FS, width=4, offset=0)
+        d.chirp(f0, f1, 0.1, 1000, mode)
+        lo, hi = min(f0, f1) * 0.99, max(f0, f1) * 1.01
+        for _ in range(25):  # 2.5 sweeps
+            d.fill(buf)
+            ok = ok and lo <= d.freq <= hi
+    print('Sweeps to fs/2', 'Pass' if ok else 'FAIL')
+    return ok
+
+
+def prbs():
+    d = DDS(FS, width=4, offset=0)
+    d.prbs(100, PRBS15)
+    buf = array('i', (0 for _ in range(2 * 32767)))
+    d.fill(buf)
+    # Period 32767, one more 1 than 0 in each period
+    ok = sum(buf) == 200 and buf[:32767] == buf[32767:] and buf[:32766] != buf[1:32767]
+    print('PRBS', 'Pass' if ok else 'FAIL')
+    return ok
+
+
+def clip():
+    d = DDS(FS, width=1, offset=128)
+    d.tone(500, 200)  # Exceeds byte range
+    buf = bytearray(40)
+    d.fill(buf)
+    ok = min(buf) == 0 and max(buf) == 255
+    d.tone(500, 110)
+    t = ticks_us()
+    d.fill(buf)
+    dt = ticks_diff(ticks_us(), t)
+    ok = ok and 18 <= min(buf) and max(buf) <= 238
+    print('Byte output and clipping', 'Pass' if ok else 'FAIL', '{}μs for {} samples'.format(dt, len(buf)))
+    return ok
+
+
+def single():  # Calling the instance matches fill
+    a = DDS(FS)
+    b = DDS(FS)
+    a.tone(300, 2000)
+    b.tone(300, 2000)
+    buf = array('H', (0 for _ in range(50)))
+    b.fill(buf)
+    ok = all(a() == buf[n] for n in range(50))
+    print('Single sample', 'Pass' if ok else 'FAIL')
+    return ok
+
+
+ok = tone()
+ok = multitone() and ok
+ok = chirp(LINEAR) and ok
+ok = chirp(LOG) and ok
+ok = nyquist() and ok
+ok = prbs() and ok
+ok = clip() and ok
+ok = single() and ok
+print('All tests pass' if ok else 'FAILURES')
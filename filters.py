@@ -0,0 +1,202 @@
+# filters.py Filter objects encapsulating the realtime kernels
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# State is allocated and validated once at construction so that errors are
+# reported then rather than corrupting memory in an ISR. Calling an instance
+# invokes the kernel directly with the prebuilt state.
+# Scratchpad layouts are those of the kernels, so the assembler and Viper
+# versions are interchangeable:
+# FIR            [ncoeffs, shift, insertion offset (bytes), ring buffer...]
+# MovingAverage  [n + 3, sum, insertion offset (bytes), ring buffer...]
+# The insertion point is an offset rather than an address so snapshots may be
+# restored to any instance with the same configuration.
+# Filters start with a history of zeros. Priming fills it with a given value
+# (or the first sample) avoiding the start up transient.
+
+from array import array
+
+
+@micropython.viper
+def _copy(dst, src, n: int):
+    d = ptr32(dst)
+    s = ptr32(src)
+    for i in range(n):
+        d[i] = s[i]
+
+
+@micropython.viper
+def _set(dst, start: int, n: int, val: int):
+    d = ptr32(dst)
+    for i in range(start, n):
+        d[i] = val
+
+
+# Priming: fill the history of a raw scratchpad with a value so that the
+# filter produces settled output from the first sample. These may be used with
+# scratchpads passed directly to the kernels.
+def prime_fir(data, value):
+    _set(data, 3, len(data), value)
+    data[2] = 0
+
+
+def prime_avg(data, value):
+    _set(data, 3, len(data), value)
+    data[1] = (len(data) - 3) * value
+    data[2] = 0
+
+
+class _Filter:
+    __slots__ = ('_data', '_k', '_kern')
+    _HDR = 1  # No. of configuration elements at start of scratchpad
+
+    # Clear the history
+    def reset(self):
+        _set(self._data, self._HDR, len(self._data), 0)
+        self._k = self._kern  # Cancel any pending priming
+
+    # Fill the history with value. If value is None the history is filled with
+    # the next sample received.
+    def prime(self, value=None):
+        self._k = self._kern
+        if value is None:
+            self._k = self._primer()
+        else:
+            self._prime(self._data, value)
+
+    # Load the history from a sequence of samples in time order (oldest
+    # first). If it is longer than the history the most recent samples are
+    # used. If shorter, the oldest sample is replicated. offset is subtracted
+    # from each sample.
+    def load(self, buf, offset=0):
+        d = self._data
+        nh = len(d) - 3
+        nb = len(buf)
+        if nb < 1:
+            raise ValueError('No samples to load.')
+        self.prime(buf[0] - offset)
+        start = max(nh - nb, 0)
+        for i in range(start, nh):
+            d[3 + i] = buf[nb - nh + i] - offset
+        self._loaded()
+
+    # Copy state to an integer array of at least .statelen() elements.
+    def snapshot(self, buf):
+        n = len(self._data)
+        if len(buf) < n:
+            raise ValueError('Snapshot buffer must have at least {} elements.'.format(n))
+        _copy(buf, self._data, n)
+        return buf
+
+    # Restore state from a snapshot. This must come from a filter with the same
+    # configuration.
+    def restore(self, buf):
+        d = self._data
+        n = len(d)
+        if len(buf) < n or any(buf[i] != d[i] for i in range(self._HDR)):
+            raise ValueError('Snapshot does not match filter.')
+        ptr = buf[2]
+        if ptr < 0 or ptr >= (n - 3) * 4 or ptr & 3:
+            raise ValueError('Invalid insertion point in snapshot.')
+        _copy(d, buf, n)
+
+    def statelen(self):
+        return len(self._data)
+
+
+class FIR(_Filter):
+    __slots__ = ('_coeffs',)
+    _HDR = 2
+
+    # coeffs: integer array. shift: bits to shift each product (0-31).
+    # asm: use fir.py (ARM V6 or later) rather than fir_py.py (portable).
+    def __init__(self, coeffs, shift=0, asm=False):
+        n = len(coeffs)
+        if n < 1:
+            raise ValueError('At least one coefficient is required.')
+        if not 0 <= shift <= 31:
+            raise ValueError('Shift must be in range 0-31.')
+        if asm:
+            from fir import fir as k
+        else:
+            from fir_py import fir as k
+        self._k = k
+        self._kern = k
+        self._coeffs = coeffs
+        self._data = array('i', (0 for _ in range(n + 3)))
+        self._data[0] = n
+        self._data[1] = shift
+
+    def __call__(self, x):
+        return self._k(self._data, self._coeffs, x)
+
+    _prime = staticmethod(prime_fir)
+
+    def _loaded(self):
+        pass
+
+    def _primer(self):
+        k = self._kern
+
+        def p(d, c, x):
+            prime_fir(d, x)
+            self._k = k
+            return k(d, c, x)
+
+        return p
+
+
+class MovingAverage(_Filter):
+    __slots__ = ('_shift', '_div')
+
+    # n: no. of values to average. shift < 0: divide the sum by n. Otherwise
+    # shift the sum right by shift bits (correct if n is a power of 2).
+    # asm: use avg.py (shift < 0, ARM V7) or avg_pico.py (shift >= 0, ARM V6).
+    def __init__(self, n, shift=-1, asm=False):
+        if n < 1:
+            raise ValueError('At least one value is required.')
+        if shift > 31:
+            raise ValueError('Shift must be <= 31.')
+        self._div = asm and shift < 0  # avg.py takes no shift arg
+        if asm:
+            if shift < 0:
+                from avg import avg as k
+            else:
+                from avg_pico import avg as k
+        else:
+            from avg_py import avg as k
+        self._k = k
+        self._kern = k
+        self._shift = shift
+        self._data = array('i', (0 for _ in range(n + 3)))
+        self._data[0] = n + 3
+
+    # The kernel is called directly: there is no intermediate wrapper.
+    def __call__(self, x):
+        if self._div:
+            return self._k(self._data, x)
+        return self._k(self._data, x, self._shift)
+
+    _prime = staticmethod(prime_avg)
+
+    def _loaded(self):  # Make the sum consistent with the history
+        d = self._data
+        d[1] = sum(d[i] for i in range(3, len(d)))
+
+    # The primer has the kernel's arity: it runs in the ISR so must not
+    # allocate.
+    def _primer(self):
+        k = self._kern
+
+        if self._div:
+            def p(d, x):
+                prime_avg(d, x)
+                self._k = k
+                return k(d, x)
+        else:
+            def p(d, x, s):
+                prime_avg(d, x)
+                self._k = k
+                return k(d, x, s)
+
+        return p
@@ -0,0 +1,83 @@
+# filterstest.py Test/demo of the filter objects
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Set ASM = True to test the assembler kernels on ARM targets. The Pico must
+# use a power of 2 moving average with a shift.
+
+import array
+from time import ticks_us, ticks_diff
+from filters import FIR, MovingAverage
+
+ASM = False
+
+# 21 tap LPF
+coeffs = array.array('i', (-1318, -3829, -4009, -717, 3359, 2177, -3706, -5613,
+                           4154, 20372, 28471, 20372, 4154, -5613, -3706, 2177,
+                           3359, -717, -4009, -3829, -1318))
+
+def test_fir():  # Impulse response replays coeffs*impulse_size >> scale
+    f = FIR(coeffs, 1, ASM)
+    res = [f(100)] + [f(0) for _ in range(len(coeffs) - 1)]
+    ok = res == [(c * 100) >> 1 for c in coeffs]
+    f.reset()
+    for x in range(10):  # Snapshot mid stream then restore to another instance
+        f(x * 100)
+    snap = f.snapshot(array.array('i', (0 for _ in range(f.statelen()))))
+    g = FIR(coeffs, 1, ASM)
+    g.restore(snap)
+    for x in range(30):
+        ok = ok and f(x) == g(x)
+    try:
+        FIR(coeffs, 32)
+        ok = False
+    except ValueError:
+        pass
+    print('FIR', 'pass' if ok else 'FAIL')
+
+def test_avg():
+    a = MovingAverage(16, 4 if ASM else -1, ASM)
+    res = [a(1000) for _ in range(16)]
+    ok = res[-1] == 1000 and res[7] == 500
+    a.reset()
+    ok = ok and a(160) == 10
+    print('MovingAverage', 'pass' if ok else 'FAIL')
+
+def test_prime():
+    settled = sum((c * 2048) >> 1 for c in coeffs)
+    f = FIR(coeffs, 1, ASM)
+    f.prime(2048)
+    ok = f(2048) == settled
+    f.reset()
+    f.prime()  # Prime with first sample
+    ok = ok and f(2048) == settled and f(2048) == settled
+    g = FIR(coeffs, 1, ASM)  # Load history from a capture
+    capture = array.array('H', (2048 + x * 10 for x in range(40)))
+    for x in capture:
+        r = g(x)
+    f.load(capture)
+    ok = ok and f(1234) == g(1234)
+    a = MovingAverage(16, 4 if ASM else -1, ASM)
+    a.prime(2048)
+    ok = ok and a(2048) == 2048
+    a.prime()
+    ok = ok and a(100) == 100
+    a.load(capture, 2048)
+    ok = ok and a(390) == (sum(range(250, 400, 10)) + 390) // 16
+    print('Priming', 'pass' if ok else 'FAIL')
+
+def timing():
+    f = FIR(coeffs, 1, ASM)
+    t = ticks_us()
+    f(100)
+    t1 = ticks_diff(ticks_us(), t)
+    t = ticks_us()
+    f(100)
+    f(100)
+    t2 = ticks_diff(ticks_us(), t)
+    print(t2 - t1, 'μs')
+
+test_fir()
+test_avg()
+test_prime()
+timing()
@@ -2,6 +2,8 @@
 # Released under the MIT License (MIT). See LICENSE.
 # Copyright (c) 2021 Peter Hinch
 # 22nd Dec 2021: update to support ARMV6.
+# Insertion point is held as an offset: no initialisation check is required and
+# the state may be copied between arrays.
 # Calculate coefficients here: http://t-filter.appspot.com/fir/index.html
 
 # Function arguments:
@@ -13,7 +15,7 @@
 # other elements must be zero
 
 # Run conditions
-# array[2] holds the insertion point address
+# array[2] holds the insertion point as a byte offset into the ring buffer
 # r2 holds the new data value
 # Register usage (Buffer)
 # r0 Scratchpad
@@ -45,18 +47,16 @@ def fir(r0, r1, r2):
     add(r7, r7, r7)
     add(r7, r7, r7)     # convert to bytes
     add(r5, r7, r3)     # r5 points to ring buffer end (last valid address)
-    ldr(r4, [r0, 8])    # Current insertion point address
-    cmp(r4, 0)          # If it's zero we need to initialise
-    bne(INITIALISED)
-    mov(r4, r3)         # Initialise: point to buffer start
-    label(INITIALISED)
+    ldr(r4, [r0, 8])    # Current insertion point offset
+    add(r4, r4, r3)     # Convert to address
     str(r2, [r4, 0])    # put new data in buffer and post increment
     add(r4, 4)
     cmp(r4, r5)         # Check for buffer end
     ble(BUFOK)
     mov(r4, r3)         # Incremented past end: point to start
     label(BUFOK)
-    str(r4, [r0, 8])    # Save the insertion point for next call
+    sub(r7, r4, r3)
+    str(r7, [r0, 8])    # Save the insertion point offset for next call
                         # *** Filter ***
     ldr(r0, [r0, 4])    # Bits to shift
     mov(r8, r0)
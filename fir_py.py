@@ -28,3 +28,24 @@ def create_fir(coeffs, shift):
             i = (i + 1) if (i < end) else 0
         return res
     return inner
+
+# Function with the same args and scratchpad layout as fir.fir, enabling state
+# to be held in a caller supplied array.
+# data[0] no. of coeffs, data[1] shift, data[2] insertion point (byte offset),
+# data[3:] ring buffer.
+@micropython.viper
+def fir(data, coeffs, val : int) -> int:
+    d = ptr32(data)
+    co = ptr32(coeffs)
+    nc : int = d[0]
+    shift : int = d[1]
+    end : int = nc - 1
+    i : int = d[2] >> 2
+    d[3 + i] = val
+    i = (i + 1) if (i < end) else 0
+    d[2] = i << 2
+    res : int = 0
+    for x in range(nc):
+        res += (co[x] * d[3 + i]) >> shift
+        i = (i + 1) if (i < end) else 0
+    return res
@@ -0,0 +1,176 @@
+# firevent.py FIR filter with fused threshold detection
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# The filter output is compared with high and low thresholds with hysteresis.
+# A transition is recognised when the output has been beyond the threshold
+# for a minimum number of consecutive samples (dwell). Events are written to a
+# preallocated ring, so Python need only run when events are pending.
+# Each event is [time, direction, peak] where time is the sample count at
+# which the threshold was first crossed, direction is 1 (rising) or -1
+# (falling) and peak is the extreme output value since the previous event:
+# the minimum for a rising event, the maximum for a falling one.
+
+# The filter scratchpad is that of fir.py/fir_py.fir:
+# [ncoeffs, shift, insertion point (byte offset), ring buffer...]
+# Detector state (integer array):
+# 0 high threshold, 1 low threshold, 2 dwell, 3 state (1 == high),
+# 4 dwell count, 5 time, 6 peak, 7 candidate time, 8 no. of events in ring,
+# 9 write index, 10 read index, 11 overruns, 12 block length, 13 block offset,
+# 14 half word flag, 15... event ring (3 elements per event).
+
+from array import array
+
+_HDR = const(15)
+
+
+# Filter a sample as per fir_py.fir, apply the detector and return the output.
+@micropython.viper
+def fir_event(data, coeffs, det, val: int) -> int:
+    d = ptr32(data)
+    co = ptr32(coeffs)
+    e = ptr32(det)
+    nc: int = d[0]
+    shift: int = d[1]
+    end: int = nc - 1
+    i: int = d[2] >> 2
+    d[3 + i] = val
+    i = (i + 1) if (i < end) else 0
+    d[2] = i << 2
+    res: int = 0
+    for x in range(nc):
+        res += (co[x] * d[3 + i]) >> shift
+        i = (i + 1) if (i < end) else 0
+    # Detector
+    t: int = e[5]
+    e[5] = t + 1
+    beyond: int = 0
+    if e[3]:  # High
+        if res > e[6]:
+            e[6] = res
+        if res < e[1]:
+            beyond = 1
+    else:
+        if res < e[6]:
+            e[6] = res
+        if res > e[0]:
+            beyond = 1
+    if not beyond:
+        e[4] = 0
+        return res
+    if not e[4]:
+        e[7] = t
+    e[4] += 1
+    if e[4] < e[2]:
+        return res
+    # Transition
+    nev: int = e[8]
+    w: int = e[9]
+    nxt: int = (w + 1) if (w < nev - 1) else 0
+    if nxt == e[10]:  # Ring full: discard event
+        e[11] += 1
+    else:
+        p: int = _HDR + 3 * w
+        e[p] = e[7]
+        e[p + 1] = -1 if e[3] else 1
+        e[p + 2] = e[6]
+        e[9] = nxt
+    e[3] ^= 1
+    e[4] = 0
+    e[6] = res
+    return res
+
+
+# Process det[12] samples from buf. If det[14] buf is an array of half words
+# (e.g. from read_timed) with det[13] subtracted, otherwise integers. Returns
+# the last output.
+@micropython.viper
+def fir_event_block(data, coeffs, det, buf) -> int:
+    e = ptr32(det)
+    p16 = ptr16(buf)
+    p32 = ptr32(buf)
+    ns: int = e[12]
+    offs: int = e[13]
+    half: int = e[14]
+    res: int = 0
+    j: int = 0
+    while j < ns:
+        x: int = (int(p16[j]) - offs) if half else p32[j]
+        res = int(fir_event(data, coeffs, det, x))
+        j += 1
+    return res
+
+
+class EventFIR:
+    # coeffs, shift: as per fir. high, low: thresholds (high > low). dwell:
+    # no. of consecutive samples beyond a threshold to recognise a transition.
+    # nevents: capacity of the event ring.
+    def __init__(self, coeffs, shift, high, low, dwell=1, nevents=8):
+        n = len(coeffs)
+        if n < 1:
+            raise ValueError('At least one coefficient is required.')
+        if not 0 <= shift <= 31:
+            raise ValueError('Shift must be in range 0-31.')
+        if high <= low:
+            raise ValueError('High threshold must exceed low threshold.')
+        if dwell < 1 or nevents < 1:
+            raise ValueError('Dwell and no. of events must be >= 1.')
+        self._coeffs = coeffs
+        self._data = array('i', (0 for _ in range(n + 3)))
+        self._data[0] = n
+        self._data[1] = shift
+        nev = nevents + 1  # One slot is always empty
+        self._det = array('i', (0 for _ in range(_HDR + 3 * nev)))
+        d = self._det
+        d[0] = high
+        d[1] = low
+        d[2] = dwell
+        d[8] = nev
+
+    # Filter a sample returning the output. May be called from a hard ISR.
+    def __call__(self, x):
+        return fir_event(self._data, self._coeffs, self._det, x)
+
+    # Process n samples (default len(buf)). If offset is not None buf is an
+    # array of unsigned half words with offset subtracted from each sample.
+    def block(self, buf, n=None, offset=None):
+        d = self._det
+        d[12] = len(buf) if n is None else n
+        d[13] = 0 if offset is None else offset
+        d[14] = offset is not None
+        return fir_event_block(self._data, self._coeffs, d, buf)
+
+    # No. of events waiting
+    def pending(self):
+        d = self._det
+        return (d[9] - d[10]) % d[8]
+
+    # Return the oldest event as a (time, direction, peak) tuple or None.
+    def get(self):
+        d = self._det
+        r = d[10]
+        if r == d[9]:
+            return None
+        p = _HDR + 3 * r
+        ev = (d[p], d[p + 1], d[p + 2])
+        d[10] = (r + 1) if (r < d[8] - 1) else 0
+        return ev
+
+    # Events discarded because the ring was full.
+    @property
+    def overruns(self):
+        return self._det[11]
+
+    # True if the output is in the high state.
+    @property
+    def high(self):
+        return bool(self._det[3])
+
+    def reset(self):
+        for i in range(3, len(self._data)):
+            self._data[i] = 0
+        self._data[2] = 0
+        d = self._det
+        for i in range(3, 12):
+            if i != 8:
+                d[i] = 0
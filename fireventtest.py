@@ -0,0 +1,60 @@
+# fireventtest.py Test/demo of FIR filtering with fused threshold detection
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# A noisy square wave is smoothed by a moving average FIR and thresholds are
+# applied with hysteresis. Brief noise spikes are rejected by the dwell count.
+# Events are compared with those found by a Python implementation.
+
+from array import array
+from firevent import EventFIR
+
+coeffs = array('i', (1 for _ in range(4)))  # Moving average of 4 (shift 2)
+HIGH = 600
+LOW = 400
+DWELL = 3
+
+def signal(n):
+    x = 1000 if (n // 50) & 1 else 0  # Square wave period 100
+    if n % 37 == 0:
+        x = 1000 - x  # Single sample spikes
+    return x + (n * 13) % 41
+
+def ref(outputs):
+    events = []
+    state = count = 0
+    peak = 0
+    for t, y in enumerate(outputs):
+        peak = max(peak, y) if state else min(peak, y)
+        if (y < LOW) if state else (y > HIGH):
+            if not count:
+                start = t
+            count += 1
+            if count >= DWELL:
+                events.append((start, -1 if state else 1, peak))
+                state ^= 1
+                count = 0
+                peak = y
+        else:
+            count = 0
+    return events
+
+def test():
+    f = EventFIR(coeffs, 2, HIGH, LOW, DWELL, nevents=16)
+    outputs = [f(signal(n)) for n in range(400)]
+    events = []
+    while f.pending():
+        events.append(f.get())
+    for ev in events:
+        print('Time {:4d} {:7s} peak {}'.format(ev[0], 'rising' if ev[1] > 0 else 'falling', ev[2]))
+    ok = events == ref(outputs) and len(events) == 7 and not f.overruns
+    # Block mode with half word samples and a small ring
+    g = EventFIR(coeffs, 2, HIGH, LOW, DWELL, nevents=4)
+    buf = array('H', (2048 + signal(n) for n in range(400)))
+    g.block(buf, offset=2048)
+    blk = [g.get() for _ in range(g.pending())]
+    good = blk == events[:4] and g.overruns == 3
+    print('Block mode', 'Pass' if good else 'FAIL')
+    return ok and good
+
+print('All tests pass' if test() else 'FAILURES')
@@ -0,0 +1,127 @@
+# firgen.py Generate specialised Viper FIR filters for fixed coefficients
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# fir_py.create_fir loads each coefficient from memory and checks for ring
+# buffer wrap on every tap. Where coefficients are known in advance a function
+# may be generated with the loop fully unrolled and coefficients as
+# immediates. Zero taps are omitted and, optionally, symmetrical pairs of
+# samples are added before multiplying (halving the number of multiplies for
+# linear phase filters). The history is held twice (at i and i + N) so the
+# most recent N samples are contiguous and no wrap test is needed.
+# Results match create_fir except that with folding a product of a sum is
+# shifted rather than two products. This needs one more bit of headroom and
+# may differ in the least significant bit.
+
+# Generated source is cached keyed by the coefficients and options (the hash
+# names the function but is not relied on to be unique), and may be written to
+# a file for freezing as bytecode. If generation or compilation fails (e.g. for
+# an oversized filter or a coefficient too large for an immediate) create_fir
+# is used. Invalid arguments raise ValueError.
+
+from array import array
+from fir_py import create_fir
+
+MAXTAPS = const(256)  # Maximum nonzero terms
+_sources = {}  # (coeffs, shift, fold): (hash, source)
+_factories = {}  # (coeffs, shift, fold): compiled factory
+
+
+# FNV-1a hash of coefficients and options, consistent across platforms.
+def fir_hash(coeffs, shift, fold):
+    h = 0x811c9dc5
+    for v in list(coeffs) + [shift, fold]:
+        for b in range(4):
+            h = ((h ^ ((v >> (8 * b)) & 0xff)) * 0x01000193) & 0xffffffff
+    return h
+
+
+# Cache key: exact, unlike the hash.
+def _key(coeffs, shift, fold):
+    return (tuple(coeffs), shift, bool(fold))
+
+
+# Arguments invalid for any FIR filter, as distinct from generation failures.
+def _check(coeffs, shift):
+    if len(coeffs) < 1:
+        raise ValueError('At least one coefficient is required.')
+    if not 0 <= shift <= 31:
+        raise ValueError('Shift must be in range 0-31.')
+
+
+# Return (hash, source). The source defines make(data, ctrl) returning the
+# filter function.
+def generate(coeffs, shift, fold=True):
+    _check(coeffs, shift)
+    n = len(coeffs)
+    if any(not -(1 << 30) < c < (1 << 30) for c in coeffs):
+        raise ValueError('Coefficients must be in range +-2**30.')
+    key = _key(coeffs, shift, fold)
+    if key in _sources:
+        return _sources[key]
+    h = fir_hash(coeffs, shift, fold)
+    terms = []
+    done = set()
+    for k in range(n):  # coeffs[k] applies to buf[i + k]; k == 0 is the oldest
+        c = coeffs[k]
+        m = n - 1 - k
+        if k in done or not c:
+            continue
+        if fold and m > k and coeffs[m] == c:
+            terms.append('({} * (buf[i + {}] + buf[i + {}])) >> {}'.format(c, k, m, shift))
+            done.add(m)
+        else:
+            terms.append('({} * buf[i + {}]) >> {}'.format(c, k, shift))
+    if len(terms) > MAXTAPS:
+        raise ValueError('Too many terms: {}.'.format(len(terms)))
+    lines = [
+        '# Generated by firgen.py',
+        'import micropython',
+        'def make(data, ctrl):',
+        '    @micropython.viper',
+        '    def fir_{:08x}(val : int) -> int:'.format(h),
+        '        buf = ptr32(data)',
+        '        ctl = ptr32(ctrl)',
+        '        i : int = ctl[0]',
+        '        buf[i] = val',
+        '        buf[i + {}] = val'.format(n),
+        '        i = (i + 1) if (i < {}) else 0'.format(n - 1),
+        '        ctl[0] = i',
+        '        res : int = 0',
+    ]
+    lines.extend('        res += ' + t for t in terms)
+    lines.extend(('        return res', '    return fir_{:08x}'.format(h), ''))
+    src = '\n'.join(lines)
+    _sources[key] = (h, src)
+    return h, src
+
+
+# Write generated source to a file. The module's make function may then be
+# imported and passed state arrays as per create() (or frozen as bytecode).
+def write(fn, coeffs, shift, fold=True):
+    with open(fn, 'w') as f:
+        f.write(generate(coeffs, shift, fold)[1])
+
+
+# Return a function taking an integer sample and returning the filtered value.
+def create(coeffs, shift, fold=True):
+    _check(coeffs, shift)
+    key = _key(coeffs, shift, fold)
+    try:
+        if key not in _factories:
+            ns = {}
+            exec(generate(coeffs, shift, fold)[1], ns)
+            _factories[key] = ns['make']
+    # Oversized coefficient or filter, or a compiler error (a ViperTypeError
+    # is a TypeError).
+    except (ValueError, SyntaxError, TypeError, MemoryError):
+        return create_fir(coeffs, shift)
+    n = len(coeffs)
+    data = array('i', (0 for _ in range(2 * n)))
+    ctrl = array('i', (0,))
+    return _factories[key](data, ctrl)
+
+
+def clear_cache():
+    _sources.clear()
+    _factories.clear()
@@ -0,0 +1,49 @@
+# firgentest.py Test/demo of generated FIR filters
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Compares generated filters with fir_py.create_fir and times them. The
+# coefficients are a linear phase lowpass with some zero taps.
+
+from array import array
+from time import ticks_us, ticks_diff
+from fir_py import create_fir
+import firgen
+
+coeffs = array('i', (-12, 0, 71, 0, -324, 0, 1389, 2938, 3614, 2938, 1389, 0,
+                     -324, 0, 71, 0, -12))
+SHIFT = 12
+
+def signal(n):
+    return ((n * 97) % 401) - 200
+
+def run(f, n=300):
+    return [f(signal(x)) for x in range(n)]
+
+def timeit(f):
+    t = ticks_us()
+    for _ in range(100):
+        f(100)
+    return ticks_diff(ticks_us(), t) / 100
+
+def test():
+    ref = run(create_fir(coeffs, SHIFT))
+    exact = run(firgen.create(coeffs, SHIFT, fold=False))
+    folded = run(firgen.create(coeffs, SHIFT))
+    print('Unfolded matches create_fir', exact == ref)
+    err = max(abs(a - b) for a, b in zip(folded, ref))
+    print('Folded max difference {} (limit {})'.format(err, len(coeffs) // 2))
+    h, src = firgen.generate(coeffs, SHIFT)
+    print('Hash {:08x}, {} lines of source'.format(h, src.count('\n')))
+    big = array('i', (1 << 30,))  # Too large for an immediate: uses create_fir
+    print('Fallback', run(firgen.create(big, 30), 3) == run(create_fir(big, 30), 3))
+    try:
+        firgen.create(coeffs, 32)  # Invalid: not a generation failure
+        print('Bad shift accepted', False)
+    except ValueError:
+        print('Bad shift rejected', True)
+    print('create_fir {:6.1f}μs'.format(timeit(create_fir(coeffs, SHIFT))))
+    print('Unfolded   {:6.1f}μs'.format(timeit(firgen.create(coeffs, SHIFT, False))))
+    print('Folded     {:6.1f}μs'.format(timeit(firgen.create(coeffs, SHIFT))))
+
+test()
@@ -0,0 +1,268 @@
+# goertzel.py Goertzel single tone detector
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Measures the amplitude and phase of one or more tones over a block of n
+# samples. Where only a few frequencies are of interest this is far cheaper
+# than a narrowband FIR: each sample costs one coefficient multiply per tone.
+# Tone frequencies need not correspond to DFT bins.
+
+# Fixed point version (Goertzel class). Coefficients have qbits fractional
+# bits (default 10). Each coefficient multiply is a single 32 bit product
+# (one MAC per tone per sample) so the filter state must stay below
+# 2**(30 - qbits). Each tone's resonator has a gain of about 1 / (2 * sin(w))
+# so the state stays below n * max(abs(sample)) / sin(w): tones near
+# DC or fs / 2 need far more headroom than those near fs / 4. For longer blocks
+# or larger samples the precise option splits each multiply into two 16 bit
+# products (two multiplies plus a shift and mask) allowing the state to
+# approach 2**30. Given maxval the constructor checks the bound for each tone.
+# Neither the per sample nor the block method allocates.
+# State arrays:
+# ctl [sample count, block length, no. of tones, offset, no. of samples (block),
+#      qbits, precise]
+# co  [2cos(w), cos(w), sin(w)] per tone
+# st  [s1, s2] per tone followed by [re, im] per tone latched at block end
+
+from array import array
+from math import cos, sin, pi, sqrt, atan2
+
+
+# Latch results and clear state at end of block. Called once per block so the
+# split multiply is always used.
+@micropython.viper
+def _latch(ctl, co, st):
+    c = ptr32(ctl)
+    k = ptr32(co)
+    s = ptr32(st)
+    nt: int = c[2]
+    q: int = c[5]
+    m: int = (1 << q) - 1
+    r: int = 2 * nt  # Start of results
+    i: int = 0
+    while i < nt:
+        s1: int = s[2 * i]
+        s2: int = s[2 * i + 1]
+        cw: int = k[3 * i + 1]
+        sw: int = k[3 * i + 2]
+        s[r + 2 * i] = s1 - cw * (s2 >> q) - ((cw * (s2 & m)) >> q)
+        s[r + 2 * i + 1] = sw * (s2 >> q) + ((sw * (s2 & m)) >> q)
+        s[2 * i] = 0
+        s[2 * i + 1] = 0
+        i += 1
+    c[0] = 0
+
+
+# Update the state of every tone with sample x.
+@micropython.viper
+def _step(ctl, co, st, x: int):
+    c = ptr32(ctl)
+    k = ptr32(co)
+    s = ptr32(st)
+    nt: int = c[2]
+    q: int = c[5]
+    i: int = 0
+    if c[6]:  # Precise: split multiply
+        m: int = (1 << q) - 1
+        while i < nt:
+            s1: int = s[2 * i]
+            kc: int = k[3 * i]
+            s[2 * i] = x + kc * (s1 >> q) + ((kc * (s1 & m)) >> q) - s[2 * i + 1]
+            s[2 * i + 1] = s1
+            i += 1
+    else:
+        while i < nt:
+            s1 = s[2 * i]
+            s[2 * i] = x + ((k[3 * i] * s1) >> q) - s[2 * i + 1]
+            s[2 * i + 1] = s1
+            i += 1
+
+
+@micropython.viper
+def _update(ctl, co, st, x: int) -> int:
+    c = ptr32(ctl)
+    _step(ctl, co, st, x - c[3])
+    n: int = c[0] + 1
+    c[0] = n
+    if n >= c[1]:
+        _latch(ctl, co, st)
+        return 1
+    return 0
+
+
+# Block version: buf is an array of unsigned half words e.g. from read_timed.
+# The update is inline to avoid a call per sample.
+@micropython.viper
+def _block(ctl, co, st, buf) -> int:
+    c = ptr32(ctl)
+    k = ptr32(co)
+    s = ptr32(st)
+    b = ptr16(buf)
+    nt: int = c[2]
+    offs: int = c[3]
+    nblk: int = c[1]
+    ns: int = c[4]
+    q: int = c[5]
+    prec: int = c[6]
+    m: int = (1 << q) - 1
+    n: int = c[0]
+    done: int = 0
+    j: int = 0
+    while j < ns:
+        x: int = int(b[j]) - offs
+        i: int = 0
+        if prec:
+            while i < nt:
+                s1: int = s[2 * i]
+                kc: int = k[3 * i]
+                s[2 * i] = x + kc * (s1 >> q) + ((kc * (s1 & m)) >> q) - s[2 * i + 1]
+                s[2 * i + 1] = s1
+                i += 1
+        else:
+            while i < nt:
+                s1 = s[2 * i]
+                s[2 * i] = x + ((k[3 * i] * s1) >> q) - s[2 * i + 1]
+                s[2 * i + 1] = s1
+                i += 1
+        n += 1
+        if n >= nblk:
+            _latch(ctl, co, st)
+            n = 0
+            done += 1
+        j += 1
+    c[0] = n
+    return done
+
+
+# Worst case state per unit of input amplitude: the sum of the magnitudes of
+# the resonator's impulse response over the block.
+def _gain(w, n):
+    sw = sin(w)
+    if abs(sw) < 1e-6:  # DC or fs / 2: the state grows with n**2
+        return n * (n + 1) / 2
+    return sum(abs(sin((j + 1) * w)) for j in range(n)) / abs(sw)
+
+
+class Goertzel:
+    # freqs: sequence of tone frequencies. fs: sample rate. n: block length.
+    # offset is subtracted from each sample (e.g. 2048 for a 12 bit ADC).
+    # qbits: coefficient fractional bits. precise: split multiplies allowing
+    # greater state headroom. maxval: if set, the maximum absolute value of a
+    # sample after subtracting offset. ValueError is raised if any tone's
+    # state could overflow.
+    def __init__(self, freqs, fs, n, offset=0, qbits=10, precise=False, maxval=None):
+        nt = len(freqs)
+        if nt < 1 or n < 1:
+            raise ValueError('At least one tone and one sample are required.')
+        if not 4 <= qbits <= 14:
+            raise ValueError('qbits must be in range 4-14.')
+        self._w = array('f', (2 * pi * f / fs for f in freqs))
+        if maxval is not None:
+            lim = 1 << (30 if precise else 30 - qbits)
+            for f, w in zip(freqs, self._w):
+                if maxval * _gain(w, n) >= lim:
+                    raise ValueError('{}Hz state may overflow: reduce n or use precise.'.format(f))
+        self._n = n
+        self._ctl = array('i', (0, n, nt, offset, 0, qbits, bool(precise)))
+        self._co = array('i', (0 for _ in range(3 * nt)))
+        self._st = array('i', (0 for _ in range(4 * nt)))
+        for i, w in enumerate(self._w):
+            self._co[3 * i] = round(2 * cos(w) * (1 << qbits))
+            self._co[3 * i + 1] = round(cos(w) * (1 << qbits))
+            self._co[3 * i + 2] = round(sin(w) * (1 << qbits))
+
+    # Process one sample. Returns True when a block has completed and new
+    # results are available. May be called from a hard ISR.
+    def __call__(self, x):
+        return _update(self._ctl, self._co, self._st, x)
+
+    # Process an array of unsigned half words. Returns the number of blocks
+    # completed: the results are those of the most recent.
+    def block(self, buf, n=None):
+        self._ctl[4] = len(buf) if n is None else n
+        return _block(self._ctl, self._co, self._st, buf)
+
+    def reset(self):
+        for i in range(len(self._st)):
+            self._st[i] = 0
+        self._ctl[0] = 0
+
+    # Raw result (unscaled real and imaginary parts) for tone i
+    def iq(self, i):
+        r = 2 * self._ctl[2] + 2 * i
+        return self._st[r], self._st[r + 1]
+
+    # Amplitude of tone i in sample units
+    def amplitude(self, i):
+        re, im = self.iq(i)
+        return 2 * sqrt(re * re + im * im) / self._n
+
+    # Phase of tone i in radians relative to a cosine starting at the first
+    # sample of the block.
+    def phase(self, i):
+        re, im = self.iq(i)
+        p = atan2(im, re) - self._w[i] * (self._n - 1)
+        return (p + pi) % (2 * pi) - pi
+
+
+# Floating point version with the same interface. Samples may be float or int.
+class GoertzelFP:
+    def __init__(self, freqs, fs, n, offset=0):
+        nt = len(freqs)
+        if nt < 1 or n < 1:
+            raise ValueError('At least one tone and one sample are required.')
+        self._w = array('f', (2 * pi * f / fs for f in freqs))
+        self._k = array('f', (2 * cos(w) for w in self._w))
+        self._n = n
+        self._count = 0
+        self._offset = offset
+        self._st = array('f', (0 for _ in range(2 * nt)))
+        self._res = array('f', (0 for _ in range(2 * nt)))
+
+    def __call__(self, x):
+        x -= self._offset
+        st = self._st
+        k = self._k
+        for i in range(len(k)):
+            s1 = st[2 * i]
+            st[2 * i] = x + k[i] * s1 - st[2 * i + 1]
+            st[2 * i + 1] = s1
+        self._count += 1
+        if self._count >= self._n:
+            self._latch()
+            return True
+        return False
+
+    def block(self, buf, n=None):
+        done = 0
+        for i in range(len(buf) if n is None else n):
+            done += self(buf[i])
+        return done
+
+    def _latch(self):
+        st = self._st
+        res = self._res
+        for i, w in enumerate(self._w):
+            s1 = st[2 * i]
+            s2 = st[2 * i + 1]
+            res[2 * i] = s1 - cos(w) * s2
+            res[2 * i + 1] = sin(w) * s2
+            st[2 * i] = 0
+            st[2 * i + 1] = 0
+        self._count = 0
+
+    def reset(self):
+        for i in range(len(self._st)):
+            self._st[i] = 0
+        self._count = 0
+
+    def iq(self, i):
+        return self._res[2 * i], self._res[2 * i + 1]
+
+    def amplitude(self, i):
+        re, im = self.iq(i)
+        return 2 * sqrt(re * re + im * im) / self._n
+
+    def phase(self, i):
+        re, im = self.iq(i)
+        p = atan2(im, re) - self._w[i] * (self._n - 1)
+        return (p + pi) % (2 * pi) - pi
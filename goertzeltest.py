@@ -0,0 +1,66 @@
+# goertzeltest.py Test/demo of the Goertzel tone detector
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Simulates a 12 bit ADC sampling at 2KHz. The signal comprises a 100Hz tone of
+# amplitude 1000 with a 250Hz tone of amplitude 300 at a phase of 0.5 radians.
+# Three tones are measured: 100Hz, 250Hz and 400Hz (absent).
+
+from array import array
+from math import cos, pi
+from time import ticks_us, ticks_diff
+from goertzel import Goertzel, GoertzelFP
+
+FS = 2000
+N = 200
+freqs = (100, 250, 400)
+
+def sample(n):
+    return 2048 + int(1000 * cos(2 * pi * 100 * n / FS)
+                      + 300 * cos(2 * pi * 250 * n / FS + 0.5))
+
+buf = array('H', (sample(n) for n in range(N)))
+
+def show(name, g):
+    print(name)
+    for i, f in enumerate(freqs):
+        print('{:4d}Hz amplitude {:7.1f} phase {:5.2f}'.format(f, g.amplitude(i), g.phase(i)))
+
+def check(g, tol):  # Compare with the expected amplitudes
+    return all(abs(g.amplitude(i) - a) < tol for i, a in enumerate((1000, 300, 0)))
+
+def test():
+    g = Goertzel(freqs, FS, N, 2048, maxval=1300)
+    for x in buf:  # Per sample
+        done = g(x)
+    print('Block complete', done)
+    show('Fixed point, per sample', g)
+    ok = check(g, 10)
+    t = ticks_us()
+    n = g.block(buf)  # Block
+    t = ticks_diff(ticks_us(), t)
+    print('Blocks completed', n)
+    show('Fixed point, block. {}μs'.format(t), g)
+    ok = ok and check(g, 10)
+    # Precise mode: 2000 samples of amplitude 1300 exceed single product headroom
+    gp = Goertzel(freqs, FS, N * 10, 2048, 14, True)
+    for _ in range(10):
+        gp.block(buf)
+    t = ticks_us()
+    gp.block(buf)
+    t = ticks_diff(ticks_us(), t)
+    show('Fixed point, precise, n = {}. {}μs per {} samples'.format(N * 10, t, N), gp)
+    ok = ok and check(gp, 2)
+    try:  # 20Hz has far less headroom than 100Hz
+        Goertzel((20,), FS, N * 10, 2048, maxval=1300)
+        print('Overflow not detected')
+        ok = False
+    except ValueError as e:
+        print('Overflow detected:', e)
+    gf = GoertzelFP(freqs, FS, N, 2048)
+    gf.block(buf)
+    show('Floating point', gf)
+    ok = ok and check(gf, 2)
+    print('All tests pass' if ok else 'FAILURES')
+
+test()
@@ -0,0 +1,193 @@
+# halfband.py Halfband decimate by 2 filters and cascades
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# A halfband lowpass filter of N taps (N = 4k + 3) has every other coefficient
+# zero except the centre one, and is symmetrical. Only the centre tap and the
+# k + 1 distinct nonzero side taps are stored. Outputs are computed only at the
+# decimated rate and symmetrical pairs of samples are added before multiplying,
+# so a stage costs about N/8 multiplies per input sample.
+
+# Compact taps: [centre, h(c-1), h(c-3), ...] where c is the centre index.
+# As in fir.py each product is shifted right before summing. Where products
+# are of sums of two samples they need one more bit of headroom.
+
+# The history is held twice (at i and i + N) so that the most recent N samples
+# are contiguous, avoiding a wrap check per tap.
+# State: [N, shift, insertion index, phase, result, block length, offset,
+# half word flag, history (2N)...]
+
+from array import array
+from math import sin, cos, pi
+
+_HDR = const(8)
+
+
+@micropython.viper
+def _step(st, taps, x: int) -> int:
+    s = ptr32(st)
+    t = ptr32(taps)
+    n: int = s[0]
+    i: int = s[2]
+    s[_HDR + i] = x
+    s[_HDR + n + i] = x
+    s[2] = (i + 1) if (i < n - 1) else 0
+    ph: int = s[3] ^ 1
+    s[3] = ph
+    if ph:  # Output on alternate samples
+        return 0
+    shift: int = s[1]
+    c: int = _HDR + n + i - (n >> 1)  # Centre sample
+    acc: int = (t[0] * s[c]) >> shift
+    nside: int = (n + 1) >> 2
+    m: int = 1
+    k: int = 1
+    while k <= nside:
+        acc += (t[k] * (s[c - m] + s[c + m])) >> shift
+        m += 2
+        k += 1
+    s[4] = acc
+    return 1
+
+
+# Process s[5] samples from src writing outputs to dst (may be the same int
+# array). If s[7] src is an array of half words with s[6] subtracted.
+@micropython.viper
+def _block(st, taps, src, dst) -> int:
+    s = ptr32(st)
+    t = ptr32(taps)
+    p32 = ptr32(src)
+    p16 = ptr16(src)
+    q = ptr32(dst)
+    n: int = s[0]
+    shift: int = s[1]
+    i: int = s[2]
+    ph: int = s[3]
+    ns: int = s[5]
+    offs: int = s[6]
+    half: int = s[7]
+    nside: int = (n + 1) >> 2
+    nout: int = 0
+    j: int = 0
+    while j < ns:
+        x: int = (p16[j] - offs) if half else p32[j]
+        s[_HDR + i] = x
+        s[_HDR + n + i] = x
+        c: int = _HDR + n + i - (n >> 1)
+        i = (i + 1) if (i < n - 1) else 0
+        ph ^= 1
+        if not ph:
+            acc: int = (t[0] * s[c]) >> shift
+            m: int = 1
+            k: int = 1
+            while k <= nside:
+                acc += (t[k] * (s[c - m] + s[c + m])) >> shift
+                m += 2
+                k += 1
+            q[nout] = acc
+            nout += 1
+        j += 1
+    s[2] = i
+    s[3] = ph
+    s[4] = q[nout - 1] if nout else s[4]
+    return nout
+
+
+# Return compact taps from a full halfband coefficient array, checking its
+# structure.
+def compact(coeffs):
+    n = len(coeffs)
+    if n < 3 or n % 4 != 3:
+        raise ValueError('Halfband length must be 4k + 3.')
+    c = n >> 1
+    for m in range(1, c + 1):
+        if coeffs[c - m] != coeffs[c + m]:
+            raise ValueError('Coefficients are not symmetrical.')
+        if not m & 1 and coeffs[c + m]:
+            raise ValueError('Not a halfband filter: nonzero even tap.')
+    return array('i', [coeffs[c]] + [coeffs[c - m] for m in range(1, c + 1, 2)])
+
+
+# Design an ntaps halfband lowpass using a Blackman window. Coefficients are
+# scaled by 2**bits so a shift of bits gives unity gain. Returns compact taps.
+def design(ntaps, bits=14):
+    if ntaps < 3 or ntaps % 4 != 3:
+        raise ValueError('Halfband length must be 4k + 3.')
+    c = ntaps >> 1
+    taps = array('i', (0 for _ in range((ntaps + 1) // 4 + 1)))
+    taps[0] = 1 << (bits - 1)  # Centre tap is 0.5
+    for k in range(1, len(taps)):
+        m = 2 * k - 1
+        a = 2 * pi * (c + m + 1) / (ntaps + 1)  # Nonzero at ends
+        w = 0.42 - 0.5 * cos(a) + 0.08 * cos(2 * a)
+        taps[k] = round(sin(pi * m / 2) / (pi * m) * w * (1 << bits))
+    return taps
+
+
+class HalfBand:
+    def __init__(self, taps, shift):
+        nside = len(taps) - 1
+        if nside < 1:
+            raise ValueError('At least one side tap is required.')
+        if not 0 <= shift <= 31:
+            raise ValueError('Shift must be in range 0-31.')
+        n = 4 * nside - 1
+        self._taps = taps
+        self._st = array('i', (0 for _ in range(_HDR + 2 * n)))
+        self._st[0] = n
+        self._st[1] = shift
+
+    # Process one sample. Returns the decimated output on alternate calls,
+    # otherwise None. May be called from a hard ISR.
+    def __call__(self, x):
+        if _step(self._st, self._taps, x):
+            return self._st[4]
+        return None
+
+    # Process n samples from src to the integer array dst, returning the number
+    # of outputs. If offset is not None src is an array of half words (e.g.
+    # from read_timed) and offset is subtracted from each sample. src and dst
+    # may be the same integer array.
+    def block(self, src, dst, n=None, offset=None):
+        st = self._st
+        st[5] = len(src) if n is None else n
+        st[6] = 0 if offset is None else offset
+        st[7] = offset is not None
+        return _block(st, self._taps, src, dst)
+
+    def reset(self):
+        st = self._st
+        for i in range(2, len(st)):
+            st[i] = 0
+
+
+# Cascade of halfband stages: decimates by 2**len(stages).
+class Decimator:
+    def __init__(self, stages):
+        self._stages = stages
+
+    # Returns the decimated output or None
+    def __call__(self, x):
+        for stage in self._stages:
+            x = stage(x)
+            if x is None:
+                break
+        return x
+
+    # As HalfBand.block. Intermediate results are computed in place in dst
+    # which must hold at least n // 2 elements.
+    def block(self, src, dst, n=None, offset=None):
+        n = self._stages[0].block(src, dst, n, offset)
+        for stage in self._stages[1:]:
+            n = stage.block(dst, dst, n)
+        return n
+
+    def reset(self):
+        for stage in self._stages:
+            stage.reset()
+
+
+# Convenience: cascade of nstages identical designs (decimate by 2**nstages).
+def decimator(nstages, ntaps=11, bits=14):
+    taps = design(ntaps, bits)
+    return Decimator([HalfBand(taps, bits) for _ in range(nstages)])
@@ -0,0 +1,52 @@
+# halfbandtest.py Test/demo of halfband decimators
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# An 8x decimator (three 11 tap stages) is fed with a signal sampled at 8KHz
+# comprising 50Hz (passed) of amplitude 1000 and 3.5KHz (rejected) of amplitude
+# 1000. Output rate is 1KHz. Per sample and block results are compared, the
+# passband amplitude is checked and the stopband tone is measured alone.
+
+from array import array
+from math import sin, pi
+from time import ticks_us, ticks_diff
+from halfband import decimator
+
+FS = 8000
+NSAMPLES = 1024
+
+def sample(n):
+    return 2048 + int(1000 * sin(2 * pi * 50 * n / FS) + 1000 * sin(2 * pi * 3500 * n / FS))
+
+buf = array('H', (sample(n) for n in range(NSAMPLES)))
+
+def test():
+    d = decimator(3)
+    res = []
+    for x in buf:
+        r = d(x - 2048)
+        if r is not None:
+            res.append(r)
+    e = decimator(3)
+    out = array('i', (0 for _ in range(NSAMPLES // 2)))
+    t = ticks_us()
+    n = e.block(buf, out, offset=2048)
+    t = ticks_diff(ticks_us(), t)
+    ok = n == len(res) == NSAMPLES // 8 and all(out[i] == res[i] for i in range(n))
+    print('Outputs', n, 'block matches per sample' if ok else 'MISMATCH')
+    # Skip settling time. Expect amplitude close to 1000.
+    amp = (max(res[20:]) - min(res[20:])) // 2
+    good = abs(amp - 1000) <= 30
+    print('Passband amplitude', amp, 'Pass' if good else 'FAIL')
+    ok = ok and good
+    # 3.5KHz alone: expect at least 36dB attenuation
+    d.reset()
+    res = [d(int(1000 * sin(2 * pi * 3500 * n / FS))) for n in range(NSAMPLES)]
+    amp = max(abs(r) for r in res[160:] if r is not None)
+    good = amp <= 16
+    print('Stopband amplitude', amp, 'Pass' if good else 'FAIL')
+    ok = ok and good
+    print('Block of {} samples {}μs'.format(NSAMPLES, t))
+    print('All tests pass' if ok else 'FAILURES')
+
+test()
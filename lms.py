@@ -0,0 +1,89 @@
+# lms.py Adaptive FIR filter (LMS and NLMS) implemented with Viper
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Given a reference input x and a desired signal d, the filter adapts its
+# coefficients so that its output y approximates d, returning the error d - y.
+# In interference cancellation x is a reference for the interference and the
+# error is the cleaned signal.
+
+# The coefficient update for each sample requires the previous error and the
+# previous history. The history holds one more sample than there are
+# coefficients so the previous history is still available: a single pass over
+# it both updates each coefficient and applies it. The result is identical to
+# standard LMS where the update follows the output calculation.
+
+# Coefficients are integers applied as in fir_py.create_fir: coeffs[0] to the
+# oldest sample, with each product shifted right by shift bits. The update is
+# w += (e * x) >> mu. For NLMS the step is divided by the power of the
+# history, approximated by a power of 2: w += (e * x << shift) >> (mu + L)
+# where L is the bit length of the sum of squares of the samples.
+# If leak > 0 each coefficient decays by w >> leak per sample.
+# e * x and the sum of squares must fit in 32 bits.
+
+from array import array
+
+
+# coeffs: integer array of initial coefficients (usually zeros). It is updated
+# in place so its current values are available to the caller.
+def create_lms(coeffs, shift, mu, leak=0, nlms=False):
+    nc = len(coeffs)
+    data = array('i', (0 for _ in range(nc + 1)))
+    # Insertion point, shift, ncoeffs, mu, leak, nlms, last error, power
+    ctrl = array('i', (0, shift, nc, mu, leak, nlms, 0, 0))
+    @micropython.viper
+    def inner(x : int, d : int) -> int:
+        buf = ptr32(data)
+        ctl = ptr32(ctrl)
+        co = ptr32(coeffs)
+        shift : int = ctl[1]
+        nc : int = ctl[2]
+        leak : int = ctl[4]
+        e : int = ctl[6]
+        i : int = ctl[0]
+        buf[i] = x
+        i = (i + 1) if (i < nc) else 0  # Oldest sample
+        ctl[0] = i
+        us : int = ctl[3]  # Update shift
+        ls : int = 0
+        if ctl[5]:  # NLMS: normalise by previous power
+            p : int = ctl[7]
+            n : int = 0
+            if p >> 16:
+                n += 16
+                p >>= 16
+            if p >> 8:
+                n += 8
+                p >>= 8
+            if p >> 4:
+                n += 4
+                p >>= 4
+            if p >> 2:
+                n += 2
+                p >>= 2
+            n += p  # p is 0, 1, 2 or 3
+            if p == 3:
+                n -= 1
+            us += n - shift
+            if us < 0:
+                ls = -us
+                us = 0
+            v : int = buf[i]
+            ctl[7] += x * x - v * v
+        y : int = 0
+        j : int = 0
+        while j <= nc:
+            v = buf[i]
+            if j < nc:  # Update with previous error and history
+                c : int = co[j]
+                if leak:
+                    c -= c >> leak
+                co[j] = c + (((e * v) << ls) >> us)
+            if j:
+                y += (co[j - 1] * v) >> shift
+            i = (i + 1) if (i < nc) else 0
+            j += 1
+        e = d - y
+        ctl[6] = e
+        return e
+    return inner
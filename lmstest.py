@@ -0,0 +1,59 @@
+# lmstest.py Test/demo of the adaptive filter
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# System identification: white noise is passed through an unknown FIR filter
+# and the adaptive filter learns its coefficients. The single pass kernel is
+# also checked against a conventional two pass LMS implementation.
+
+from array import array
+from time import ticks_us, ticks_diff
+from lms import create_lms
+
+SHIFT = 12
+unknown = (200, -600, 1500, 4096, 1500, -600, 200, 0)  # Scaled by 2**SHIFT
+
+class Noise:  # Repeatable pseudo random sequence in range -1024..1023
+    def __init__(self):
+        self.x = 12345
+
+    def __call__(self):
+        self.x = (self.x * 1103515245 + 12345) & 0x7fffffff
+        return ((self.x >> 16) & 2047) - 1024
+
+def plant(hist):  # hist[-1] is the most recent sample
+    return sum(c * x for c, x in zip(unknown, hist)) >> SHIFT
+
+# Conventional LMS: output then update.
+def ref_lms(w, hist, d, mu):
+    y = sum((c * x) >> SHIFT for c, x in zip(w, hist))
+    e = d - y
+    for k in range(len(w)):
+        w[k] += (e * hist[k]) >> mu
+    return e
+
+def test(nlms, mu, n=3000):
+    coeffs = array('i', (0 for _ in unknown))
+    f = create_lms(coeffs, SHIFT, mu, nlms=nlms)
+    w = [0] * len(unknown)
+    hist = [0] * len(unknown)
+    noise = Noise()
+    same = True
+    for _ in range(n):
+        x = noise()
+        hist = hist[1:] + [x]
+        d = plant(hist)
+        e = f(x, d)
+        if not nlms:
+            same = same and e == ref_lms(w, hist, d, mu)
+    err = max(abs(c - u) for c, u in zip(coeffs, unknown))
+    print('{} final error {} max coefficient error {}'.format('NLMS' if nlms else 'LMS ', e, err))
+    if not nlms:
+        print('Matches two pass LMS', same)
+    return f
+
+test(False, 11)
+f = test(True, 3)
+t = ticks_us()
+f(0, 0)
+print('Time per sample {}μs for {} taps'.format(ticks_diff(ticks_us(), t), len(unknown)))
@@ -1,14 +1,14 @@
 # Demo program for FIR filter module
 # Author: Peter Hinch
 # 12th Feb 2015
-# Outputs a swept frequency sine wave on Dac1
+# Outputs a swept frequency sine wave (log chirp) on Dac1
 # Timer interrupt reads the analog input, filters it, and outputs the result on Dac 2.
 # Requires a link between X5 and X7
 
-import math
 import pyb
 import array
 from fir import fir
+from dds import DDS, LOG
 import micropython
 micropython.alloc_emergency_exception_buf(100)
 
@@ -41,20 +41,35 @@ def cb(timer):
 
 tim.callback(cb)
 
-# Sweep generator
-def sine_sweep(start, end, mult):     # Emit sinewave on DAC1
-    buf = bytearray(100)
-    for i in range(len(buf)):
-        buf[i] = 128 + int(110 * math.sin(2 * math.pi * i / len(buf)))
+# Sweep generator: a continuous logarithmic chirp from start to end Hz
+# repeating every period secs. DMA plays a circular buffer on DAC1 at 10KHz, a
+# multiple of the ADC rate so that DAC images alias onto the tone itself rather
+# than into the stopband. Timer 7 fires each time half of the buffer has been
+# played and the DDS refills that half, so the output has no gaps. Timers 6 and
+# 7 share a clock so stay in step.
+def sine_sweep(start, end, period):
+    fs = 10000  # DAC sample rate
+    n = 100  # Samples per half buffer
+    dds = DDS(fs, width=1, offset=128)
+    dds.chirp(start, end, period, 110, LOG)
+    buf = bytearray(2 * n)
+    mv = memoryview(buf)
+    halves = (mv[:n], mv[n:])
+    dds.fill(buf)
+    idx = [0]  # Half which is due to be refilled
 
-    freq = start
+    def refill(_):
+        dds.fill(halves[idx[0]])
+        idx[0] ^= 1
+
+    def tick(t):  # Hard ISR: defer the refill
+        micropython.schedule(refill, None)
+
+    dac1.write_timed(buf, fs, mode=pyb.DAC.CIRCULAR)
+    pyb.Timer(7, freq=fs // n, callback=tick)
     while True:
-        dac1.write_timed(buf, int(freq) * len(buf), mode=pyb.DAC.CIRCULAR)
-        print(freq, "Hz")
-        pyb.delay(2500)
-        freq *= mult
-        if freq > end:
-            freq = start
-
-sine_sweep(10, 400, 1.33)
+        pyb.delay(1000)
+        print(int(dds.freq), "Hz")
+
+sine_sweep(10, 400, 30)
 
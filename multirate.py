@@ -0,0 +1,150 @@
+# multirate.py Run many filters at different rates from one timer ISR
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Channels are registered with a rate divisor: a channel with divisor d runs on
+# every d'th tick of the base rate timer. Each channel reads a sample from its
+# source, passes it through its filter and passes the result to its sink (or
+# stores it for retrieval by result()).
+# On start() a slot table is computed covering the hyperperiod (the LCM of the
+# divisors). Each channel is assigned a phase chosen so that the work in each
+# slot is as even as possible: a 10Hz channel on a 1KHz base rate does not run
+# on the same tick as all the others. In the ISR the slot for the tick is an
+# index into the table, so no scheduling decisions are made at run time.
+# The duration of each tick is measured. The maximum for each slot is recorded
+# and ticks exceeding the budget are counted as overruns.
+
+from array import array
+from time import ticks_us, ticks_diff
+
+MAXSLOTS = const(4096)  # Maximum hyperperiod
+
+
+def _gcd(a, b):
+    while b:
+        a, b = b, a % b
+    return a
+
+
+class Scheduler:
+    # budget: maximum duration of a tick in μs.
+    def __init__(self, budget):
+        if budget < 1:
+            raise ValueError('Budget must be >= 1μs.')
+        self.budget = budget
+        self._chans = []  # [source, filter, sink, divisor, cost]
+        self._table = None  # Slot table while running
+        self._slots = None  # Slot table of last start()
+
+    # Register a channel returning its index. source() returns a sample,
+    # filt(x) returns the output, sink(y) receives it. cost: relative
+    # execution time used in balancing the slots (e.g. no. of taps).
+    def add(self, source, filt, divisor=1, sink=None, cost=1):
+        if self._table is not None:
+            raise ValueError('Cannot add a channel while running.')
+        if divisor < 1:
+            raise ValueError('Divisor must be >= 1.')
+        if cost <= 0:
+            raise ValueError('Cost must be > 0.')
+        self._chans.append((source, filt, sink, divisor, cost))
+        return len(self._chans) - 1
+
+    # Compute the slot table. Channels are placed in order of decreasing
+    # rate, then decreasing cost, each at the phase minimising the peak load
+    # of the slots it occupies.
+    def _build(self):
+        chans = self._chans
+        if not chans:
+            raise ValueError('No channels registered.')
+        h = 1
+        for c in chans:
+            h = h * c[3] // _gcd(h, c[3])
+            if h > MAXSLOTS:
+                raise ValueError('Hyperperiod exceeds {} ticks.'.format(MAXSLOTS))
+        load = [0] * h
+        slots = [[] for _ in range(h)]
+        self.phases = [0] * len(chans)
+        order = sorted(range(len(chans)), key=lambda i: (chans[i][3], -chans[i][4]))
+        for i in order:
+            d = chans[i][3]
+            best = None
+            for phase in range(d):
+                peak = max(load[phase::d])
+                if best is None or peak < best:
+                    best = peak
+                    self.phases[i] = phase
+            for t in range(self.phases[i], h, d):
+                load[t] += chans[i][4]
+                slots[t].append(i)
+        self.load = load
+        # Tuples: iteration in the ISR does not allocate
+        return tuple(tuple(chans[i][:3] + (i,) for i in s) for s in slots)
+
+    # Build the slot table and clear statistics. Then call tick() from a
+    # timer callback (e.g. tim.callback(sched.tick)).
+    def start(self):
+        self._table = None
+        table = self._build()
+        h = len(table)
+        self._ctl = array('i', (0, 0))  # Slot, total overruns
+        self._tmax = array('i', (0 for _ in range(h)))
+        self._over = array('i', (0 for _ in range(h)))
+        self._res = array('i', (0 for _ in range(len(self._chans))))
+        self._slots = table
+        self._table = table
+
+    def stop(self):
+        self._table = None
+
+    # Run the current slot. May be called from a hard ISR provided the
+    # sources, filters and sinks do not allocate. The arg is ignored so a
+    # Timer may be passed.
+    def tick(self, _=None):
+        table = self._table
+        if table is None:
+            return
+        t0 = ticks_us()
+        c = self._ctl
+        slot = c[0]
+        res = self._res
+        for source, filt, sink, i in table[slot]:
+            y = filt(source())
+            if sink is None:
+                res[i] = y
+            else:
+                sink(y)
+        dt = ticks_diff(ticks_us(), t0)
+        if dt > self._tmax[slot]:
+            self._tmax[slot] = dt
+        if dt > self.budget:
+            self._over[slot] += 1
+            c[1] += 1
+        slot += 1
+        c[0] = slot if slot < len(table) else 0
+
+    # Most recent output of a channel without a sink.
+    def result(self, idx):
+        return self._res[idx]
+
+    # No. of ticks which exceeded the budget.
+    @property
+    def overruns(self):
+        return self._ctl[1]
+
+    def reset_stats(self):
+        for i in range(len(self._tmax)):
+            self._tmax[i] = 0
+            self._over[i] = 0
+        self._ctl[1] = 0
+
+    # Return a list of (slot, channel indices, max μs, overruns) for each slot.
+    def stats(self):
+        t = self._slots
+        if t is None:
+            raise ValueError('Scheduler has not been started.')
+        return [(s, [x[3] for x in t[s]], self._tmax[s], self._over[s]) for s in range(len(t))]
+
+    def report(self):
+        for s, chans, tmax, over in self.stats():
+            print('Slot {:4d} channels {} max {:5d}μs overruns {}'.format(s, chans, tmax, over))
+        print('Total overruns', self.overruns)
@@ -0,0 +1,69 @@
+# multiratetest.py Test/demo of the multi-rate scheduler
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Simulates channels at 1KHz, 100Hz, 50Hz and 10Hz on a 1KHz base rate by
+# calling tick() directly. Checks that each channel runs at its rate, that its
+# filter sees consecutive samples, and that the work is spread across slots.
+# On a Pyboard the scheduler would be driven by a timer:
+# tim = pyb.Timer(4, freq=1000, callback=sched.tick)
+
+from multirate import Scheduler
+from filters import MovingAverage
+
+
+class Counter:  # Sample source returning 0, 1, 2...
+    def __init__(self):
+        self.n = 0
+
+    def __call__(self):
+        self.n += 1
+        return self.n - 1
+
+
+def test():
+    sched = Scheduler(budget=500)
+    divisors = (1, 10, 20, 20, 100, 100)
+    sources = [Counter() for _ in divisors]
+    filts = [MovingAverage(4) for _ in divisors]
+    out = []
+    for src, filt, d in zip(sources, filts, divisors):
+        sched.add(src, filt, d, cost=4)
+    sink_src = Counter()
+    sched.add(sink_src, lambda x: x * 2, 50, sink=out.append)
+    sched.start()
+    print('Phases', sched.phases)
+    ticks = 1000
+    for _ in range(ticks):
+        sched.tick()
+    ok = True
+    for n, (src, d) in enumerate(zip(sources, divisors)):
+        good = src.n == ticks // d
+        # Moving average of 4 consecutive samples: sum of last 4 / 4
+        x = src.n - 1
+        good = good and sched.result(n) == (4 * x - 6) >> 2
+        print('Channel {} divisor {:3d} runs {:4d} {}'.format(n, d, src.n, 'Pass' if good else 'FAIL'))
+        ok = ok and good
+    good = out == [2 * x for x in range(ticks // 50)]
+    print('Sink channel', 'Pass' if good else 'FAIL')
+    ok = ok and good
+    # Cost per hyperperiod is 4 * (100 + 10 + 5 + 5 + 1 + 1) + 2 over 100 slots
+    peak = max(sched.load)
+    good = peak <= 8  # Every slot runs channel 0 and at most one other
+    print('Peak slot load {} {}'.format(peak, 'Pass' if good else 'FAIL'))
+    ok = ok and good
+    stats = sched.stats()
+    good = len(stats) == 100 and all(s[2] >= 0 for s in stats)
+    print('Statistics', 'Pass' if good else 'FAIL')
+    ok = ok and good
+    sched.stop()
+    sched.tick()  # No effect when stopped
+    ok = ok and sources[0].n == ticks
+    try:
+        sched.add(Counter(), filts[0], 3, cost=0)
+        ok = False
+    except ValueError:
+        pass
+    return ok
+
+print('All tests pass' if test() else 'FAILURES')
@@ -0,0 +1,181 @@
+# netan.py Software network analyser for filter objects
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Measures the frequency response of any filter callable (taking and returning
+# an integer sample) by driving it with sine stimulus from dds.py and
+# demodulating the output coherently. Over a window the output y and the
+# stimulus x are each correlated with quadrature references at the stimulus
+# frequency; the response is the complex ratio Y/X. Using the ratio rather
+# than the nominal amplitude cancels errors due to the window not containing a
+# whole number of cycles. The measurement includes all fixed point effects of
+# the filter as built, and runs on a target or under CPython/Unix MicroPython.
+# Stepped mode measures at a list of frequencies, allowing the filter to
+# settle at each. Chirp mode drives a slow continuous log chirp and measures
+# in consecutive windows, which is much faster where the filter's delay is
+# short compared with a window.
+# Decimating filters (e.g. halfband.py) return None on samples which produce
+# no output. The correlations of both x and y are then accumulated only at the
+# samples which produce an output, so X and Y are demodulated at the output
+# rate and their ratio is unaffected by the decimation ratio. Frequencies
+# must be below half the output rate.
+
+from array import array
+from math import atan2, sqrt, log10, pi, cos
+from dds import DDS, LOG
+
+_BUFLEN = const(256)
+
+
+# Frequencies from f0 to f1 equally spaced on a log scale.
+def log_freqs(f0, f1, n):
+    if n < 2 or f0 <= 0 or f1 <= f0:
+        raise ValueError('Require 0 < f0 < f1 and n >= 2.')
+    r = (f1 / f0) ** (1 / (n - 1))
+    return [f0 * r ** k for k in range(n)]
+
+
+# Results: each attribute is an array('f') with one element per frequency.
+class Response:
+    def __init__(self, n):
+        self.freqs = array('f', (0 for _ in range(n)))
+        self.re = array('f', (0 for _ in range(n)))  # Nyquist plot
+        self.im = array('f', (0 for _ in range(n)))
+        self.gain = array('f', (0 for _ in range(n)))  # Linear
+        self.db = array('f', (0 for _ in range(n)))
+        self.phase = array('f', (0 for _ in range(n)))  # Degrees, unwrapped
+
+    def _set(self, i, freq, re, im):
+        self.freqs[i] = freq
+        self.re[i] = re
+        self.im[i] = im
+        g = sqrt(re * re + im * im)
+        self.gain[i] = g
+        self.db[i] = 20 * log10(g) if g > 1e-10 else -200
+        ph = atan2(im, re) * 180 / pi
+        if i:  # Unwrap
+            prev = self.phase[i - 1]
+            ph += 360 * round((prev - ph) / 360)
+        self.phase[i] = ph
+
+    def __len__(self):
+        return len(self.freqs)
+
+    def show(self):
+        print('     Hz      dB    Phase')
+        for i in range(len(self)):
+            print('{:8.2f} {:7.2f} {:8.1f}'.format(self.freqs[i], self.db[i], self.phase[i]))
+
+
+class Analyser:
+    # filt: callable taking a sample and returning a sample or, for decimating
+    # filters, None when there is no output. fs: input sample rate.
+    # amp: stimulus amplitude. offset: added to each stimulus sample (e.g.
+    # 2048 to simulate a 12 bit ADC). settle: no. of samples to allow the
+    # filter to settle before measuring (e.g. the no. of taps).
+    def __init__(self, filt, fs, amp=1000, offset=0, settle=0):
+        self.filt = filt
+        self.fs = fs
+        self.amp = amp
+        self.offset = offset
+        self.settle = settle
+        self._dds = [DDS(fs, width=4, offset=0) for _ in range(3)]  # Stimulus, I, Q
+        self._bufs = [array('i', (0 for _ in range(_BUFLEN))) for _ in range(3)]
+
+    # Run n samples. Unless acc is None accumulate the correlations of x and y
+    # with the references in a list [xi, xq, yi, yq, sum y, sum i, sum q, no.
+    # of outputs] at each sample which yields an output. If a window array is
+    # supplied the references are weighted by it.
+    def _run(self, n, acc=None, window=None):
+        filt = self.filt
+        offs = self.offset
+        xb, ib, qb = self._bufs
+        s = 0
+        while n:
+            k = min(n, _BUFLEN)
+            for d, b in zip(self._dds, self._bufs):
+                d.fill(b, k)
+            for j in range(k):
+                x = xb[j]
+                y = filt(x + offs)
+                if acc is not None and y is not None:
+                    i = ib[j]
+                    q = qb[j]
+                    if window is not None:
+                        i *= window[s + j]
+                        q *= window[s + j]
+                    acc[0] += x * i
+                    acc[1] += x * q
+                    acc[2] += y * i
+                    acc[3] += y * q
+                    acc[4] += y
+                    acc[5] += i
+                    acc[6] += q
+                    acc[7] += 1
+            n -= k
+            s += k
+
+    # Complex response from accumulated correlations. The window mean of y is
+    # removed to reject any DC component.
+    def _ratio(self, acc):
+        if not acc[7]:
+            raise ValueError('Filter produced no output: lengthen the window.')
+        m = acc[4] / acc[7]
+        yi = acc[2] - m * acc[5]
+        yq = acc[3] - m * acc[6]
+        xi, xq = acc[0], acc[1]
+        den = xi * xi + xq * xq
+        if not den:
+            raise ValueError('No stimulus.')
+        # (yi + j yq) / (xi + j xq)
+        return (yi * xi + yq * xq) / den, (yq * xi - yi * xq) / den
+
+    def _start(self, setup):
+        s, i, q = self._dds
+        for d, amp, ph in ((s, self.amp, 0), (i, 32767, 0), (q, 32767, 90)):
+            setup(d, amp)
+            d.reset_phase(ph)
+
+    # Measure at one frequency over ncycles whole cycles (approximately),
+    # returning (re, im).
+    def point(self, freq, ncycles=10, settle=None):
+        if freq <= 0:
+            raise ValueError('Frequency must be > 0.')
+        self._start(lambda d, amp: d.tone(freq, amp))
+        self._run(self.settle if settle is None else settle)
+        n = max(1, round(ncycles * self.fs / freq))
+        acc = [0] * 8
+        self._run(n, acc)
+        return self._ratio(acc)
+
+    # Stepped sine measurement at each frequency in freqs.
+    def stepped(self, freqs, ncycles=10):
+        r = Response(len(freqs))
+        for i, f in enumerate(freqs):
+            re, im = self.point(f, ncycles)
+            r._set(i, f, re, im)
+        return r
+
+    # Log chirp from f0 to f1 over duration secs, measured in npoints
+    # consecutive windows. The frequency of each point is that at the centre
+    # of its window. Windows may contain few cycles so a Hann window reduces
+    # leakage.
+    def chirp(self, f0, f1, duration, npoints):
+        if npoints < 1:
+            raise ValueError('npoints must be >= 1.')
+        n = round(duration * self.fs)
+        win = n // npoints
+        if win < 1:
+            raise ValueError('Duration too short.')
+        self._start(lambda d, amp: d.chirp(f0, f1, duration, amp, LOG))
+        self._run(self.settle)  # Chirp advances during settling
+        t0 = self.settle / self.fs
+        hann = array('f', (0.5 - 0.5 * cos(2 * pi * (j + 0.5) / win) for j in range(win)))
+        r = Response(npoints)
+        for k in range(npoints):
+            acc = [0] * 8
+            self._run(win, acc, hann)
+            re, im = self._ratio(acc)
+            t = t0 + (k + 0.5) * win / self.fs
+            r._set(k, f0 * (f1 / f0) ** ((t % duration) / duration), re, im)
+        return r
@@ -0,0 +1,80 @@
+# netantest.py Test/demo of the software network analyser
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Measures a 21 tap FIR lowpass filter object and a halfband decimator in
+# simulation and compares the results with the responses computed from their
+# coefficients. Runs on any platform.
+
+from array import array
+from math import cos, sin, pi, sqrt, atan2
+from filters import FIR
+from halfband import HalfBand, design
+from netan import Analyser, log_freqs
+
+FS = 2000
+SHIFT = 16
+# 21 tap LPF (fir order), cutoff ~ 100Hz at 2KHz
+coeffs = array('i', (-251, -449, -545, -309, 444, 1819, 3788, 6118, 8431, 10292,
+                     11287, 10292, 8431, 6118, 3788, 1819, 444, -309, -545, -449, -251))
+
+
+def theory(f, coeffs=coeffs, shift=SHIFT):  # Complex response
+    n = len(coeffs)
+    w = 2 * pi * f / FS
+    re = sum(coeffs[n - 1 - k] * cos(w * k) for k in range(n)) / (1 << shift)
+    im = -sum(coeffs[n - 1 - k] * sin(w * k) for k in range(n)) / (1 << shift)
+    return re, im
+
+
+# Full coefficients of a halfband filter from its compact taps
+def halfband_coeffs(taps):
+    c = 2 * len(taps) - 3
+    h = [0] * (2 * c + 1)
+    h[c] = taps[0]
+    for k in range(1, len(taps)):
+        h[c - (2 * k - 1)] = h[c + (2 * k - 1)] = taps[k]
+    return h
+
+
+def compare(resp, tol, tol_deg, th=theory):  # Gain error relative to unity, phase error
+    ok = True
+    for i in range(len(resp)):
+        re, im = th(resp.freqs[i])
+        g = sqrt(re * re + im * im)
+        ok = ok and abs(resp.gain[i] - g) < tol
+        if g > 0.1:
+            dph = (resp.phase[i] - atan2(im, re) * 180 / pi + 180) % 360 - 180
+            ok = ok and abs(dph) < tol_deg
+    return ok
+
+
+def test():
+    fir = FIR(coeffs, SHIFT)
+    an = Analyser(fir, FS, amp=1000, offset=0, settle=len(coeffs))
+    resp = an.stepped(log_freqs(5, 900, 25))
+    resp.show()
+    ok = compare(resp, 0.005, 1)
+    print('Stepped', 'Pass' if ok else 'FAIL')
+    fir.reset()
+    resp = an.chirp(5, 400, 20, 40)
+    good = compare(resp, 0.02, 5)
+    print('Chirp', 'Pass' if good else 'FAIL')
+    ok = ok and good
+    # Single point: Nyquist coordinates
+    re, im = an.point(1, 2)
+    tre, tim = theory(1)
+    good = abs(re - tre) < 0.005 and abs(im - tim) < 0.005
+    print('Single point', 'Pass' if good else 'FAIL')
+    ok = ok and good
+    # Decimating filter: returns None on alternate samples
+    taps = design(11)
+    hb = HalfBand(taps, 14)
+    hbc = halfband_coeffs(taps)
+    an = Analyser(hb, FS, amp=1000, settle=len(hbc))
+    resp = an.stepped(log_freqs(5, 300, 12), 40)  # Below output Nyquist (500Hz)
+    good = compare(resp, 0.005, 1, lambda f: theory(f, hbc, 14))
+    print('Halfband decimator', 'Pass' if good else 'FAIL')
+    return ok and good
+
+print('All tests pass' if test() else 'FAILURES')
@@ -0,0 +1,212 @@
+# filt_int.py Integer batch convolution for cores without an FPU
+
+# Released under the MIT licence.
+# Copyright Peter Hinch 2026
+
+# dcf_int performs the same operation as dcf using integer arithmetic only.
+# Samples may be unsigned half words (as from an ADC), signed half words or
+# 32 bit integers. Coefficients are Q15 (signed half words) or Q31 (integers).
+# Products are accumulated to 64 bits and the sum shifted right by setup[5]
+# bits before saturating to 32 bits. Alternatively, with SAT, 16 bit samples
+# and Q15 coefficients, a faster saturating 32 bit accumulator is used.
+
+# Args:
+# samples: array of samples ('H' default, 'h' with I16, 'i' with I32).
+# op: integer result array.
+# coeffs: array('h') of Q15 coefficients or array('i') of Q31 with Q31 set.
+# setup: integer array [nsamples, ncoeffs, flags, decimate, offset, shift]
+# Decimate < 1 is treated as 1 as per dcf. Shift must be in range 0-63.
+# Offset -1 causes the mean to be used (rounded towards -infinity).
+# COPY writes results + offset back to the samples, truncated to their width.
+# Returns the number of results.
+
+from array import array
+
+WRAP = const(1)
+SCALE = const(2)  # Unsupported: use shift
+REVERSE = const(4)
+COPY = const(8)
+I32 = const(16)
+I16 = const(32)
+Q31 = const(64)
+SAT = const(128)
+
+_ctl = array('i', (0 for _ in range(6)))
+_tot = array('i', (0, 0))
+
+
+# 64 bit sum of samples. res[0] = low word, res[1] = high word.
+@micropython.viper
+def _sum(samples, setup, res):
+    s = ptr32(setup)
+    r = ptr32(res)
+    x16 = ptr16(samples)
+    x32 = ptr32(samples)
+    n: int = s[0]
+    flags: int = s[2]
+    hi: int = 0
+    lo: uint = uint(0)
+    i: int = 0
+    while i < n:
+        v: int = 0
+        if flags & I32:
+            v = x32[i]
+        else:
+            v = int(x16[i])
+            if flags & I16:
+                v = (v ^ 0x8000) - 0x8000
+        hi += v >> 31
+        t: uint = uint(lo + uint(v))
+        if t < lo:
+            hi += 1
+        lo = t
+        i += 1
+    r[0] = int(lo)
+    r[1] = hi
+
+
+@micropython.viper
+def _dcf(samples, op, coeffs, setup) -> int:
+    s = ptr32(setup)
+    x16 = ptr16(samples)
+    x32 = ptr32(samples)
+    c16 = ptr16(coeffs)
+    c32 = ptr32(coeffs)
+    o = ptr32(op)
+    n: int = s[0]
+    nc: int = s[1]
+    flags: int = s[2]
+    dec: int = s[3]
+    if dec < 1:  # As per dcf
+        dec = 1
+    offs: int = s[4]
+    shift: int = s[5]
+    wide: int = flags & I32
+    sgn: int = flags & I16
+    q31: int = flags & Q31
+    fast: int = 0 if (wide or q31) else 1  # Product fits 32 bits
+    sat: int = (flags & SAT) if fast else 0
+    cstep: int = 1 if (flags & REVERSE) else -1
+    c0: int = 0 if (flags & REVERSE) else nc - 1
+    maxi: int = 0x7FFF << 16 | 0xFFFF
+    mini: int = -maxi - 1
+    nres: int = n if (flags & WRAP) else n - nc + 1
+    nres = nres // dec
+    j: int = 0
+    while j < nres:
+        i: int = n - 1 - (nres - 1 - j) * dec  # Most recent sample for result
+        ci: int = c0
+        acc: int = 0
+        hi: int = 0
+        lo: uint = uint(0)
+        k: int = 0
+        while k < nc:
+            v: int = 0
+            if wide:
+                v = x32[i]
+            else:
+                v = int(x16[i])
+                if sgn:
+                    v = (v ^ 0x8000) - 0x8000
+            v -= offs
+            c: int = 0
+            if q31:
+                c = c32[ci]
+            else:
+                c = (int(c16[ci]) ^ 0x8000) - 0x8000
+            if fast:
+                p: int = c * v
+                if sat:
+                    if p > 0 and acc > maxi - p:
+                        acc = maxi
+                    elif p < 0 and acc < mini - p:
+                        acc = mini
+                    else:
+                        acc += p
+                else:
+                    hi += p >> 31
+                    t: uint = uint(lo + uint(p))
+                    if t < lo:
+                        hi += 1
+                    lo = t
+            else:  # 32 * 32 bit product from 16 bit halves
+                ah: int = c >> 16
+                al: int = c & 0xFFFF
+                bh: int = v >> 16
+                bl: int = v & 0xFFFF
+                hi += ah * bh
+                m: int = ah * bl
+                hi += m >> 16
+                t = uint(lo + uint(m << 16))
+                if t < lo:
+                    hi += 1
+                lo = t
+                m = al * bh
+                hi += m >> 16
+                t = uint(lo + uint(m << 16))
+                if t < lo:
+                    hi += 1
+                lo = t
+                t = uint(lo + uint(al * bl))
+                if t < lo:
+                    hi += 1
+                lo = t
+            i -= 1
+            if i < 0:
+                i += n
+            ci += cstep
+            k += 1
+        if sat:
+            acc >>= shift if shift < 32 else 31
+        else:
+            rl: uint = lo
+            rh: int = hi
+            if shift >= 32:
+                rl = uint(hi >> (shift - 32))
+                rh = hi >> 31
+            elif shift:
+                rl = uint((lo >> shift) | uint(hi << (32 - shift)))
+                rh = hi >> shift
+            top: int = int(rl >> 31)
+            if rh > 0 or (rh == 0 and top):
+                acc = maxi
+            elif rh < -1 or (rh == -1 and not top):
+                acc = mini
+            elif top:
+                acc = -1 - int(rl ^ uint(-1))
+            else:
+                acc = int(rl)
+        o[j] = acc
+        j += 1
+    if flags & COPY:
+        j = 0
+        while j < n:
+            v = (o[j] + offs) if j < nres else offs
+            if wide:
+                x32[j] = v
+            else:
+                x16[j] = v
+            j += 1
+    return nres
+
+
+def dcf_int(samples, op, coeffs, setup):
+    if not 0 <= setup[5] <= 63:
+        raise ValueError('Shift must be in range 0-63.')
+    if setup[4] >= 0:
+        return _dcf(samples, op, coeffs, setup)
+    for i in range(6):
+        _ctl[i] = setup[i]
+    _sum(samples, setup, _tot)
+    _ctl[4] = ((_tot[1] << 32) | (_tot[0] & 0xFFFFFFFF)) // setup[0]
+    return _dcf(samples, op, coeffs, _ctl)
+
+
+# Convert float coefficients to Q15 or Q31, clipping to the representable range.
+def q15(coeffs):
+    return array('h', (min(max(round(c * 32768), -32768), 32767) for c in coeffs))
+
+
+def q31(coeffs):
+    m = (1 << 31) - 1
+    return array('i', (min(max(round(c * (1 << 31)), -m - 1), m) for c in coeffs))
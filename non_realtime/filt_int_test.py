@@ -0,0 +1,95 @@
+# filt_int_test.py Test suite for filt_int.py. Run on any MicroPython target.
+
+# Released under the MIT licence.
+# Copyright Peter Hinch 2026
+
+# Results of dcf_int are compared with those of a Python reference using
+# arbitrary precision integers, for each sample and coefficient format and
+# combinations of flags.
+
+from array import array
+from math import sin, pi
+import utime
+from filt_int import dcf_int, q15, q31, WRAP, REVERSE, COPY, I32, I16, Q31, SAT
+
+NSAMPLES = const(64)
+NCOEFFS = const(13)
+
+def ref(samples, coeffs, setup):
+    n, nc, flags, dec, offs, shift = setup
+    dec = max(dec, 1)
+    if offs < 0:
+        offs = sum(samples[:n]) // n
+    nres = (n if flags & WRAP else n - nc + 1) // dec
+    res = []
+    for j in range(nres):
+        i = n - 1 - (nres - 1 - j) * dec
+        acc = 0
+        for k in range(nc):
+            c = coeffs[k if flags & REVERSE else nc - 1 - k]
+            acc += c * (samples[(i - k) % n] - offs)
+        if flags & SAT:  # Saturates after each product: tests avoid overflow
+            acc = max(min(acc, 0x7fffffff), -0x80000000)
+        acc >>= shift
+        res.append(max(min(acc, 0x7fffffff), -0x80000000))
+    return res, offs
+
+fcoeffs = [sin(pi * (k + 1) / (NCOEFFS + 1)) / 4 for k in range(NCOEFFS)]
+fcoeffs[0] = -0.9  # Make asymmetric
+tests = (  # typecode, amplitude, offset, coeffs, flags, decimate, shift
+    ('H', 1500, 2048, q15(fcoeffs), 0, 1, 15),
+    ('H', 1500, -1, q15(fcoeffs), WRAP | COPY, 1, 15),
+    ('H', 1500, 2048, q15(fcoeffs), REVERSE, 3, 12),
+    ('h', 30000, 0, q15(fcoeffs), I16 | WRAP, 2, 15),
+    ('h', 30000, 0, q15(fcoeffs), I16 | SAT, 1, 15),
+    ('h', 30000, 0, q15(fcoeffs), I16, 1, 0),  # Saturates
+    ('H', 1500, 2048, q31(fcoeffs), Q31, 1, 31),
+    ('i', 1 << 28, -1, q31(fcoeffs), I32 | Q31 | REVERSE | COPY, 1, 31),
+    ('i', 1 << 30, 0, q31(fcoeffs), I32 | Q31, 1, 20),  # Saturates
+    ('i', 100000, 0, q15(fcoeffs), I32 | WRAP, 4, 15),
+    ('H', 1500, 2048, q15(fcoeffs), 0, 0, 15),  # Decimate 0 treated as 1
+    ('i', 1 << 30, 0, q31(fcoeffs), I32 | Q31, 1, 40),
+    ('h', 30000, 0, q15(fcoeffs), I16 | SAT, 1, 35),
+)
+
+def signal(tc, amp, offs):
+    dc = offs if offs > 0 else (2048 if tc == 'H' else 0)
+    return array(tc, (dc + int(amp * sin(2 * pi * 5 * i / NSAMPLES)) for i in range(NSAMPLES)))
+
+def test():
+    ok = True
+    for tc, amp, offs, coeffs, flags, dec, shift in tests:
+        samples = signal(tc, amp, offs)
+        setup = array('i', (NSAMPLES, NCOEFFS, flags, dec, offs, shift))
+        exp, mean = ref(samples, coeffs, setup)
+        op = array('i', (0 for _ in range(NSAMPLES)))
+        n = dcf_int(samples, op, coeffs, setup)
+        good = n == len(exp) and all(op[i] == exp[i] for i in range(n))
+        if good and flags & COPY:
+            mask = -1 if tc == 'i' else 0xffff
+            good = all(samples[i] & mask == ((exp[i] + mean) if i < n else mean) & mask
+                       for i in range(NSAMPLES))
+        print('Flags {:3d} decimate {} {}'.format(flags, dec, 'Pass' if good else 'FAIL'))
+        ok = ok and good
+    for shift in (-1, 64):
+        try:
+            dcf_int(samples, op, coeffs, array('i', (NSAMPLES, NCOEFFS, 0, 1, 0, shift)))
+            print('Shift {} not rejected FAIL'.format(shift))
+            ok = False
+        except ValueError:
+            pass
+    return ok
+
+def timing():
+    samples = signal('H', 1500, 2048)
+    coeffs = q15(fcoeffs)
+    op = array('i', (0 for _ in range(NSAMPLES)))
+    for flags in (0, SAT):
+        setup = array('i', (NSAMPLES, NCOEFFS, flags, 1, 2048, 15))
+        t = utime.ticks_us()
+        dcf_int(samples, op, coeffs, setup)
+        t = utime.ticks_diff(utime.ticks_us(), t)
+        print('{} samples {} coeffs {}: {}μs'.format(NSAMPLES, NCOEFFS, 'SAT' if flags else '64 bit', t))
+
+print('All tests pass' if test() else 'FAILURES')
+timing()
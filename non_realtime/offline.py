@@ -0,0 +1,133 @@
+# offline.py Filter capture files larger than RAM. Runs under CPython on a PC.
+# Requires numpy.
+
+# Released under the MIT licence.
+# Copyright Peter Hinch 2026
+
+# Raw captures (e.g. logged to SD card) of uint16, int16 or float32 samples are
+# memory mapped and processed with dcf semantics in chunks. Peak RAM depends on
+# the chunk size and number of coefficients, not on the file size.
+# Each result is computed by the same sequence of vectorised operations (one
+# per tap, in a fixed order) regardless of chunk boundaries, so output is
+# identical to a single pass.
+
+# Usage as a library:
+# nres = process('capture.bin', 'out.bin', coeffs, flags=WRAP, offset=-1)
+# CLI: python3 offline.py --help
+
+import sys
+import numpy as np
+
+WRAP = 1
+SCALE = 2  # Implied by a scale != 1.0
+REVERSE = 4
+COPY = 8
+
+DTYPES = ('uint16', 'int16', 'float32')
+
+
+# Mean of a memory mapped array, calculated in chunks. Integer sums are exact.
+def mean(x, chunk=1 << 20):
+    acc = 0
+    floating = x.dtype.kind == 'f'
+    for start in range(0, len(x), chunk):
+        blk = x[start:start + chunk]
+        acc += float(blk.sum(dtype=np.float64)) if floating else int(blk.sum(dtype=np.int64))
+    return acc / len(x)
+
+
+# Return samples lo..hi-1 as float64. With WRAP lo may be negative, in which
+# case samples are taken from the tail of the file.
+def _segment(x, lo, hi):
+    if lo >= 0:
+        return x[lo:hi].astype(np.float64)
+    return x[np.arange(lo, hi) % len(x)].astype(np.float64)
+
+
+# Filter infile writing results to outfile (raw, dtype outdtype). coeffs is a
+# sequence of floats. flags, decimate and offset are as per dcf setup[2..4]:
+# offset -1 uses the mean. COPY writes results plus offset back to infile
+# after processing, truncated and clipped to the sample range. Results are
+# multiplied by scale. chunk is the number of results per chunk.
+# Returns the number of results.
+def process(infile, outfile, coeffs, dtype='uint16', flags=0, decimate=1,
+            offset=0, scale=1.0, chunk=1 << 16, outdtype='float32'):
+    if dtype not in DTYPES:
+        raise ValueError('dtype must be one of {}.'.format(', '.join(DTYPES)))
+    if decimate < 1 or chunk < 1:
+        raise ValueError('Decimation and chunk size must be >= 1.')
+    x = np.memmap(infile, dtype=dtype, mode='r+' if flags & COPY else 'r')
+    n = len(x)
+    ncoeffs = len(coeffs)
+    if ncoeffs < 1 or (ncoeffs > n and not flags & WRAP):
+        raise ValueError('Coefficient count must be in range 1 to no. of samples.')
+    # Kernel order: k[t] applies to the sample t places before the current one.
+    k = np.asarray(coeffs, dtype=np.float64)
+    k = (k if flags & REVERSE else k[::-1]) * scale
+    bias = mean(x) if offset == -1 else offset
+    nres = (n if flags & WRAP else n - ncoeffs + 1) // decimate
+    first = n - 1 - (nres - 1) * decimate  # Sample of result 0
+    with open(outfile, 'wb') as f:
+        for j0 in range(0, nres, chunk):
+            m = min(chunk, nres - j0)
+            s0 = first + j0 * decimate  # Current sample for result j0
+            lo = s0 - ncoeffs + 1
+            seg = _segment(x, lo, s0 + (m - 1) * decimate + 1) - bias
+            acc = np.zeros(m, dtype=np.float64)
+            for t in range(ncoeffs):
+                b = ncoeffs - 1 - t  # Index of sample s0 - t in seg
+                acc += k[t] * seg[b:b + (m - 1) * decimate + 1:decimate]
+            acc.astype(outdtype).tofile(f)
+    if flags & COPY:
+        _copy(x, outfile, outdtype, nres, bias, chunk)
+    return nres
+
+
+# Write results plus bias back to the samples, setting the remainder to the
+# bias as dcf does.
+def _copy(x, outfile, outdtype, nres, bias, chunk):
+    res = np.memmap(outfile, dtype=outdtype, mode='r') if nres else ()
+    info = np.finfo(x.dtype) if x.dtype.kind == 'f' else np.iinfo(x.dtype)
+    for start in range(0, len(x), chunk):
+        stop = min(start + chunk, len(x))
+        v = np.full(stop - start, bias, dtype=np.float64)
+        if start < nres:
+            e = min(stop, nres)
+            v[:e - start] += res[start:e]
+        if x.dtype.kind != 'f':
+            v = np.trunc(v)
+        x[start:stop] = np.clip(v, info.min, info.max).astype(x.dtype)
+    x.flush()
+
+
+# Read coefficients from a text file with one per line (as from TFilter).
+def read_coeffs(fn):
+    with open(fn) as f:
+        return [float(line) for line in f if line.strip()]
+
+
+def main(argv):
+    import argparse
+    p = argparse.ArgumentParser(description='Apply dcf filtering to a raw capture file.')
+    p.add_argument('infile', help='Raw sample file.')
+    p.add_argument('outfile', help='Raw result file.')
+    p.add_argument('coeffs', help='Text file of coefficients, one per line.')
+    p.add_argument('--dtype', default='uint16', choices=DTYPES, help='Sample type.')
+    p.add_argument('--out-dtype', default='float32', choices=('float32', 'float64'))
+    p.add_argument('--wrap', action='store_true', help='Circular convolution.')
+    p.add_argument('--reverse', action='store_true', help='Reverse coefficient order.')
+    p.add_argument('--copy', action='store_true', help='Write results back to infile.')
+    p.add_argument('--decimate', type=int, default=1)
+    p.add_argument('--offset', default='0', help='DC offset or "mean".')
+    p.add_argument('--scale', type=float, default=1.0)
+    p.add_argument('--chunk', type=int, default=1 << 16, help='Results per chunk.')
+    a = p.parse_args(argv)
+    flags = (WRAP if a.wrap else 0) | (REVERSE if a.reverse else 0) | (COPY if a.copy else 0)
+    offset = -1 if a.offset == 'mean' else float(a.offset)
+    n = process(a.infile, a.outfile, read_coeffs(a.coeffs), a.dtype, flags,
+                a.decimate, offset, a.scale, a.chunk, a.out_dtype)
+    print('{} results written to {}'.format(n, a.outfile))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
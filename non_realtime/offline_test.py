@@ -0,0 +1,62 @@
+# offline_test.py Test of offline.py. Runs under CPython on a PC.
+
+# Released under the MIT licence.
+# Copyright Peter Hinch 2026
+
+# Results are compared with a direct implementation of the dcf algorithm and
+# chunked processing is checked to be identical to a single pass.
+
+import os
+import tempfile
+import numpy as np
+from offline import process, WRAP, REVERSE, COPY
+
+def ref(x, coeffs, flags, decimate, offset, scale):
+    n, p = len(x), len(coeffs)
+    bias = x.astype(np.float64).mean() if offset == -1 else offset
+    nres = (n if flags & WRAP else n - p + 1) // decimate
+    op = []
+    for j in range(nres):
+        s = n - 1 - (nres - 1 - j) * decimate
+        acc = 0.0
+        for t in range(p):
+            c = coeffs[t] if flags & REVERSE else coeffs[p - 1 - t]
+            acc += c * (float(x[(s - t) % n]) - bias)
+        op.append(acc * scale)
+    return np.array(op)
+
+def run(x, coeffs, dtype, flags, decimate, offset, chunk, d):
+    fin = os.path.join(d, 'in.bin')
+    fout = os.path.join(d, 'out.bin')
+    x.astype(dtype).tofile(fin)
+    n = process(fin, fout, coeffs, dtype, flags, decimate, offset, 1.5, chunk, 'float64')
+    return n, np.fromfile(fout, dtype=np.float64), np.fromfile(fin, dtype=dtype)
+
+def test():
+    rng = np.random.default_rng(1)
+    coeffs = rng.uniform(-1, 1, 21)
+    ok = True
+    with tempfile.TemporaryDirectory() as d:
+        for dtype in ('uint16', 'int16', 'float32'):
+            x = rng.integers(0, 4096, 1000).astype(dtype)
+            for flags in (0, WRAP, REVERSE, WRAP | REVERSE | COPY):
+                for decimate in (1, 3):
+                    for offset in (0, 2048, -1):
+                        exp = ref(x, coeffs, flags, decimate, offset, 1.5)
+                        n, single, _ = run(x, coeffs, dtype, flags, decimate, offset, 1 << 16, d)
+                        m, chunked, copied = run(x, coeffs, dtype, flags, decimate, offset, 37, d)
+                        good = (n == m == len(exp) and np.array_equal(single, chunked)
+                                and np.allclose(single, exp, atol=1e-6))
+                        if flags & COPY:
+                            bias = x.astype(np.float64).mean() if offset == -1 else offset
+                            v = single[0] + bias
+                            if dtype != 'float32':
+                                info = np.iinfo(dtype)
+                                v = min(max(np.trunc(v), info.min), info.max)
+                            good = good and copied[0] == np.array(v).astype(dtype)
+                        if not good:
+                            print('FAIL', dtype, flags, decimate, offset)
+                        ok = ok and good
+    print('All tests pass' if ok else 'FAILURES')
+
+test()
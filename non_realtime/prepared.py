@@ -0,0 +1,79 @@
+# prepared.py Prepared filters for repeated dcf calls with constant coefficients
+
+# Released under the MIT licence.
+# Copyright Peter Hinch 2026
+
+# A PreparedFilter does once the work which would otherwise be repeated on each
+# call with a given coefficient set:
+# 1. The scale factor is folded into the coefficients, so op[0] need not be
+# rewritten before each call.
+# 2. Coefficients are stored in the order in which the kernel applies them.
+# 3. Lengths, decimation and output array size are validated.
+# 4. The setup array is built.
+# Each filter holds its derived coefficients. The most recent _MAXCACHE
+# derived arrays are also cached so that filters sharing a coefficient set
+# share a single copy. The cache matches by identity of the original array
+# which must not subsequently be altered (or clear_cache() must be called).
+# Entries beyond the limit are discarded oldest first, so the cache does not
+# grow without bound.
+
+from array import array
+from filt import dcf, dcf_fp, WRAP, SCALE, REVERSE
+
+_MAXCACHE = const(8)
+_cache = []  # [[coeffs, scale, reverse, derived], ...] oldest first
+
+def clear_cache():
+    _cache[:] = []
+
+# Return coeffs scaled and ordered such that the first is applied to the most
+# recent sample (the kernel order when REVERSE is set).
+def kernel_coeffs(coeffs, scale=1.0, reverse=False):
+    for entry in _cache:
+        if entry[0] is coeffs and entry[1] == scale and entry[2] == reverse:
+            return entry[3]
+    n = len(coeffs)
+    derived = array('f', (coeffs[i if reverse else n - 1 - i] * scale for i in range(n)))
+    _cache.append([coeffs, scale, reverse, derived])
+    if len(_cache) > _MAXCACHE:
+        _cache.pop(0)
+    return derived
+
+class PreparedFilter:
+    # coeffs: array of float coefficients. nsamples: length of sample arrays to
+    # be processed. flags: any of WRAP, REVERSE, COPY (SCALE is ignored: use
+    # the scale arg). decimate, offset: as per dcf setup[3] and setup[4].
+    # op: optional float result array. fp: use dcf_fp for float samples.
+    def __init__(self, coeffs, nsamples, flags=0, decimate=1, offset=0,
+                 scale=1.0, op=None, fp=False):
+        ncoeffs = len(coeffs)
+        if not 0 < ncoeffs <= nsamples:
+            raise ValueError('Coefficient count must be in range 1 to no. of samples.')
+        if decimate < 1:
+            raise ValueError('Decimation factor must be >= 1.')
+        nres = (nsamples if flags & WRAP else nsamples - ncoeffs + 1) // decimate
+        if op is None:
+            op = array('f', (0 for _ in range(max(nres, 1))))
+        elif len(op) < nres:
+            raise ValueError('Result array must have at least {} elements.'.format(nres))
+        self._co = kernel_coeffs(coeffs, scale, bool(flags & REVERSE))
+        kflags = (flags | REVERSE) & ~SCALE  # Kernel walks derived coeffs forwards
+        self._setup = array('i', (nsamples, ncoeffs, kflags, decimate, offset))
+        self._fn = dcf_fp if fp else dcf
+        self.op = op
+        self.nresults = nres
+
+    # samples must be an array of nsamples elements: half words for dcf, floats
+    # for dcf_fp. Results are in .op. Returns the number of results.
+    def __call__(self, samples):
+        return self._fn(samples, self.op, self._co, self._setup)
+
+    # A fixed offset avoids the kernel's mean calculation. A bias measured on
+    # one sample set may be applied to subsequent ones.
+    @property
+    def offset(self):
+        return self._setup[4]
+
+    @offset.setter
+    def offset(self, value):
+        self._setup[4] = value
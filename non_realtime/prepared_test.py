@@ -0,0 +1,53 @@
+# prepared_test.py Test/demo program for prepared.py. Run on Pyboard.
+
+# Released under the MIT licence.
+# Copyright Peter Hinch 2026
+
+# Compares the results of a PreparedFilter with those of an equivalent dcf call
+# and times repeated calls of each.
+
+from array import array
+from coeffs import coeffs_8a
+from math import sin, pi
+import utime
+from filt import dcf, SCALE
+from prepared import PreparedFilter
+
+RBUFLEN = 128
+NCYCLES = 8
+SCALE_FACTOR = 1.037201
+NCALLS = 20
+cycles = RBUFLEN / NCYCLES
+
+signal = array('H', (2048 + int(1500 * sin(2 * cycles * pi * i / RBUFLEN)) for i in range(RBUFLEN)))
+bufin = array('H', signal)
+op = array('f', (0 for _ in range(RBUFLEN)))
+setup = array('i', (RBUFLEN, len(coeffs_8a), SCALE, 1, -1))
+
+pf = PreparedFilter(coeffs_8a, RBUFLEN, 0, 1, -1, SCALE_FACTOR)
+
+def test():
+    op[0] = SCALE_FACTOR
+    n = dcf(bufin, op, coeffs_8a, setup)
+    m = pf(bufin)
+    if n != m or n != pf.nresults:
+        print('Result count fail', n, m, pf.nresults)
+        return False
+    err = max(abs(op[i] - pf.op[i]) for i in range(n))
+    print('No. of results', n, 'max difference', err)
+    return err < 0.01
+
+def timing():
+    t = utime.ticks_us()
+    for _ in range(NCALLS):
+        op[0] = SCALE_FACTOR
+        dcf(bufin, op, coeffs_8a, setup)
+    t1 = utime.ticks_diff(utime.ticks_us(), t)
+    t = utime.ticks_us()
+    for _ in range(NCALLS):
+        pf(bufin)
+    t2 = utime.ticks_diff(utime.ticks_us(), t)
+    print('dcf {:5d}μs prepared {:5d}μs per call'.format(t1 // NCALLS, t2 // NCALLS))
+
+print('Pass' if test() else 'FAIL')
+timing()
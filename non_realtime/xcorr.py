@@ -0,0 +1,107 @@
+# xcorr.py Time delay estimation by cross correlation over a restricted range
+# of lags.
+
+# Released under the MIT licence.
+# Copyright Peter Hinch 2026
+
+# Where the delay between two sensors is bounded (e.g. by their separation)
+# only lags in that range need be computed. Cost is O(N * L) for N samples and
+# L lags, and no result array is needed: the kernel reduces to the peak lag,
+# its value and those of its neighbours. The peak is then refined by
+# parabolic interpolation to a fraction of a sample.
+
+# Correlation at lag l is sum((a[n] - offs_a) * (b[n + l] - offs_b)) over the
+# samples common to both arrays. A positive lag means that b lags a. Each
+# product is shifted right by shift bits (as in fir) to avoid overflow.
+
+# Args: a, b unsigned half word arrays (e.g. from read_timed).
+# ctl integer array [nsamples, min lag, max lag, shift, offset a, offset b].
+# An offset of -1 causes the mean to be used.
+# res integer array of 5 elements receiving [peak lag, peak value, value at
+# lag - 1, value at lag + 1, neighbour flags (1 == lag - 1 valid, 2 == lag + 1
+# valid)].
+
+from array import array
+
+
+@micropython.viper
+def _mean(buf, n: int) -> int:
+    p = ptr16(buf)
+    s: int = 0
+    for i in range(n):
+        s += p[i]
+    return s // n
+
+
+@micropython.viper
+def xcorr(a, b, ctl, res):
+    pa = ptr16(a)
+    pb = ptr16(b)
+    c = ptr32(ctl)
+    r = ptr32(res)
+    n: int = c[0]
+    lag: int = c[1]
+    lmax: int = c[2]
+    shift: int = c[3]
+    oa: int = c[4]
+    ob: int = c[5]
+    if oa < 0:
+        oa = int(_mean(a, n))
+    if ob < 0:
+        ob = int(_mean(b, n))
+    best: int = 0
+    prev: int = 0
+    capture: int = 0  # Next value is right hand neighbour of peak
+    first: int = 1
+    while lag <= lmax:
+        start: int = -lag if lag < 0 else 0
+        end: int = n - lag if lag > 0 else n
+        acc: int = 0
+        i: int = start
+        while i < end:
+            acc += ((int(pa[i]) - oa) * (int(pb[i + lag]) - ob)) >> shift
+            i += 1
+        if capture:
+            r[3] = acc
+            r[4] |= 2
+            capture = 0
+        if first or acc > best:
+            best = acc
+            r[0] = lag
+            r[1] = acc
+            r[2] = prev
+            r[4] = 0 if first else 1
+            capture = 1
+        first = 0
+        prev = acc
+        lag += 1
+
+
+class Xcorr:
+    # n: no. of samples. lmin, lmax: range of lags. shift: bits to shift each
+    # product. offset: DC offset of samples or -1 to use the means.
+    def __init__(self, n, lmin, lmax, shift=0, offset=-1):
+        if not -n < lmin <= lmax < n:
+            raise ValueError('Lags must be in range +-(n - 1) with lmin <= lmax.')
+        if not 0 <= shift <= 31:
+            raise ValueError('Shift must be in range 0-31.')
+        self._ctl = array('i', (n, lmin, lmax, shift, offset, offset))
+        self._res = array('i', (0 for _ in range(5)))
+
+    # Return the delay of b relative to a in samples, refined by parabolic
+    # interpolation. If the peak is at the end of the range of lags it is not
+    # refined.
+    def __call__(self, a, b):
+        r = self._res
+        xcorr(a, b, self._ctl, r)
+        lag = r[0]
+        if r[4] == 3:
+            p, left, right = r[1], r[2], r[3]
+            den = left - 2 * p + right
+            if den < 0:
+                return lag + 0.5 * (left - right) / den
+        return float(lag)
+
+    # Peak correlation value from the last call.
+    def peak(self):
+        return self._res[1]
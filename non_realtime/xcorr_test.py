@@ -0,0 +1,63 @@
+# xcorr_test.py Test/demo of restricted lag time delay estimation
+
+# Released under the MIT licence.
+# Copyright Peter Hinch 2026
+
+# Two channels receive the same band limited signal plus noise, the second
+# delayed by a fractional number of samples. The delay is estimated over lags
+# of +-20 and compared with the true value. The integer peak is checked
+# against a full cross correlation computed in Python.
+
+from array import array
+from math import sin, pi
+import utime
+from xcorr import Xcorr
+
+N = 1000
+LAGS = 20
+freqs = (0.013, 0.029, 0.041, 0.067)  # Cycles per sample
+
+class Noise:  # Repeatable pseudo random sequence in range +-100
+    def __init__(self):
+        self.x = 1
+
+    def __call__(self):
+        self.x = (self.x * 1103515245 + 12345) & 0x7fffffff
+        return ((self.x >> 16) % 201) - 100
+
+def signal(t):
+    return sum(300 * sin(2 * pi * f * t + k) for k, f in enumerate(freqs))
+
+def channels(delay):
+    noise = Noise()
+    a = array('H', (2048 + int(signal(t)) + noise() for t in range(N)))
+    b = array('H', (2048 + int(signal(t - delay)) + noise() for t in range(N)))
+    return a, b
+
+def full_peak(a, b):  # Reference: integer lag of peak over the same range
+    ma = sum(a) // N
+    mb = sum(b) // N
+    best = None
+    for lag in range(-LAGS, LAGS + 1):
+        c = sum(((a[i] - ma) * (b[i + lag] - mb)) >> 8
+                for i in range(max(0, -lag), min(N, N - lag)))
+        if best is None or c > best[1]:
+            best = (lag, c)
+    return best
+
+def test():
+    xc = Xcorr(N, -LAGS, LAGS, shift=8)
+    ok = True
+    for delay in (7.4, -12.7, 0.25):
+        a, b = channels(delay)
+        est = xc(a, b)
+        lag, peak = full_peak(a, b)
+        good = abs(est - delay) < 0.2 and lag == round(est) and peak == xc.peak()
+        print('Delay {:6.2f} estimate {:6.2f} {}'.format(delay, est, 'Pass' if good else 'FAIL'))
+        ok = ok and good
+    t = utime.ticks_us()
+    xc(a, b)
+    print('{} samples {} lags: {}μs'.format(N, 2 * LAGS + 1, utime.ticks_diff(utime.ticks_us(), t)))
+    return ok
+
+print('All tests pass' if test() else 'FAILURES')
@@ -0,0 +1,319 @@
+# partconv.py Uniformly partitioned convolution for long realtime FIR filters
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# The impulse response is split into partitions of B taps. The first two
+# partitions are applied directly to each sample (as in fir.py) so there is no
+# added latency. The remainder are applied by overlap-save block convolution
+# using a fixed point FFT of size M = 2B. When a block of B samples is complete
+# its spectrum is computed and multiplied by those of the tail partitions
+# using a frequency domain delay line. The inverse FFT yields the contribution
+# of the tail to the block after next, so the work is spread over the B sample
+# ticks of the following block: each tick performs a fixed number of units of
+# work (an FFT pass, a partition multiply etc.) giving a bounded worst case.
+# Per sample cost is 2B multiplies plus O(log B + N/B) amortised: a block size
+# near sqrt(N) is a good starting point.
+
+# Samples must be in range +-32767 (e.g. 12 bit ADC readings). The FFT uses
+# Q15 twiddle factors with 32 bit data. Results differ from those of fir by a
+# few LSB owing to rounding in the frequency domain.
+
+# The scratchpad is an integer array. Header:
+# 0 M, 1 B, 2 log2(M), 3 no. of tail partitions P, 4 shift, 5 position in
+# block, 6 direct ring index, 7 unit counter, 8 no. of units in a job,
+# 9 units per tick, 10 output half being read, 11 newest delay line slot,
+# 12 output shift, 13 no. of direct taps, 14 output half being written.
+# 15-24 offsets of: input block (M), FFT real (M), FFT imag (M), delay line
+# (P * (B + 1) * 2), partition spectra (P * (B + 1) * 2), accumulator
+# ((B + 1) * 2), twiddles (cos then sin, M), bit reversal table (M), tail
+# output (2B), direct ring (2B). 25 shift of spectral products, 26 input
+# prescale (bits).
+
+from array import array
+from math import cos, sin, pi, log
+
+_HDR = const(27)
+
+
+# One FFT pass over the work arrays. s: pass no. inv: 1 for inverse.
+@micropython.viper
+def _pass(data, s: int, inv: int):
+    d = ptr32(data)
+    m: int = d[0]
+    wr: int = d[16]
+    wi: int = d[17]
+    tc: int = d[21]
+    ts: int = tc + (m >> 1)
+    h: int = 1 << s
+    step: int = m >> (s + 1)
+    start: int = 0
+    while start < m:
+        for j in range(h):
+            k: int = j * step
+            c: int = d[tc + k]
+            sn: int = d[ts + k]
+            if not inv:
+                sn = -sn
+            a: int = start + j
+            b: int = a + h
+            xr: int = d[wr + b]
+            xi: int = d[wi + b]
+            # Q15 products split to avoid overflow, rounded to avoid bias
+            tr: int = (xr >> 15) * c - (xi >> 15) * sn + (((xr & 0x7fff) * c - (xi & 0x7fff) * sn + 0x4000) >> 15)
+            ti: int = (xr >> 15) * sn + (xi >> 15) * c + (((xr & 0x7fff) * sn + (xi & 0x7fff) * c + 0x4000) >> 15)
+            ur: int = d[wr + a]
+            ui: int = d[wi + a]
+            d[wr + b] = ur - tr
+            d[wi + b] = ui - ti
+            d[wr + a] = ur + tr
+            d[wi + a] = ui + ti
+        start += h << 1
+
+
+# Perform unit u of the block job.
+@micropython.viper
+def _unit(data, u: int):
+    d = ptr32(data)
+    m: int = d[0]
+    b: int = d[1]
+    lg: int = d[2]
+    p: int = d[3]
+    inp: int = d[15]
+    wr: int = d[16]
+    wi: int = d[17]
+    acc: int = d[20]
+    rev: int = d[22]
+    nb: int = b + 1  # Bins stored: the input is real
+    k: int = 0
+    f: int = 0
+    if u == 0:  # Load [previous block, current block] in bit reversed order
+        ps: int = d[26]
+        for k in range(m):
+            f = d[rev + k]
+            d[wr + f] = d[inp + k] << ps
+            d[wi + f] = 0
+        for k in range(b):
+            d[inp + k] = d[inp + b + k]
+        f = d[11] + 1
+        d[11] = f if f < p else 0
+        return
+    u -= 1
+    if u < lg:
+        _pass(data, u, 0)
+        return
+    u -= lg
+    if u == 0:  # Store spectrum in delay line, clear accumulator
+        f = d[18] + d[11] * 2 * nb
+        for k in range(nb):
+            d[f + 2 * k] = d[wr + k]
+            d[f + 2 * k + 1] = d[wi + k]
+            d[acc + 2 * k] = 0
+            d[acc + 2 * k + 1] = 0
+        return
+    u -= 1
+    if u < p:  # Multiply spectrum of block u blocks ago by that of partition u
+        f = d[11] - u
+        if f < 0:
+            f += p
+        f = d[18] + f * 2 * nb
+        hh: int = d[19] + u * 2 * nb
+        q: int = d[25]
+        q1: int = q - 15
+        r1: int = (1 << q1) >> 1  # Rounding
+        r0: int = 1 << (q - 1)
+        for k in range(nb):
+            xr: int = d[f + 2 * k]
+            xi: int = d[f + 2 * k + 1]
+            hr: int = d[hh + 2 * k]
+            hi: int = d[hh + 2 * k + 1]
+            # (x * h) >> q with x split to avoid overflow
+            d[acc + 2 * k] += (((xr >> 15) * hr - (xi >> 15) * hi + r1) >> q1) + (((xr & 0x7fff) * hr - (xi & 0x7fff) * hi + r0) >> q)
+            d[acc + 2 * k + 1] += (((xr >> 15) * hi + (xi >> 15) * hr + r1) >> q1) + (((xr & 0x7fff) * hi + (xi & 0x7fff) * hr + r0) >> q)
+        return
+    u -= p
+    if u == 0:  # Load full spectrum in bit reversed order
+        for k in range(m):
+            f = d[rev + k]
+            if k <= b:
+                d[wr + f] = d[acc + 2 * k]
+                d[wi + f] = d[acc + 2 * k + 1]
+            else:  # Conjugate symmetric
+                d[wr + f] = d[acc + 2 * (m - k)]
+                d[wi + f] = -d[acc + 2 * (m - k) + 1]
+        return
+    u -= 1
+    if u < lg:
+        _pass(data, u, 1)
+        return
+    # Last B samples are valid (overlap-save)
+    f = d[23] + d[14] * b
+    e: int = d[12]
+    r: int = (1 << e) >> 1 if e > 0 else 0
+    for k in range(b):
+        if e >= 0:
+            d[f + k] = (d[wr + b + k] + r) >> e
+        else:
+            d[f + k] = d[wr + b + k] << (0 - e)
+
+
+# Filter a sample. data: scratchpad. coeffs: the direct taps (the last 2B
+# coefficients in fir order).
+@micropython.viper
+def pconv(data, coeffs, val: int) -> int:
+    d = ptr32(data)
+    co = ptr32(coeffs)
+    b: int = d[1]
+    nd: int = d[13]
+    shift: int = d[4]
+    ring: int = d[24]
+    end: int = nd - 1
+    i: int = d[6]
+    d[ring + i] = val
+    i = (i + 1) if (i < end) else 0
+    d[6] = i
+    res: int = 0
+    for x in range(nd):  # Direct: oldest sample first as per fir
+        res += (co[x] * d[ring + i]) >> shift
+        i = (i + 1) if (i < end) else 0
+    pos: int = d[5]
+    res += d[d[23] + d[10] * b + pos]  # Contribution of the tail
+    d[d[15] + b + pos] = val
+    pos += 1
+    if pos == b:  # Block complete: start a job
+        pos = 0
+        d[7] = 0
+        d[14] = d[10]  # Result is for the block after next
+        d[10] ^= 1
+    d[5] = pos
+    u: int = d[7]
+    nu: int = d[8]
+    n: int = d[9]
+    while n and u < nu:
+        _unit(data, u)
+        u += 1
+        n -= 1
+    d[7] = u
+    return res
+
+
+# Float FFT of a list of complex values (length a power of 2).
+def _fft(x):
+    n = len(x)
+    j = 0
+    for i in range(1, n):
+        bit = n >> 1
+        while j & bit:
+            j ^= bit
+            bit >>= 1
+        j |= bit
+        if i < j:
+            x[i], x[j] = x[j], x[i]
+    h = 1
+    while h < n:
+        w = [complex(cos(pi * k / h), -sin(pi * k / h)) for k in range(h)]
+        for start in range(0, n, h << 1):
+            for k in range(h):
+                t = w[k] * x[start + k + h]
+                x[start + k + h] = x[start + k] - t
+                x[start + k] += t
+        h <<= 1
+    return x
+
+
+class PartitionedFIR:
+    # coeffs, shift: as per fir. blocksize: B, a power of 2 in range 2-1024.
+    def __init__(self, coeffs, shift, blocksize):
+        b = blocksize
+        if b < 2 or b > 1024 or b & (b - 1):
+            raise ValueError('Block size must be a power of 2 in range 2-1024.')
+        if not 0 <= shift <= 31:
+            raise ValueError('Shift must be in range 0-31.')
+        n = len(coeffs)
+        if n < 1:
+            raise ValueError('At least one coefficient is required.')
+        m = 2 * b
+        lg = len(bin(m)) - 3
+        nd = min(n, m)
+        p = max(0, (n - m + b - 1) // b)
+        nb = b + 1
+        self._direct = array('i', coeffs[n - nd:])
+        offs = []
+        size = _HDR
+        for length in (m, m, m, p * 2 * nb, p * 2 * nb, 2 * nb, m, m, m, nd):
+            offs.append(size)
+            size += length
+        self._data = d = array('i', (0 for _ in range(size)))
+        for i, v in enumerate((m, b, lg, p, shift)):
+            d[i] = v
+        d[13] = nd
+        for i, v in enumerate(offs):
+            d[15 + i] = v
+        nunits = (2 * lg + p + 4) if p else 0
+        d[8] = nunits
+        d[9] = (nunits + b - 1) // b
+        for k in range(b):  # Twiddles Q15
+            d[offs[6] + k] = round(32768 * cos(2 * pi * k / m))
+            d[offs[6] + b + k] = round(32768 * sin(2 * pi * k / m))
+        for k in range(m):  # Bit reversal
+            r = 0
+            for i in range(lg):
+                r |= ((k >> i) & 1) << (lg - 1 - i)
+            d[offs[7] + k] = r
+        # Spectra of the tail partitions. Tap t is coeffs[n - 1 - t]
+        spectra = []
+        hmax = 0
+        gain = 0
+        for j in range(p):
+            x = [0j] * m
+            for t in range(b):
+                tap = (j + 2) * b + t
+                if tap < n:
+                    x[t] = complex(coeffs[n - 1 - tap])
+                    gain += abs(coeffs[n - 1 - tap])
+            x = _fft(x)[:nb]
+            spectra.append(x)
+            hmax = max(hmax, max(abs(z.real) for z in x), max(abs(z.imag) for z in x))
+        if hmax:
+            sc = 1 / (m * (1 << shift))  # Inverse FFT and shift
+            # Input is prescaled to use the headroom of the forward FFT.
+            # Partition spectra are scaled to 14 bits. Products are shifted
+            # right by qs so that the output of the inverse FFT is the tail
+            # contribution scaled by 2**e, e being limited to avoid overflow.
+            ps = max(0, 14 - lg)
+            ef = int(log(16383 / (hmax * sc)) / log(2)) - 15
+            gain *= sc * m  # Tail gain
+            e = min(ef + ps, int(log(2 ** 14 / (gain * m ** 0.5)) / log(2)))
+            qs = 15 + ef - e + ps
+            d[12] = e
+            d[25] = qs
+            d[26] = ps
+            sc *= 2 ** (15 + ef)
+            for j, x in enumerate(spectra):
+                o = offs[4] + j * 2 * nb
+                for k, z in enumerate(x):
+                    d[o + 2 * k] = round(z.real * sc)
+                    d[o + 2 * k + 1] = round(z.imag * sc)
+        self.reset()
+
+    # Filter a sample returning the output. May be called from a hard ISR.
+    def __call__(self, x):
+        return pconv(self._data, self._direct, x)
+
+    # Clear the history.
+    def reset(self):
+        d = self._data
+        for i in (5, 6, 10, 11, 14):
+            d[i] = 0
+        d[7] = d[8]  # No job pending
+        start = d[15]
+        for i in range(start, d[18] + d[3] * 2 * (d[1] + 1)):  # Input, FFT, delay line
+            d[i] = 0
+        for i in range(d[20], d[21]):  # Accumulator
+            d[i] = 0
+        for i in range(d[23], len(d)):  # Tail output and direct ring
+            d[i] = 0
+
+    # Units of block work performed on each sample.
+    @property
+    def units_per_tick(self):
+        return self._data[9]
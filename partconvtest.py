@@ -0,0 +1,71 @@
+# partconvtest.py Test/demo of partitioned convolution
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# A 1024 tap windowed sinc lowpass filter is run with several block sizes and
+# compared with a reference which applies the direct taps as fir does and the
+# tail exactly. The error is reported relative to the peak output. The worst
+# case time per sample is reported: on hardware this shows that the block
+# work is spread evenly across ticks.
+
+from array import array
+from math import sin, cos, pi
+from time import ticks_us, ticks_diff
+from partconv import PartitionedFIR
+
+NTAPS = 1024
+SHIFT = 16
+NSAMPLES = 1500
+
+
+def lowpass(n, fc):  # Blackman windowed sinc, fir coefficient order
+    c = []
+    for k in range(n):
+        t = k - (n - 1) / 2
+        s = 2 * fc if t == 0 else sin(2 * pi * fc * t) / (pi * t)
+        w = 0.42 - 0.5 * cos(2 * pi * k / (n - 1)) + 0.08 * cos(4 * pi * k / (n - 1))
+        c.append(int(s * w * 40000))
+    return array('i', c)
+
+
+class Noise:  # Repeatable pseudo random sequence in range +-2048
+    def __init__(self):
+        self.x = 1
+
+    def __call__(self):
+        self.x = (self.x * 1103515245 + 12345) & 0x7fffffff
+        return ((self.x >> 16) & 4095) - 2048
+
+
+def test(coeffs, b):
+    pf = PartitionedFIR(coeffs, SHIFT, b)
+    n = len(coeffs)
+    nd = min(n, 2 * b)
+    hist = [0] * n  # Oldest first
+    noise = Noise()
+    err = 0
+    peak = 0
+    tmax = 0
+    for _ in range(NSAMPLES):
+        x = noise()
+        hist.pop(0)
+        hist.append(x)
+        t = ticks_us()
+        y = pf(x)
+        tmax = max(tmax, ticks_diff(ticks_us(), t))
+        ref = sum((coeffs[k] * hist[k]) >> SHIFT for k in range(n - nd, n))
+        ref += sum(coeffs[k] * hist[k] for k in range(n - nd)) / (1 << SHIFT)
+        err = max(err, abs(y - ref))
+        peak = max(peak, abs(ref))
+    good = err <= peak / 1000 + 2
+    print('B = {:3d} units/tick {} max error {:5.1f} peak {:6.0f} max {:5d}μs {}'.format(
+        b, pf.units_per_tick, err, peak, tmax, 'Pass' if good else 'FAIL'))
+    return good
+
+
+coeffs = lowpass(NTAPS, 0.05)
+ok = True
+for b in (16, 32, 64):
+    ok = test(coeffs, b) and ok
+ok = test(coeffs[492:532], 32) and ok  # No tail: all taps direct
+print('All tests pass' if ok else 'FAILURES')
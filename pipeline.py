@@ -0,0 +1,245 @@
+# pipeline.py Double buffered acquisition and filtering using asyncio
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# A sample source fills one buffer while an asyncio task passes the previous
+# buffer through a chain of filter stages. With an interrupt driven source the
+# two run concurrently so sustained throughput is that of the slower one.
+
+# Buffers are used in strict rotation. Each has a state which is changed by the
+# producer (FREE -> FILLING -> READY) or by the consumer (READY -> BUSY -> FREE)
+# so no locking is needed between an ISR and the filter task.
+
+import asyncio
+from array import array
+
+_FREE = const(0)
+_FILLING = const(1)
+_READY = const(2)
+_BUSY = const(3)
+
+
+class Pipeline:
+    def __init__(self, source, stages, sink=None, nbufs=2, buflen=128):
+        if nbufs < 2:
+            raise ValueError('At least two buffers are required.')
+        self._source = source
+        self._stages = stages
+        self._sink = sink
+        self._bufs = [array('H', (0 for _ in range(buflen))) for _ in range(nbufs)]
+        self._state = bytearray(nbufs)  # All _FREE
+        self._nvalid = array('i', (0 for _ in range(nbufs)))
+        self._wr = 0  # Index of buffer being filled
+        self._rd = 0  # Index of next buffer to filter
+        self._ready = asyncio.ThreadSafeFlag()  # Set by producer (may be an ISR)
+        self._freed = asyncio.ThreadSafeFlag()  # Set by consumer
+        self._halt = asyncio.Event()
+        self.running = False
+        self.blocks = 0  # Blocks filtered
+        self.overruns = 0  # Blocks discarded by an ISR source: no buffer free
+        self.stalls = 0  # Times a task source waited for a free buffer
+        self.backlog = 0  # Max no. of blocks seen awaiting the filter
+
+    def buflen(self):
+        return len(self._bufs[0])
+
+    # ***** Producer interface *****
+    # Return the next buffer to fill or None if the filter has not released
+    # it. May be called from a hard ISR.
+    def acquire(self):
+        wr = self._wr
+        if self._state[wr] == _FREE:
+            self._state[wr] = _FILLING
+            return self._bufs[wr]
+        return None
+
+    # Pass a filled buffer containing n valid samples to the filter task.
+    # May be called from a hard ISR.
+    def release(self, n):
+        wr = self._wr
+        self._nvalid[wr] = n
+        self._state[wr] = _READY
+        self._wr = (wr + 1) % len(self._bufs)
+        self._ready.set()
+
+    # Backpressure for task based sources: wait until a buffer is free.
+    async def get(self):
+        buf = self.acquire()
+        while buf is None:
+            self.stalls += 1
+            await self._freed.wait()
+            buf = self.acquire()
+        return buf
+
+    async def halted(self):
+        await self._halt.wait()
+
+    # ***** Consumer *****
+    async def _filter(self):
+        bufs = self._bufs
+        state = self._state
+        nbufs = len(bufs)
+        while True:
+            rd = self._rd
+            if state[rd] != _READY:
+                if not self.running:
+                    break
+                await self._ready.wait()
+                continue
+            state[rd] = _BUSY
+            waiting = 1  # Includes this one
+            for s in state:
+                if s == _READY:
+                    waiting += 1
+            self.backlog = max(self.backlog, waiting)
+            buf = bufs[rd]
+            n = self._nvalid[rd]
+            if n:  # A source may release an empty block at EOF
+                for stage in self._stages:
+                    r = stage(buf, n)
+                    if r is not None:
+                        n = r
+                if self._sink is not None:
+                    self._sink(buf, n)
+            state[rd] = _FREE
+            self._rd = (rd + 1) % nbufs
+            self.blocks += 1
+            self._freed.set()
+            await asyncio.sleep(0)
+
+    # Run until the source is exhausted or .stop() is called. Any blocks
+    # already acquired are filtered before returning.
+    async def run(self):
+        self.running = True
+        self._halt.clear()
+        consumer = asyncio.create_task(self._filter())
+        try:
+            await self._source.run(self)
+        finally:
+            self.running = False
+            self._ready.set()  # Let consumer see termination
+        await consumer
+
+    def stop(self):
+        self.running = False
+        self._halt.set()
+
+
+# ***** Sample sources *****
+# A source has an asynchronous .run(pipe) method which fills buffers until
+# pipe.running is False or the data is exhausted.
+
+# Timer interrupt reads an ADC at a fixed rate. ADC.read_timed cannot be used
+# here because it blocks until the buffer is full.
+class AdcSource:
+    def __init__(self, adc, timer):
+        self._read = adc.read
+        self._timer = timer
+        self._pipe = None
+        self._buf = None
+        self._idx = 0
+        self._len = 0
+        self._cb = self._isr  # Allocate bound method once
+
+    async def run(self, pipe):
+        self._pipe = pipe
+        self._len = pipe.buflen()
+        self._idx = 0
+        self._buf = pipe.acquire()
+        self._timer.callback(self._cb)
+        try:
+            await pipe.halted()
+        finally:
+            self._timer.callback(None)
+
+    def _isr(self, _):
+        buf = self._buf
+        idx = self._idx
+        if buf is not None:
+            buf[idx] = self._read()
+        idx += 1
+        if idx >= self._len:
+            idx = 0
+            if buf is None:  # Whole block was discarded
+                self._pipe.overruns += 1
+            else:
+                self._pipe.release(self._len)
+            self._buf = self._pipe.acquire()
+        self._idx = idx
+
+
+# Replay a file of raw little-endian uint16 samples e.g. an SD card capture.
+class FileSource:
+    def __init__(self, stream):
+        self._stream = stream
+
+    async def run(self, pipe):
+        while pipe.running:
+            buf = await pipe.get()
+            nbytes = self._stream.readinto(memoryview(buf)) or 0
+            pipe.release(nbytes >> 1)  # An empty block is skipped by the filter
+            if nbytes < len(buf) * 2:  # EOF
+                break
+            await asyncio.sleep(0)
+
+
+# Synthetic source: func(n) returns sample number n. Runs nblocks blocks or
+# until stopped if nblocks == 0.
+class SynthSource:
+    def __init__(self, func, nblocks=0):
+        self._func = func
+        self._nblocks = nblocks
+
+    async def run(self, pipe):
+        func = self._func
+        n = 0
+        blk = 0
+        while pipe.running and (not self._nblocks or blk < self._nblocks):
+            buf = await pipe.get()
+            for i in range(len(buf)):
+                buf[i] = func(n)
+                n += 1
+            pipe.release(len(buf))
+            blk += 1
+            await asyncio.sleep(0)
+
+
+# ***** Filter stages *****
+# A stage is a callable taking (buf, n) which processes n samples in place. It
+# returns the number of valid samples now in the buffer or None if unchanged.
+
+# Non-realtime dcf filter (non_realtime/filt.py). Unless it is the last stage
+# setup[2] should include COPY so that results are written back to buf. If op
+# holds a scale factor this is restored before each call.
+class DcfStage:
+    def __init__(self, coeffs, setup, op, scale=None):
+        from filt import dcf, COPY  # Imported on demand: requires ARMV7
+
+        self._dcf = dcf
+        self._copy = setup[2] & COPY
+        self._coeffs = coeffs
+        self._setup = setup
+        self._op = op
+        self._scale = scale
+
+    def __call__(self, buf, n):
+        self._setup[0] = n
+        if self._scale is not None:
+            self._op[0] = self._scale
+        nres = self._dcf(buf, self._op, self._coeffs, self._setup)
+        return nres if self._copy else None
+
+
+# Realtime filter e.g. fir_py.create_fir() applied to each sample. offset is
+# subtracted from each sample and restored to the result which is clipped to
+# the 16 bit range.
+class FirStage:
+    def __init__(self, filt, offset=0):
+        self._filt = filt
+        self._offset = offset
+
+    def __call__(self, buf, n):
+        filt = self._filt
+        offs = self._offset
+        for i in range(n):
+            buf[i] = max(0, min(filt(buf[i] - offs) + offs, 0xFFFF))
@@ -0,0 +1,36 @@
+# pipelinetest.py Demo of the double buffered pipeline
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Uses a synthetic source so runs on any platform including the Unix build.
+# A 10 cycle sinewave on a 2048 bias is low pass filtered by a 21 tap FIR.
+
+import asyncio
+from array import array
+from math import sin, pi
+from fir_py import create_fir
+from pipeline import Pipeline, SynthSource, FirStage
+
+# 21 tap LPF. Figures from TFilter. DC gain is 79364, scale by 16 bits.
+coeffs = array('i', (-1318, -3829, -4009, -717, 3359, 2177, -3706, -5613,
+                    4154, 20372, 28471, 20372, 4154, -5613, -3706, 2177,
+                    3359, -717, -4009, -3829, -1318))
+
+BUFLEN = 64
+
+def signal(n):
+    return 2048 + int(1000 * sin(2 * pi * n / 100))
+
+def sink(buf, n):
+    print('Block', pipe.blocks, 'max', max(buf[i] for i in range(n)))
+
+pipe = Pipeline(SynthSource(signal, nblocks=10),
+                (FirStage(create_fir(coeffs, 16), offset=2048),),
+                sink, nbufs=3, buflen=BUFLEN)
+
+async def main():
+    await pipe.run()
+    print('Blocks', pipe.blocks, 'stalls', pipe.stalls, 'overruns', pipe.overruns,
+          'max backlog', pipe.backlog)
+
+asyncio.run(main())
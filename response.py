@@ -0,0 +1,170 @@
+# response.py Frequency response of coefficient sets. Runs under CPython on a PC.
+# Requires numpy.
+
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Computes magnitude, phase and group delay of FIR filters from their
+# coefficients, enabling designs to be checked before deployment. Each filter
+# has an ideal response and a quantised response (that of the coefficients
+# actually realised in fixed point). Many filters are processed at once by a
+# single zero padded FFT of a 2D array. Results are cached keyed by a hash of
+# the taps and FFT size, optionally on disk so that repeated runs (e.g. in CI)
+# only compute responses of filters which have changed.
+
+import hashlib
+import os
+import sys
+import numpy as np
+
+_cache = {}
+
+
+# A filter for analysis: ideal and quantised taps as float arrays.
+class Filter:
+    def __init__(self, name, ideal, quantised=None):
+        self.name = name
+        self.ideal = np.asarray(ideal, dtype=np.float64)
+        self.quantised = self.ideal if quantised is None else np.asarray(quantised, dtype=np.float64)
+
+
+# Integer coefficients as used by fir, fir_py, create_fir with a shift. The
+# realised gain of each tap is c / 2**shift so ideal and quantised are the
+# same.
+def from_int(coeffs, shift, name='int'):
+    return Filter(name, np.asarray(coeffs, dtype=np.float64) / (1 << shift))
+
+
+# Float coefficients as used by dcf. The quantised response is that of the
+# coefficients rounded to bits fractional bits (e.g. 15 for Q15 with dcf_int,
+# or the shift to be used with fir).
+def from_float(coeffs, bits=15, scale=1.0, name='float'):
+    ideal = np.asarray(coeffs, dtype=np.float64) * scale
+    return Filter(name, ideal, np.round(ideal * (1 << bits)) / (1 << bits))
+
+
+# Moving average of n samples. If shift is not None the sum is shifted right
+# rather than divided by n (as in avg_pico), giving taps of 1/2**shift.
+def moving_average(n, shift=None, name='avg'):
+    q = None if shift is None else np.full(n, 1.0 / (1 << shift))
+    return Filter(name, np.full(n, 1.0 / n), q)
+
+
+def _key(taps, nfft):
+    return hashlib.sha1(taps.tobytes() + nfft.to_bytes(4, 'little')).hexdigest()
+
+
+# Return complex responses, one row per tap array, for nfft // 2 + 1
+# frequencies from 0 to fs/2. h(n) * n is transformed alongside h(n) for group
+# delay. Cached rows are reused; others are computed in a single FFT.
+def _spectra(taparrays, nfft, cachedir):
+    keys = [_key(t, nfft) for t in taparrays]
+    todo = []
+    for i, k in enumerate(keys):
+        if k in _cache:
+            continue
+        fn = cachedir and os.path.join(cachedir, k + '.npy')
+        if fn and os.path.exists(fn):
+            _cache[k] = np.load(fn)
+        else:
+            todo.append(i)
+    if todo:
+        width = max(len(taparrays[i]) for i in todo)
+        if width > nfft:
+            raise ValueError('FFT size must be >= no. of taps.')
+        h = np.zeros((len(todo), width))
+        for row, i in enumerate(todo):
+            h[row, :len(taparrays[i])] = taparrays[i]
+        hn = h * np.arange(width)
+        f = np.fft.rfft(np.concatenate((h, hn)), n=nfft, axis=1)
+        for row, i in enumerate(todo):
+            res = np.stack((f[row], f[row + len(todo)]))
+            _cache[keys[i]] = res
+            if cachedir:
+                os.makedirs(cachedir, exist_ok=True)
+                np.save(os.path.join(cachedir, keys[i] + '.npy'), res)
+    return [_cache[k] for k in keys]
+
+
+class Response:
+    def __init__(self, freqs, spec):
+        h, hn = spec
+        mag = np.abs(h)
+        self.freqs = freqs
+        self.magnitude = mag
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.db = 20 * np.log10(np.maximum(mag, 1e-20))
+            # Group delay in samples. Undefined at zeros of the response.
+            self.group_delay = np.where(mag > 1e-9, np.real(hn / h), np.nan)
+        self.phase = np.unwrap(np.angle(h))
+
+
+# Return a list of (ideal, quantised) Response pairs, one for each Filter.
+def analyse(filters, fs=1.0, nfft=4096, cachedir=None):
+    taps = [f.ideal for f in filters] + [f.quantised for f in filters]
+    spectra = _spectra(taps, nfft, cachedir)
+    freqs = np.fft.rfftfreq(nfft, 1 / fs)
+    n = len(filters)
+    return [(Response(freqs, spectra[i]), Response(freqs, spectra[i + n])) for i in range(n)]
+
+
+def clear_cache():
+    _cache.clear()
+
+
+# Check a Response against a spec. passbands: sequence of (f0, f1, ripple)
+# where ripple is the maximum peak to peak variation in dB. stopbands:
+# sequence of (f0, f1, atten) where atten is the minimum attenuation in dB
+# relative to the maximum passband gain (0dB if no passbands are given).
+# Returns a list of failure messages: empty if the spec is met.
+def check(resp, passbands=(), stopbands=()):
+    errors = []
+    ref = None
+    for f0, f1, ripple in passbands:
+        db = resp.db[(resp.freqs >= f0) & (resp.freqs <= f1)]
+        if not len(db):
+            raise ValueError('No frequencies in {}-{}: increase nfft.'.format(f0, f1))
+        ref = db.max() if ref is None else max(ref, db.max())
+        if db.max() - db.min() > ripple:
+            errors.append('Passband {}-{} ripple {:.2f}dB > {}dB'.format(f0, f1, db.max() - db.min(), ripple))
+    ref = 0.0 if ref is None else ref
+    for f0, f1, atten in stopbands:
+        db = resp.db[(resp.freqs >= f0) & (resp.freqs <= f1)]
+        if not len(db):
+            raise ValueError('No frequencies in {}-{}: increase nfft.'.format(f0, f1))
+        if ref - db.max() < atten:
+            errors.append('Stopband {}-{} attenuation {:.2f}dB < {}dB'.format(f0, f1, ref - db.max(), atten))
+    return errors
+
+
+# Load an array from a Python source file such as non_realtime/coeffs.py.
+def load(fn, name):
+    ns = {}
+    with open(fn) as f:
+        exec(f.read(), ns)
+    return ns[name]
+
+
+def main(argv):
+    import argparse
+    p = argparse.ArgumentParser(description='Frequency response of a coefficient array.')
+    p.add_argument('file', help='Python file defining the array.')
+    p.add_argument('name', help='Name of the array.')
+    p.add_argument('--shift', type=int, help='Integer coefficients with this shift.')
+    p.add_argument('--bits', type=int, default=15, help='Quantisation of float coefficients.')
+    p.add_argument('--fs', type=float, default=1.0, help='Sample rate.')
+    p.add_argument('--nfft', type=int, default=4096)
+    p.add_argument('--points', type=int, default=21, help='No. of frequencies to print.')
+    p.add_argument('--cache', help='Cache directory.')
+    a = p.parse_args(argv)
+    coeffs = load(a.file, a.name)
+    filt = from_float(coeffs, a.bits) if a.shift is None else from_int(coeffs, a.shift)
+    ideal, quant = analyse([filt], a.fs, a.nfft, a.cache)[0]
+    print('{:>10s} {:>9s} {:>9s} {:>9s} {:>9s}'.format('Freq', 'Ideal dB', 'Quant dB', 'Phase', 'Delay'))
+    for i in np.linspace(0, len(ideal.freqs) - 1, a.points).astype(int):
+        print('{:10.2f} {:9.2f} {:9.2f} {:9.3f} {:9.2f}'.format(ideal.freqs[i], ideal.db[i],
+              quant.db[i], quant.phase[i], quant.group_delay[i]))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
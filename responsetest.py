@@ -0,0 +1,54 @@
+# responsetest.py Test of response.py. Runs under CPython on a PC.
+
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Checks the bandpass coefficients of non_realtime/coeffs.py against their
+# TFilter design spec, checks moving averages against their known response and
+# times analysis of a batch of filters.
+
+import time
+import numpy as np
+from response import analyse, check, from_float, from_int, moving_average, load, clear_cache
+
+def test():
+    ok = True
+    coeffs = load('non_realtime/coeffs.py', 'coeffs_8a')
+    # Spec from TFilter (2KHz sampling). Q15 and Q10 quantisation.
+    passbands = ((245, 255, 3),)
+    stopbands = ((0, 160, 50), (340, 1000, 50))
+    filts = [from_float(coeffs, 15, name='Q15'), from_float(coeffs, 10, name='Q10')]
+    for filt, (ideal, quant) in zip(filts, analyse(filts, 2000, 8192)):
+        errs = check(ideal, passbands, stopbands)
+        qerrs = check(quant, passbands, stopbands)
+        print(filt.name, 'ideal', errs or 'Pass', 'quantised', qerrs or 'Pass')
+        ok = ok and not errs
+    ok = ok and not check(analyse(filts[:1], 2000, 8192)[0][1], passbands, stopbands)
+    # Moving average of 8: nulls at multiples of fs/8, group delay 3.5 samples.
+    ideal, quant = analyse([moving_average(8, 3)], 8, 64)[0]
+    nulls = ideal.magnitude[[8, 16, 24]]
+    good = np.all(nulls < 1e-9) and np.allclose(ideal.group_delay[:8], 3.5)
+    print('Moving average', 'Pass' if good else 'FAIL')
+    ok = ok and good
+    # Integer coefficients: DC gain is sum / 2**shift.
+    ideal, quant = analyse([from_int([1024, 2048, 1024], 12)])[0]
+    good = abs(ideal.magnitude[0] - 1.0) < 1e-12
+    print('Integer coeffs', 'Pass' if good else 'FAIL')
+    return ok and good
+
+def timing():
+    rng = np.random.default_rng(0)
+    filts = [from_float(rng.uniform(-0.1, 0.1, 101)) for _ in range(100)]
+    clear_cache()
+    t = time.perf_counter()
+    resps = analyse(filts, 2000)
+    for ideal, quant in resps:
+        check(quant, ((0, 100, 3),), ((400, 1000, 40),))
+    t = time.perf_counter() - t
+    print('100 filters analysed and checked in {:.1f}ms'.format(t * 1000))
+    t = time.perf_counter()
+    analyse(filts, 2000)
+    print('Cached: {:.1f}ms'.format((time.perf_counter() - t) * 1000))
+
+print('All tests pass' if test() else 'FAILURES')
+timing()
@@ -0,0 +1,156 @@
+# rms.py Moving mean square, variance and RMS implemented with Viper
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# As with avg.py a running sum is maintained, together with a running sum of
+# squares held to 64 bits. Each sample costs O(1) regardless of the window
+# length. The window length n must be a power of 2 so that means are computed
+# by shifting. Results:
+# MEAN      sum / n
+# MEANSQ    sum of squares / n (power)
+# VAR       MEANSQ - MEAN**2
+# RMS       sqrt(MEANSQ)
+# STD       sqrt(VAR) (RMS of the AC component)
+# Square roots are integer (rounded down). Samples are clipped to the range
+# +-32767 (e.g. 16 bit signed) so that every result is below 2**30. Results
+# are therefore small ints and returning them does not allocate, even in
+# MEANSQ and VAR modes. The window is limited to 2**16 samples so that the sum
+# fits 32 bits.
+
+# Scratchpad (integer array of n + 6 elements, initially zero except):
+# data[0] array length, data[1] sum, data[2] insertion point (byte offset),
+# data[3] sum of squares low word, data[4] high word, data[5] log2(n),
+# data[6:] ring buffer.
+
+from array import array
+
+MEAN = const(0)
+MEANSQ = const(1)
+VAR = const(2)
+RMS = const(3)
+STD = const(4)
+_HDR = const(6)
+
+
+@micropython.viper
+def _isqrt(x: int) -> int:
+    r: int = 0
+    b: int = 1 << 30
+    while b > x:
+        b >>= 2
+    while b:
+        if x >= r + b:
+            x -= r + b
+            r = (r >> 1) + b
+        else:
+            r >>= 1
+        b >>= 2
+    return r
+
+
+# Add a sample, returning the result for mode.
+@micropython.viper
+def msq(data, val: int, mode: int) -> int:
+    d = ptr32(data)
+    if val > 32767:
+        val = 32767
+    elif val < -32767:
+        val = -32767
+    n: int = d[0] - _HDR
+    k: int = d[5]
+    i: int = d[2] >> 2
+    old: int = d[_HDR + i]
+    s: int = d[1] - old + val
+    d[1] = s
+    d[_HDR + i] = val
+    i += 1
+    d[2] = (i << 2) if (i < n) else 0
+    lo: uint = uint(d[3])
+    hi: int = d[4]
+    t: uint = uint(lo + uint(val * val))
+    if t < lo:
+        hi += 1
+    lo = t
+    t = uint(lo - uint(old * old))
+    if t > lo:
+        hi -= 1
+    lo = t
+    d[3] = int(lo)
+    d[4] = hi
+    mean: int = s >> k
+    if mode == MEAN:
+        return mean
+    ms: int = int(lo) if k == 0 else int(uint((lo >> k) | uint(hi << (32 - k))))
+    if mode == MEANSQ:
+        return ms
+    if mode == RMS:
+        return int(_isqrt(ms))
+    v: int = ms - mean * mean
+    if v < 0:  # Rounding of the mean
+        v = 0
+    if mode == VAR:
+        return v
+    return int(_isqrt(v))
+
+
+# Block mode. ctl: [nsamples, mode, offset, half word flag, write flag].
+# If ctl[3] src is an array of half words (e.g. from read_timed) with ctl[2]
+# subtracted from each, otherwise an integer array. If ctl[4] the result for
+# each sample is written to integer array dst (which may be src). Returns the
+# result for the last sample.
+@micropython.viper
+def msq_block(data, src, dst, ctl) -> int:
+    c = ptr32(ctl)
+    p16 = ptr16(src)
+    p32 = ptr32(src)
+    q = ptr32(dst)
+    ns: int = c[0]
+    mode: int = c[1]
+    offs: int = c[2]
+    half: int = c[3]
+    wr: int = c[4]
+    res: int = 0
+    j: int = 0
+    while j < ns:
+        x: int = (int(p16[j]) - offs) if half else p32[j]
+        res = int(msq(data, x, mode))
+        if wr:
+            q[j] = res
+        j += 1
+    return res
+
+
+class Meter:
+    # n: window length (a power of 2). mode: MEAN, MEANSQ, VAR, RMS or STD.
+    def __init__(self, n, mode=RMS):
+        if n < 1 or n & (n - 1) or n > 65536:
+            raise ValueError('Window length must be a power of 2 <= 65536.')
+        if not MEAN <= mode <= STD:
+            raise ValueError('Invalid mode.')
+        self.mode = mode
+        self._data = array('i', (0 for _ in range(n + _HDR)))
+        self._data[0] = n + _HDR
+        self._data[5] = len(bin(n)) - 3  # log2(n)
+        self._ctl = array('i', (0 for _ in range(5)))
+
+    # Process one sample. May be called from a hard ISR.
+    def __call__(self, x):
+        return msq(self._data, x, self.mode)
+
+    # Process n samples (default len(src)). If offset is not None src is an
+    # array of unsigned half words with offset subtracted from each. If dst is
+    # not None each result is written to it. Returns the last result.
+    def block(self, src, n=None, offset=None, dst=None):
+        c = self._ctl
+        c[0] = len(src) if n is None else n
+        c[1] = self.mode
+        c[2] = 0 if offset is None else offset
+        c[3] = offset is not None
+        c[4] = dst is not None
+        return msq_block(self._data, src, self._ctl if dst is None else dst, c)
+
+    def reset(self):
+        d = self._data
+        for i in range(1, len(d)):
+            if i != 5:
+                d[i] = 0
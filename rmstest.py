@@ -0,0 +1,61 @@
+# rmstest.py Test/demo of the moving RMS meter
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# A sinewave of amplitude 10000 with a DC offset of 3000 is measured. Over a
+# whole number of cycles the expected results are mean 3000, RMS
+# sqrt(3000**2 + 10000**2 / 2) = 7681 and standard deviation 10000 / sqrt(2)
+# = 7071. Per sample and block results are compared with a Python reference.
+
+from array import array
+from math import sin, pi, sqrt
+from time import ticks_us, ticks_diff
+from rms import Meter, MEAN, MEANSQ, VAR, RMS, STD
+
+N = 64  # Window: 4 cycles of 16 samples
+
+def sample(n):
+    return 3000 + int(10000 * sin(2 * pi * n / 16))
+
+def ref(window, mode):
+    mean = sum(window) >> 6
+    ms = sum(x * x for x in window) >> 6
+    var = max(ms - mean * mean, 0)
+    return (mean, ms, var, int(sqrt(ms)), int(sqrt(var)))[mode]
+
+def test():
+    ok = True
+    for mode, name in ((MEAN, 'Mean'), (MEANSQ, 'Mean square'), (VAR, 'Variance'),
+                       (RMS, 'RMS'), (STD, 'Std dev')):
+        m = Meter(N, mode)
+        hist = [0] * N
+        good = True
+        for n in range(200):
+            x = sample(n)
+            hist = hist[1:] + [x]
+            res = m(x)
+            good = good and res == ref(hist, mode)
+        print('{:12s} {:10d} {}'.format(name, res, 'Pass' if good else 'FAIL'))
+        ok = ok and good
+    # Block mode with half word samples from an ADC biassed at 2048
+    m = Meter(N, STD)
+    buf = array('H', (2048 + sample(n) // 8 for n in range(200)))
+    dst = array('i', (0 for _ in range(200)))
+    last = m.block(buf, offset=2048, dst=dst)
+    m1 = Meter(N, STD)
+    good = all(dst[n] == m1(buf[n] - 2048) for n in range(200)) and last == dst[-1]
+    print('Block mode', last, 'Pass' if good else 'FAIL')
+    ok = ok and good
+    # Out of range samples are clipped: the mean square remains a small int
+    m = Meter(N, MEANSQ)
+    for _ in range(N):
+        res = m(-100000)
+    good = res == 32767 * 32767 and res < (1 << 30)
+    print('Clipping', res, 'Pass' if good else 'FAIL')
+    return ok and good
+
+print('All tests pass' if test() else 'FAILURES')
+m = Meter(N)
+t = ticks_us()
+m(1000)
+print('Time per sample {}μs'.format(ticks_diff(ticks_us(), t)))
@@ -0,0 +1,101 @@
+# sampleq.py Single producer, single consumer queue from an ISR to asyncio
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# The producer (typically a timer callback) pushes values into a preallocated
+# ring. An asyncio task drains them in bulk into a caller supplied buffer.
+# The write index is changed only by the producer and the read index only by
+# the consumer so no locking is needed. A ThreadSafeFlag wakes the consumer
+# when a batch of values is waiting.
+# If the ring is full the new value is discarded and counted as an overrun.
+
+import asyncio
+from array import array
+
+
+class SampleQueue:
+    # size: capacity. typecode: 'i' or 'f'. batch: no. of values which must be
+    # waiting before the consumer is woken.
+    def __init__(self, size, typecode='i', batch=1):
+        if size < 1 or not 1 <= batch <= size:
+            raise ValueError('Batch must be in range 1 to size.')
+        if typecode not in ('i', 'f'):
+            raise ValueError("Typecode must be 'i' or 'f'.")
+        self._buf = array(typecode, (0 for _ in range(size + 1)))  # One slot empty
+        self._mv = memoryview(self._buf)
+        # Write index, read index, ring length, overruns, high water mark, batch,
+        # flush request
+        self._ctl = array('i', (0, 0, size + 1, 0, 0, batch, 0))
+        self._flag = asyncio.ThreadSafeFlag()
+
+    # Add a value. Returns False on overrun. May be called from a hard ISR
+    # (floats in a hard ISR require a port where they do not allocate).
+    def push(self, x):
+        c = self._ctl
+        wr = c[0]
+        n = c[2]
+        nxt = (wr + 1) if (wr < n - 1) else 0
+        if nxt == c[1]:
+            c[3] += 1
+            return False
+        self._buf[wr] = x
+        c[0] = nxt
+        used = nxt - c[1]
+        if used < 0:
+            used += n
+        if used > c[4]:
+            c[4] = used
+        if used >= c[5]:
+            self._flag.set()
+        return True
+
+    # No. of values waiting.
+    def __len__(self):
+        c = self._ctl
+        return (c[0] - c[1]) % c[2]
+
+    # Copy up to len(dst) waiting values to dst without waiting, returning the
+    # number copied. dst is an array of the same typecode.
+    def get_nowait(self, dst):
+        c = self._ctl
+        n = c[2]
+        rd = c[1]
+        avail = (c[0] - rd) % n
+        count = min(avail, len(dst))
+        first = min(count, n - rd)  # Up to the end of the ring
+        dmv = memoryview(dst)
+        dmv[:first] = self._mv[rd:rd + first]
+        if count > first:
+            dmv[first:count] = self._mv[:count - first]
+        c[1] = (rd + count) % n
+        return count
+
+    # Wait until a batch of values is waiting then copy up to len(dst) of them
+    # to dst, returning the number copied.
+    async def drain(self, dst):
+        c = self._ctl
+        while len(self) < c[5] and not c[6]:
+            await self._flag.wait()
+        n = self.get_nowait(dst)
+        if not len(self):  # A flush holds until the queue is empty
+            c[6] = 0
+        return n
+
+    # Wake a task waiting in drain() even if a full batch is not waiting (e.g.
+    # when acquisition stops). It will return any waiting values.
+    def flush(self):
+        self._ctl[6] = 1
+        self._flag.set()
+
+    @property
+    def overruns(self):
+        return self._ctl[3]
+
+    # Maximum number of values seen waiting.
+    @property
+    def hwm(self):
+        return self._ctl[4]
+
+    def reset_stats(self):
+        self._ctl[3] = 0
+        self._ctl[4] = 0
@@ -0,0 +1,64 @@
+# sampleqtest.py Test/demo of the ISR to asyncio sample queue
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Runs on any platform including the Unix build. A task simulates an ISR by
+# pushing values in bursts; on hardware push() would be called from a timer
+# callback. The consumer drains the queue in batches and checks that every
+# value arrives in order. The queue is then deliberately overrun.
+
+import asyncio
+from array import array
+from sampleq import SampleQueue
+
+NVALUES = 1000
+
+async def producer(q):
+    n = 0
+    while n < NVALUES:
+        for _ in range(37):  # Burst of samples
+            if n < NVALUES:
+                q.push(n)
+                n += 1
+        await asyncio.sleep_ms(1)
+    q.flush()  # Release the final partial batch
+
+async def consumer(q, dst):
+    expected = 0
+    ok = True
+    batches = 0
+    while expected < NVALUES:
+        n = await q.drain(dst)
+        batches += 1
+        for i in range(n):
+            ok = ok and dst[i] == expected
+            expected += 1
+    return ok, batches
+
+async def main():
+    q = SampleQueue(256, batch=64)
+    dst = array('i', (0 for _ in range(128)))
+    asyncio.create_task(producer(q))
+    ok, batches = await consumer(q, dst)
+    print('Received in order', ok, 'batches', batches, 'high water mark', q.hwm,
+          'overruns', q.overruns)
+    for x in range(300):  # No consumer: overrun
+        q.push(x)
+    print('Overruns', q.overruns, 'waiting', len(q))
+    ok = ok and q.overruns == 44 and len(q) == 256
+    # Flush with a backlog larger than dst: successive drains empty the queue
+    q = SampleQueue(256, batch=200)
+    for x in range(100):
+        q.push(x)
+    q.flush()
+    dst = array('i', (0 for _ in range(50)))
+    got = []
+    for _ in range(2):
+        n = await asyncio.wait_for(q.drain(dst), 1)
+        got.extend(dst[:n])
+    good = got == list(range(100)) and not len(q)
+    print('Flush with short dst', 'Pass' if good else 'FAIL')
+    ok = ok and good
+    print('All tests pass' if ok else 'FAILURES')
+
+asyncio.run(main())
@@ -0,0 +1,170 @@
+# sdft.py Sliding DFT: continuously updated spectrum of selected bins
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Maintains K bins of an N point DFT over the most recent N samples. Each new
+# sample costs one complex multiply per bin regardless of N, so a spectrum is
+# available after every sample without running an FFT.
+# Recurrence for bin k with damping factor r < 1:
+# X[k] = r * exp(j2pi*k/N) * (X[k] + x[n] - r**N * x[n-N])
+# The damping ensures that rounding errors decay rather than accumulate.
+
+# As in fir_py the sample history is a ring buffer with the insertion index
+# held in a control array.
+# ctl [insertion index, N, K, r**N (Q14), offset, no. of samples (block)]
+# tw  [re, im] twiddle per bin, premultiplied by r (Q14)
+# st  [re, im] per bin followed by the ring buffer of N samples
+# Multiplication by a Q14 value is split into two 16 bit products so bin
+# values may approach 2**30: N * max(abs(sample)) should be < 2**29.
+
+from array import array
+from math import cos, sin, pi
+
+_QBITS = const(14)
+_QMASK = const(0x3FFF)
+
+
+@micropython.viper
+def _update(ctl, tw, st, x: int):
+    c = ptr32(ctl)
+    t = ptr32(tw)
+    s = ptr32(st)
+    nb: int = c[2]
+    buf: int = 2 * nb  # Offset of ring buffer in st
+    i: int = c[0]
+    old: int = s[buf + i]
+    x -= c[4]
+    s[buf + i] = x
+    c[0] = (i + 1) if (i < c[1] - 1) else 0
+    rn: int = c[3]
+    delta: int = x - rn * (old >> _QBITS) - ((rn * (old & _QMASK)) >> _QBITS)
+    k: int = 0
+    while k < 2 * nb:
+        a: int = s[k] + delta  # Real
+        b: int = s[k + 1]  # Imag
+        wr: int = t[k]
+        wi: int = t[k + 1]
+        ah: int = a >> _QBITS
+        al: int = a & _QMASK
+        bh: int = b >> _QBITS
+        bl: int = b & _QMASK
+        s[k] = wr * ah - wi * bh + ((wr * al - wi * bl) >> _QBITS)
+        s[k + 1] = wr * bh + wi * ah + ((wr * bl + wi * al) >> _QBITS)
+        k += 2
+
+
+# Block version: buf is an array of unsigned half words e.g. from read_timed.
+@micropython.viper
+def _block(ctl, tw, st, buf):
+    c = ptr32(ctl)
+    t = ptr32(tw)
+    s = ptr32(st)
+    p = ptr16(buf)
+    nb: int = c[2]
+    rb: int = 2 * nb
+    end: int = c[1] - 1
+    rn: int = c[3]
+    offs: int = c[4]
+    ns: int = c[5]
+    i: int = c[0]
+    j: int = 0
+    while j < ns:
+        x: int = p[j] - offs
+        old: int = s[rb + i]
+        s[rb + i] = x
+        i = (i + 1) if (i < end) else 0
+        delta: int = x - rn * (old >> _QBITS) - ((rn * (old & _QMASK)) >> _QBITS)
+        k: int = 0
+        while k < rb:
+            a: int = s[k] + delta
+            b: int = s[k + 1]
+            wr: int = t[k]
+            wi: int = t[k + 1]
+            ah: int = a >> _QBITS
+            al: int = a & _QMASK
+            bh: int = b >> _QBITS
+            bl: int = b & _QMASK
+            s[k] = wr * ah - wi * bh + ((wr * al - wi * bl) >> _QBITS)
+            s[k + 1] = wr * bh + wi * ah + ((wr * bl + wi * al) >> _QBITS)
+            k += 2
+        j += 1
+    c[0] = i
+
+
+# Integer magnitude of each bin. Values are normalised to 15 bits before
+# squaring so precision is 1 part in 2**15.
+@micropython.viper
+def _mags(ctl, st, mag):
+    c = ptr32(ctl)
+    s = ptr32(st)
+    m = ptr32(mag)
+    nb: int = c[2]
+    k: int = 0
+    while k < nb:
+        a: int = s[2 * k]
+        b: int = s[2 * k + 1]
+        a = a if a >= 0 else -a
+        b = b if b >= 0 else -b
+        sh: int = 0
+        while (a | b) >= 0x8000:
+            a >>= 1
+            b >>= 1
+            sh += 1
+        v: int = a * a + b * b
+        r: int = 0  # Integer square root of v
+        bit: int = 1 << 30
+        while bit > v:
+            bit >>= 2
+        while bit:
+            if v >= r + bit:
+                v -= r + bit
+                r = (r >> 1) + bit
+            else:
+                r >>= 1
+            bit >>= 2
+        m[k] = r << sh
+        k += 1
+
+
+class SDFT:
+    # n: DFT length. bins: sequence of bin numbers (frequency = bin * fs / n).
+    # r: damping factor. offset: subtracted from each sample.
+    def __init__(self, n, bins, r=0.9999, offset=0):
+        nb = len(bins)
+        if n < 2 or nb < 1:
+            raise ValueError('Invalid DFT length or bin list.')
+        if not 0 < r < 1:
+            raise ValueError('Damping factor must be in range 0 < r < 1.')
+        self._ctl = array('i', (0, n, nb, round(r ** n * (1 << _QBITS)), offset, 0))
+        self._tw = array('i', (0 for _ in range(2 * nb)))
+        for i, k in enumerate(bins):
+            w = 2 * pi * k / n
+            # Truncation ensures abs(twiddle) <= r
+            self._tw[2 * i] = int(r * cos(w) * (1 << _QBITS))
+            self._tw[2 * i + 1] = int(r * sin(w) * (1 << _QBITS))
+        self._st = array('i', (0 for _ in range(2 * nb + n)))
+        self.mag = array('i', (0 for _ in range(nb)))
+
+    # Process one integer sample. May be called from a hard ISR.
+    def __call__(self, x):
+        _update(self._ctl, self._tw, self._st, x)
+
+    # Process an array of unsigned half words.
+    def block(self, buf, n=None):
+        self._ctl[5] = len(buf) if n is None else n
+        _block(self._ctl, self._tw, self._st, buf)
+
+    # Update .mag with the magnitude of each bin and return it. A sinewave of
+    # amplitude A centred on a bin produces a magnitude of about A * N / 2.
+    def magnitudes(self):
+        _mags(self._ctl, self._st, self.mag)
+        return self.mag
+
+    # Unscaled real and imaginary parts of bin i
+    def bin(self, i):
+        return self._st[2 * i], self._st[2 * i + 1]
+
+    def reset(self):
+        for i in range(len(self._st)):
+            self._st[i] = 0
+        self._ctl[0] = 0
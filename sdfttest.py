@@ -0,0 +1,50 @@
+# sdfttest.py Test/demo of the sliding DFT
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# A 64 point DFT monitors bins 4, 8 and 12 of a signal sampled at 2KHz (bin
+# spacing 31.25Hz). The signal has components of amplitude 1000 at 250Hz (bin
+# 8) and 200 at 375Hz (bin 12). Expected magnitudes are A * N / 2 i.e. 0, 32000
+# and 6400, and per sample and block processing must agree exactly.
+
+from array import array
+from math import sin, pi
+from time import ticks_us, ticks_diff
+from sdft import SDFT
+
+N = 64
+bins = (4, 8, 12)
+
+def sample(n):
+    return 2048 + int(1000 * sin(2 * pi * 8 * n / N) + 200 * sin(2 * pi * 12 * n / N))
+
+expected = (0, 1000 * N // 2, 200 * N // 2)
+
+def check(mags):  # Tone bins within 2%, empty bin below 1% of the largest tone
+    return all(abs(m - e) <= (0.02 * e if e else 0.01 * max(expected))
+               for m, e in zip(mags, expected))
+
+def test():
+    s = SDFT(N, bins, offset=2048)
+    for n in range(4 * N):
+        s(sample(n))
+    a = list(s.magnitudes())
+    ok = check(a)
+    print('Per sample', a, 'Pass' if ok else 'FAIL')
+    t = SDFT(N, bins, offset=2048)
+    buf = array('H', (sample(n) for n in range(4 * N)))
+    t.block(buf)
+    b = list(t.magnitudes())
+    good = check(b)
+    print('Block     ', b, 'Pass' if good else 'FAIL')
+    ok = ok and good
+    good = a == b and all(s.bin(i) == t.bin(i) for i in range(len(bins)))
+    print('Per sample matches block', 'Pass' if good else 'FAIL')
+    ok = ok and good
+    tim = ticks_us()
+    s(2048)
+    tim = ticks_diff(ticks_us(), tim)
+    print('Update time {}μs for {} bins'.format(tim, len(bins)))
+    print('All tests pass' if ok else 'FAILURES')
+
+test()
@@ -0,0 +1,191 @@
+# sgolay.py Savitzky-Golay smoothing and differentiating filters
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# A polynomial of the given order is fitted by least squares to a window of n
+# samples and evaluated, or differentiated, at one point in the window. Since
+# the fit is linear in the samples each result is an FIR filter. Peaks and
+# edges are preserved far better than by a moving average of similar noise
+# reduction, and a polynomial of order k passes through a signal of order k
+# unchanged.
+# The point of evaluation is lag samples before the newest. The default is the
+# centre of the window giving linear phase (a constant delay of (n - 1) / 2
+# samples) and the best noise reduction. With lag == 0 the fit is evaluated at
+# the newest sample: there is no delay, at the cost of more noise.
+# Derivatives are per sample: multiply the slope by fs and the curvature by
+# fs**2 for units per second.
+
+# Coefficients are in fir order (coeffs[0] applies to the oldest sample) which
+# is also the default order of dcf. sg_coeffs returns floats for dcf, sg_fir
+# integers with a shift for fir.
+
+# The SavGol class computes value, slope and curvature in one pass over a
+# history with the fir_py.fir scratchpad layout:
+# [ncoeffs, shift, insertion offset (bytes), ring buffer...]
+# Its coefficient array holds the three integer sets (each of n elements)
+# followed by their three shifts.
+
+from array import array
+from filters import prime_fir
+
+
+# Insert a sample and write the value, slope and curvature to res[0:3],
+# returning the value. Unlike fir, products are accumulated in full and each
+# sum is shifted once with rounding, avoiding the bias of truncating every
+# product. quantise ensures that the sums cannot overflow.
+@micropython.viper
+def sg_step(data, coeffs, res, val: int) -> int:
+    d = ptr32(data)
+    co = ptr32(coeffs)
+    r = ptr32(res)
+    nc: int = d[0]
+    end: int = nc - 1
+    c1: int = nc
+    c2: int = nc + nc
+    s0: int = co[c2 + nc]
+    s1: int = co[c2 + nc + 1]
+    s2: int = co[c2 + nc + 2]
+    a0: int = (1 << s0) >> 1  # Rounding
+    a1: int = (1 << s1) >> 1
+    a2: int = (1 << s2) >> 1
+    i: int = d[2] >> 2
+    d[3 + i] = val
+    i = (i + 1) if (i < end) else 0
+    d[2] = i << 2
+    for x in range(nc):
+        v: int = d[3 + i]
+        a0 += co[x] * v
+        a1 += co[c1 + x] * v
+        a2 += co[c2 + x] * v
+        i = (i + 1) if (i < end) else 0
+    a0 >>= s0
+    r[0] = a0
+    r[1] = a1 >> s1
+    r[2] = a2 >> s2
+    return a0
+
+
+# Solve the linear system a.x = b by Gauss-Jordan elimination with partial
+# pivoting. a is a list of rows and is overwritten.
+def _solve(a, b):
+    n = len(b)
+    for i in range(n):
+        a[i].append(b[i])
+    for col in range(n):
+        piv = max(range(col, n), key=lambda r: abs(a[r][col]))
+        a[col], a[piv] = a[piv], a[col]
+        p = a[col][col]
+        if not p:
+            raise ValueError('Singular fit: reduce the order.')
+        for r in range(n):
+            if r != col:
+                f = a[r][col] / p
+                for j in range(col, n + 1):
+                    a[r][j] -= f * a[col][j]
+    return [a[i][n] / a[i][i] for i in range(n)]
+
+
+# Float coefficients for a window of n samples and a polynomial of the given
+# order. deriv: 0 smoothed value, 1 slope, 2 curvature (per sample).
+# lag: point of evaluation in samples before the newest (default the centre).
+def sg_coeffs(n, order=2, deriv=0, lag=None):
+    if not 0 <= order < n:
+        raise ValueError('Order must be in range 0 to n - 1.')
+    if deriv < 0:
+        raise ValueError('Derivative must be >= 0.')
+    lag = (n - 1) / 2 if lag is None else lag
+    if not 0 <= lag <= n - 1:
+        raise ValueError('Lag must be in range 0 to n - 1.')
+    coeffs = array('f', (0 for _ in range(n)))
+    if deriv > order:
+        return coeffs
+    # Time is scaled to about +-1 over the window to condition the normal
+    # equations with single precision floats.
+    h = max(1, (n - 1) / 2)
+    u = [(k - (n - 1 - lag)) / h for k in range(n)]
+    m = order + 1
+    pw = [sum(t ** j for t in u) for j in range(2 * m - 1)]
+    e = [0] * m
+    e[deriv] = 1
+    z = _solve([[pw[i + j] for j in range(m)] for i in range(m)], e)
+    f = 1
+    for j in range(2, deriv + 1):
+        f *= j
+    f /= h ** deriv
+    for k in range(n):
+        coeffs[k] = f * sum(z[j] * u[k] ** j for j in range(m))
+    return coeffs
+
+
+# Quantise float coefficients for fir, returning (coeffs, shift). Each
+# coefficient is scaled by 2**frac (fractional bits in the result) and the
+# shift is the largest for which the sum of the absolute values of the integer
+# coefficients does not exceed 2**bits. Hence no sum of products overflows if
+# abs(sample) * 2**bits < 2**31, e.g. bits=18 for a 12 bit ADC.
+def quantise(coeffs, bits=18, frac=0):
+    if not 1 <= bits <= 30:
+        raise ValueError('bits must be in range 1-30.')
+    lim = (1 << bits) - len(coeffs)  # Allow for rounding
+    norm = sum(abs(c) for c in coeffs) * (1 << frac)
+    shift = 0
+    if norm:
+        if norm > lim:
+            raise ValueError('Coefficients too large: reduce frac or increase bits.')
+        while shift < 30 and norm * (1 << (shift + 1)) <= lim:
+            shift += 1
+    s = (1 << (frac + shift))
+    return array('i', (round(c * s) for c in coeffs)), shift
+
+
+# Integer coefficients and shift for fir. Args as per sg_coeffs and quantise.
+def sg_fir(n, order=2, deriv=0, lag=None, bits=18, frac=0):
+    return quantise(sg_coeffs(n, order, deriv, lag), bits, frac)
+
+
+class SavGol:
+    # n, order, lag: as per sg_coeffs. bits: as per quantise. frac: fractional
+    # bits of the slope and curvature results.
+    def __init__(self, n, order=2, lag=None, bits=18, frac=8):
+        sets = [sg_fir(n, order, d, lag, bits, frac if d else 0) for d in range(3)]
+        co = []
+        for c, _ in sets:
+            co.extend(c)
+        self._coeffs = array('i', co + [s for _, s in sets])
+        self._data = array('i', (0 for _ in range(n + 3)))
+        self._data[0] = n
+        self._data[1] = sets[0][1]  # Value alone may be computed by fir
+        self._frac = frac
+        # Integer results: value, slope * 2**frac, curvature * 2**frac
+        self.results = array('i', (0, 0, 0))
+
+    # Filter a sample returning the smoothed value. Slope and curvature are
+    # placed in results. May be called from a hard ISR.
+    def __call__(self, x):
+        return sg_step(self._data, self._coeffs, self.results, x)
+
+    # Most recent smoothed value.
+    @property
+    def value(self):
+        return self.results[0]
+
+    # Most recent slope (per sample) as a float.
+    @property
+    def slope(self):
+        return self.results[1] / (1 << self._frac)
+
+    # Most recent curvature (second derivative per sample) as a float.
+    @property
+    def curvature(self):
+        return self.results[2] / (1 << self._frac)
+
+    # Clear the history.
+    def reset(self):
+        self.prime(0)
+
+    # Fill the history with a value, avoiding the start up transient.
+    def prime(self, value):
+        prime_fir(self._data, value)
+        r = self.results
+        r[0] = value
+        r[1] = 0
+        r[2] = 0
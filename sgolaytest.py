@@ -0,0 +1,83 @@
+# sgolaytest.py Test/demo of Savitzky-Golay filters
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Checks coefficients against published values, exact recovery of a
+# polynomial signal, zero delay with lag == 0, and the results of the fused
+# kernel. Runs on any platform.
+
+from time import ticks_us, ticks_diff
+from sgolay import sg_coeffs, sg_fir, SavGol
+
+
+def close(a, b, tol):
+    return all(abs(x - y) < tol for x, y in zip(a, b))
+
+
+# Published 5 point quadratic sets
+def test_coeffs():
+    ok = close(sg_coeffs(5), [v / 35 for v in (-3, 12, 17, 12, -3)], 1e-5)
+    ok = ok and close(sg_coeffs(5, 2, 1), [v / 10 for v in (-2, -1, 0, 1, 2)], 1e-5)
+    ok = ok and close(sg_coeffs(5, 2, 2), [v / 7 for v in (2, -1, -2, -1, 2)], 1e-5)
+    ok = ok and close(sg_coeffs(7, 3), [v / 21 for v in (-2, 3, 6, 7, 6, 3, -2)], 1e-5)
+    ok = ok and not any(sg_coeffs(9, 1, 2))  # Curvature of a line
+    print('Coefficients', 'Pass' if ok else 'FAIL')
+    return ok
+
+
+# A quadratic passes through unchanged: check value, slope and curvature at
+# the point of evaluation.
+def test_poly(n, lag):
+    sg = SavGol(n, 2, lag)
+    p = lambda t: 0.5 * t * t - 30 * t + 1000
+    ok = True
+    d = (n - 1) / 2 if lag is None else lag
+    for k in range(3 * n):
+        sg(round(p(k)))
+        if k >= n - 1:
+            t = k - d
+            ok = ok and abs(sg.value - p(t)) <= 1
+            ok = ok and abs(sg.slope - (t - 30)) < 0.1
+            ok = ok and abs(sg.curvature - 1) < 0.05
+    print('Polynomial n={} lag={}'.format(n, d), 'Pass' if ok else 'FAIL')
+    return ok
+
+
+# The fused kernel matches direct evaluation of the integer sets
+def test_fused():
+    n = 25
+    sg = SavGol(n, 3, frac=6)
+    sets = [sg_fir(n, 3, d, None, 18, 6 if d else 0) for d in range(3)]
+    hist = [0] * n
+    ok = True
+    for k in range(200):
+        x = ((k * 37) % 101) * 40 - 2000
+        hist = hist[1:] + [x]
+        v = sg(x)
+        ref = [(sum(c * h for c, h in zip(co, hist)) + ((1 << s) >> 1)) >> s for co, s in sets]
+        ok = ok and v == ref[0] and list(sg.results) == ref
+    sg.prime(1000)
+    ok = ok and sg(1000) == 1000 and sg.results[1] == 0
+    print('Fused kernel', 'Pass' if ok else 'FAIL')
+    t = ticks_us()
+    sg(0)
+    print('{} tap value, slope and curvature {}μs'.format(n, ticks_diff(ticks_us(), t)))
+    return ok
+
+
+def test_errors():
+    for args in ((5, 5), (5, 2, 0, 5)):
+        try:
+            sg_coeffs(*args)
+            return False
+        except ValueError:
+            pass
+    return True
+
+ok = test_coeffs()
+ok = test_poly(21, None) and ok
+ok = test_poly(21, 0) and ok
+ok = test_poly(10, 3) and ok
+ok = test_fused() and ok
+ok = test_errors() and ok
+print('All tests pass' if ok else 'FAILURES')
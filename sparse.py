@@ -0,0 +1,148 @@
+# sparse.py Sparse coefficient FIR filters
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Where most coefficients are zero (comb filters, multipath or echo models)
+# only the nonzero taps are stored as (delay, coefficient) pairs packed into an
+# integer array [d0, c0, d1, c1...]. A delay of 0 is applied to the most
+# recent sample. Cost is proportional to the number of nonzero taps, while the
+# span (maximum delay + 1) may be long.
+# As in fir.py each product is shifted right before summing.
+
+from array import array
+
+# Flags as per non_realtime/filt.py
+WRAP = const(1)
+REVERSE = const(4)
+COPY = const(8)
+
+
+# Pack an iterable of (delay, coeff) pairs
+def pack(pairs):
+    taps = array('i')
+    for d, c in pairs:
+        if d < 0:
+            raise ValueError('Delays must be >= 0.')
+        taps.append(d)
+        taps.append(c)
+    if not len(taps):
+        raise ValueError('At least one tap is required.')
+    return taps
+
+
+# Pack the nonzero elements of a dense coefficient array in fir order (oldest
+# first: coeffs[-1] is applied to the most recent sample).
+def from_dense(coeffs):
+    n = len(coeffs)
+    return pack((n - 1 - i, c) for i, c in enumerate(coeffs) if c)
+
+
+def span(taps):
+    return max(taps[k] for k in range(0, len(taps), 2)) + 1
+
+
+# Realtime kernel. State: [span, shift, insertion index, ntaps, ring buffer...]
+@micropython.viper
+def _sfir(st, taps, x: int) -> int:
+    s = ptr32(st)
+    t = ptr32(taps)
+    sp: int = s[0]
+    shift: int = s[1]
+    p: int = s[2]
+    nt2: int = s[3] * 2
+    s[4 + p] = x
+    res: int = 0
+    k: int = 0
+    while k < nt2:
+        j: int = p - t[k]
+        if j < 0:
+            j += sp
+        res += (t[k + 1] * s[4 + j]) >> shift
+        k += 2
+    s[2] = (p + 1) if (p < sp - 1) else 0
+    return res
+
+
+class SparseFIR:
+    def __init__(self, taps, shift=0):
+        if not 0 <= shift <= 31:
+            raise ValueError('Shift must be in range 0-31.')
+        sp = span(taps)
+        self._taps = taps
+        self._st = array('i', (0 for _ in range(sp + 4)))
+        self._st[0] = sp
+        self._st[1] = shift
+        self._st[3] = len(taps) // 2
+
+    # Filter one sample. May be called from a hard ISR.
+    def __call__(self, x):
+        return _sfir(self._st, self._taps, x)
+
+    def reset(self):
+        st = self._st
+        for i in range(4, len(st)):
+            st[i] = 0
+        st[2] = 0
+
+
+# Batch version with the same args as dcf. Samples are unsigned half words,
+# results are integers. setup is an integer array:
+# [no. of samples, no. of taps, flags, decimate, offset, shift]
+# Flags WRAP, REVERSE and COPY are as per dcf (SCALE is not supported: use
+# shift). Offset -1 causes the mean to be used. In the absence of WRAP the span
+# of the taps determines the number of results in the same way as the number
+# of coefficients does for dcf. REVERSE reverses the delays within the span.
+# Returns the number of results.
+@micropython.viper
+def sdcf(samples, op, taps, setup) -> int:
+    x = ptr16(samples)
+    o = ptr32(op)
+    t = ptr32(taps)
+    s = ptr32(setup)
+    n: int = s[0]
+    nt2: int = s[1] * 2
+    flags: int = s[2]
+    dec: int = s[3]
+    offs: int = s[4]
+    shift: int = s[5]
+    if dec < 1:
+        dec = 1
+    sp: int = 0
+    k: int = 0
+    while k < nt2:
+        if t[k] >= sp:
+            sp = t[k] + 1
+        k += 2
+    nres: int = n if (flags & WRAP) else n - sp + 1
+    nres = nres // dec
+    j: int = 0
+    if offs < 0:  # Calculate mean
+        offs = 0
+        while j < n:
+            offs += x[j]
+            j += 1
+        offs = offs // n
+    rev: int = flags & REVERSE
+    j = 0
+    while j < nres:
+        idx: int = n - 1 - (nres - 1 - j) * dec  # Sample for this result
+        acc: int = 0
+        k = 0
+        while k < nt2:
+            d: int = (sp - 1 - t[k]) if rev else t[k]
+            i: int = idx - d
+            if i < 0:
+                i += n
+            acc += (t[k + 1] * (x[i] - offs)) >> shift
+            k += 2
+        o[j] = acc
+        j += 1
+    if flags & COPY:
+        j = 0
+        while j < nres:
+            x[j] = o[j] + offs
+            j += 1
+        while j < n:
+            x[j] = offs
+            j += 1
+    return nres
@@ -0,0 +1,50 @@
+# sparsetest.py Test/demo of sparse FIR filters
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# A 200 tap echo model with four nonzero taps is run as a sparse filter and
+# compared with the equivalent dense filter. The batch version is compared
+# with the realtime one.
+
+from array import array
+from time import ticks_us, ticks_diff
+from fir_py import create_fir
+from sparse import SparseFIR, from_dense, sdcf
+
+NTAPS = 200
+dense = array('i', (0 for _ in range(NTAPS)))
+dense[-1] = 1000  # Direct path
+dense[-40] = 500  # Echo at 39 samples
+dense[-120] = -250
+dense[0] = 100  # Echo at 199 samples
+
+def signal(n):
+    return 2048 + ((n * 37) % 101) * 10
+
+def test():
+    taps = from_dense(dense)
+    sf = SparseFIR(taps, 4)
+    df = create_fir(dense, 4)
+    ok = True
+    for n in range(500):
+        x = signal(n) - 2048
+        ok = ok and sf(x) == df(x)
+    print('Sparse matches dense', ok)
+    # Batch: no wrap, offset 2048, no decimation.
+    samples = array('H', (signal(n) for n in range(500)))
+    op = array('i', (0 for _ in range(500)))
+    setup = array('i', (len(samples), len(taps) // 2, 0, 1, 2048, 4))
+    nres = sdcf(samples, op, taps, setup)
+    sf.reset()
+    res = [sf(signal(n) - 2048) for n in range(500)][NTAPS - 1:]
+    ok = nres == len(res) and all(op[i] == res[i] for i in range(nres))
+    print('Batch results', nres, 'match' if ok else 'MISMATCH')
+    t = ticks_us()
+    sf(0)
+    t1 = ticks_diff(ticks_us(), t)
+    t = ticks_us()
+    df(0)
+    t2 = ticks_diff(ticks_us(), t)
+    print('Sparse {}μs dense {}μs'.format(t1, t2))
+
+test()
@@ -0,0 +1,384 @@
+# thumb_emu.py Run asm_thumb functions under CPython on a PC.
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Interprets the subset of the MicroPython inline assembler used in this repo
+# (fir.py, avg.py, avg_pico.py and non_realtime/filt.py) so that the kernels
+# may be tested and benchmarked without hardware, e.g. in CI. The source file
+# is parsed rather than imported; functions decorated with
+# @micropython.asm_thumb are executed against array arguments, which are
+# updated in place. Integer args are passed by value.
+
+# Supported: mov add sub neg mul sdiv udiv cmp tst and_ orr eor bic mvn lsl lsr
+# asr ldr ldrh ldrb str strh strb push pop label b<cond> it blocks vmov vldr
+# vstr vadd vsub vmul vdiv vneg vsqrt vcvt_f32_s32 vcvt_s32_f32.
+# Unsupported instructions (including data()) raise Fault when executed.
+
+# Cycle counts are approximate, per instruction class. Tables are provided for
+# Cortex-M4 (Pyboard) and Cortex-M0+ (Pico). Instructions which a core does
+# not implement raise Fault.
+
+import ast
+import math
+import struct
+import sys
+
+CORTEX_M4 = {
+    'alu': 1, 'mul': 1, 'div': 12, 'load': 2, 'store': 1, 'branch': 3,
+    'nobranch': 1, 'stack': 1, 'it': 1, 'skipped': 1, 'vmov': 1, 'vload': 2,
+    'vstore': 2, 'vfp': 1, 'vdiv': 14, 'vcvt': 1,
+}
+# ARMv6-M: no divide, IT blocks or floating point.
+CORTEX_M0P = {
+    'alu': 1, 'mul': 1, 'div': None, 'load': 2, 'store': 2, 'branch': 2,
+    'nobranch': 1, 'stack': 1, 'it': None, 'skipped': None, 'vmov': None,
+    'vload': None, 'vstore': None, 'vfp': None, 'vdiv': None, 'vcvt': None,
+}
+
+_CONDS = ('eq', 'ne', 'cs', 'cc', 'mi', 'pl', 'vs', 'vc', 'hi', 'ls', 'ge', 'lt',
+          'gt', 'le', 'al', 'hs', 'lo')
+_INVERSE = {'hs': 'lo', 'lo': 'hs', 'al': 'al'}
+_INVERSE.update((c, _CONDS[i ^ 1]) for i, c in enumerate(_CONDS[:14]))
+_ALU = ('mov', 'add', 'sub', 'neg', 'cmp', 'tst', 'and_', 'orr', 'eor', 'bic',
+        'mvn', 'lsl', 'lsr', 'asr')
+
+
+def _div(a, b):
+    if b:
+        return a / b
+    if a == 0 or a != a:
+        return math.nan
+    return math.copysign(math.inf, a) * math.copysign(1, b)
+
+
+_VFP = {'vadd': lambda a, b: a + b, 'vsub': lambda a, b: a - b,
+        'vmul': lambda a, b: a * b, 'vdiv': _div}
+_MASK = 0xffffffff
+_BASE = 0x20000000  # Address of first array arg
+_SPAN = 0x01000000  # Address space per arg
+
+
+class Fault(Exception):
+    pass
+
+
+def _signed(v):
+    return v - (1 << 32) if v & 0x80000000 else v
+
+
+def _f32(bits):
+    return struct.unpack('<f', struct.pack('<I', bits))[0]
+
+
+def _bits(f):  # Round to single precision
+    try:
+        return struct.unpack('<I', struct.pack('<f', f))[0]
+    except OverflowError:
+        return struct.unpack('<I', struct.pack('<f', math.copysign(math.inf, f)))[0]
+
+
+class _Mem:
+    def __init__(self, args):
+        self.regions = []
+        self.values = []
+        for n, a in enumerate(args):
+            if isinstance(a, int):
+                self.values.append(a & _MASK)
+            else:
+                mv = memoryview(a).cast('B')
+                base = _BASE + n * _SPAN
+                self.regions.append((base, mv))
+                self.values.append(base)
+
+    def _find(self, addr, size):
+        for base, mv in self.regions:
+            if base <= addr and addr + size <= base + len(mv):
+                return mv, addr - base
+        raise Fault('Access of {} bytes at 0x{:08x} is outside all arrays'.format(size, addr))
+
+    def read(self, addr, size):
+        if addr % size:
+            raise Fault('Unaligned access at 0x{:08x}'.format(addr))
+        mv, off = self._find(addr, size)
+        return int.from_bytes(mv[off:off + size], 'little')
+
+    def write(self, addr, size, v):
+        if addr % size:
+            raise Fault('Unaligned access at 0x{:08x}'.format(addr))
+        mv, off = self._find(addr, size)
+        mv[off:off + size] = (v & ((1 << (8 * size)) - 1)).to_bytes(size, 'little')
+
+
+class Emulator:
+    def __init__(self, filename, core=CORTEX_M4):
+        with open(filename) as f:
+            tree = ast.parse(f.read(), filename)
+        self.core = core
+        self.consts = {}
+        self.functions = {}
+        for node in tree.body:
+            if isinstance(node, ast.Assign) and len(node.targets) == 1:
+                v = node.value
+                if isinstance(v, ast.Call) and getattr(v.func, 'id', None) == 'const':
+                    v = v.args[0]
+                if isinstance(v, ast.Constant) and isinstance(v.value, int):
+                    self.consts[node.targets[0].id] = v.value
+            elif isinstance(node, ast.FunctionDef) and any(
+                    getattr(d, 'attr', None) == 'asm_thumb' for d in node.decorator_list):
+                self.functions[node.name] = self._compile(node)
+        self.reset_stats()
+
+    # Convert a function body to a list of (op, operands, lineno) and labels.
+    def _compile(self, fn):
+        code = []
+        labels = {}
+        for stmt in fn.body:
+            if not (isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call)):
+                raise Fault('Line {}: not an instruction'.format(stmt.lineno))
+            call = stmt.value
+            op = call.func.id
+            args = [self._operand(a, stmt.lineno) for a in call.args]
+            if op == 'label':
+                labels[args[0][1]] = len(code)
+            code.append((op, args, stmt.lineno))
+        return code, labels, len(fn.args.args)
+
+    def _operand(self, a, line):
+        if isinstance(a, ast.Name):
+            n = a.id
+            if n[0] in 'rs' and n[1:].isdigit():
+                return (n[0], int(n[1:]))
+            if n in ('sp', 'lr', 'pc'):
+                return ('r', {'sp': 13, 'lr': 14, 'pc': 15}[n])
+            if n in _CONDS:
+                return ('cond', n)
+            if n in self.consts:
+                return ('imm', self.consts[n])
+            return ('label', n)
+        if isinstance(a, ast.Constant):
+            return ('imm', a.value)
+        if isinstance(a, ast.UnaryOp) and isinstance(a.op, ast.USub):
+            return ('imm', -self._operand(a.operand, line)[1])
+        if isinstance(a, ast.List):
+            return ('mem', self._operand(a.elts[0], line)[1],
+                    self._operand(a.elts[1], line)[1] if len(a.elts) > 1 else 0)
+        if isinstance(a, ast.Set):
+            return ('list', sorted(self._operand(e, line)[1] for e in a.elts))
+        raise Fault('Line {}: unsupported operand'.format(line))
+
+    def reset_stats(self):
+        self.counts = {}
+        self.cycles = {}
+
+    def _tally(self, cls, n=1):
+        c = self.core.get(cls)
+        if c is None:
+            raise Fault('Line {}: instruction not supported by this core'.format(self._line))
+        self.counts[cls] = self.counts.get(cls, 0) + 1
+        self.cycles[cls] = self.cycles.get(cls, 0) + c * n
+
+    @property
+    def total(self):
+        return sum(self.cycles.values())
+
+    def report(self):
+        lines = ['{:10s} {:>8s} {:>8s}'.format('Class', 'Count', 'Cycles')]
+        for cls in sorted(self.counts):
+            lines.append('{:10s} {:8d} {:8d}'.format(cls, self.counts[cls], self.cycles[cls]))
+        lines.append('{:10s} {:8d} {:8d}'.format('Total', sum(self.counts.values()), self.total))
+        return '\n'.join(lines)
+
+    def _cond(self, c):
+        n, z, cy, v = self.flags
+        return {'eq': z, 'ne': not z, 'cs': cy, 'hs': cy, 'cc': not cy, 'lo': not cy,
+                'mi': n, 'pl': not n, 'vs': v, 'vc': not v, 'hi': cy and not z,
+                'ls': not cy or z, 'ge': n == v, 'lt': n != v, 'gt': not z and n == v,
+                'le': z or n != v, 'al': True}[c]
+
+    def _nz(self, r):
+        self.flags[0] = bool(r & 0x80000000)
+        self.flags[1] = r == 0
+
+    def _addc(self, a, b, carry):  # a + b + carry setting all flags
+        r = a + b + carry
+        res = r & _MASK
+        self._nz(res)
+        self.flags[2] = r > _MASK
+        self.flags[3] = ((a ^ res) & (b ^ res) & 0x80000000) != 0
+        return res
+
+    # Run function fname with args (arrays or ints). Returns r0 as a signed
+    # integer. Cycle counts accumulate until reset_stats() is called.
+    def run(self, fname, *args, maxsteps=10_000_000):
+        code, labels, nargs = self.functions[fname]
+        if len(args) != nargs:
+            raise Fault('{} takes {} args'.format(fname, nargs))
+        mem = _Mem(args)
+        r = [0] * 16
+        r[:len(args)] = mem.values
+        s = [0] * 32
+        self.flags = [False, False, False, False]
+        stack = []
+        it = []  # Conditions of remaining IT block instructions
+        pc = 0
+        steps = 0
+        while pc < len(code):
+            steps += 1
+            if steps > maxsteps:
+                raise Fault('Step limit exceeded')
+            op, a, self._line = code[pc]
+            pc += 1
+            setflags = not it  # 16 bit instructions set flags outside IT
+            if it:
+                if not self._cond(it.pop(0)):
+                    self._tally('skipped')
+                    continue
+            if op == 'label':
+                continue
+            if op.startswith('it') and op[2:].replace('t', '').replace('e', '') == '':
+                self._tally('it')
+                c = a[0][1]
+                it = [c] + [c if x == 't' else _INVERSE[c] for x in op[2:]]
+                continue
+            if op == 'b' or (op[0] == 'b' and op[1:] in _CONDS):
+                if op == 'b' or self._cond(op[1:]):
+                    self._tally('branch')
+                    pc = labels[a[0][1]]
+                else:
+                    self._tally('nobranch')
+                continue
+            try:
+                self._exec(op, a, r, s, mem, stack, setflags)
+            except (IndexError, KeyError, TypeError):
+                raise Fault('Line {}: invalid operands for {}'.format(self._line, op))
+        if stack:
+            raise Fault('Stack not balanced on exit')
+        return _signed(r[0])
+
+    def _exec(self, op, a, r, s, mem, stack, setflags):
+        line = self._line
+        kind = [x[0] for x in a]
+        v = [x[1] for x in a]
+        if op in _ALU:
+            self._tally('alu')
+            d = v[0]
+            src = [r[x[1]] if x[0] == 'r' else x[1] & _MASK for x in a[1:]]
+            flags = setflags and d < 8 and not (op == 'mov' and kind[1] == 'r')
+            if op == 'mov':
+                res = src[0]
+                if flags:
+                    self._nz(res)
+            elif op in ('add', 'sub', 'cmp'):
+                x, y = (r[d], src[0]) if len(src) == 1 else src
+                if op == 'add':
+                    res = self._addc(x, y, 0) if flags else (x + y) & _MASK
+                else:
+                    res = self._addc(x, ~y & _MASK, 1) if (flags or op == 'cmp') else (x - y) & _MASK
+                if op == 'cmp':
+                    return
+            elif op == 'neg':
+                res = self._addc(0, ~src[0] & _MASK, 1) if flags else -src[0] & _MASK
+            elif op in ('lsl', 'lsr', 'asr'):
+                x, n = (r[d], src[0] & 0xff) if len(src) == 1 else src
+                if op == 'lsl':
+                    res = (x << n) & _MASK
+                elif op == 'lsr':
+                    res = x >> n if n < 32 else 0
+                else:
+                    res = (_signed(x) >> min(n, 32)) & _MASK
+                if flags:
+                    self._nz(res)
+            else:
+                x, y = (r[d], src[0]) if len(src) == 1 else src
+                res = {'tst': x & y, 'and_': x & y, 'orr': x | y, 'eor': x ^ y,
+                       'bic': x & ~y & _MASK, 'mvn': ~y & _MASK}[op]
+                if op == 'mvn':
+                    res = ~src[0] & _MASK
+                if flags or op == 'tst':
+                    self._nz(res)
+                if op == 'tst':
+                    return
+            r[d] = res
+        elif op == 'mul':
+            self._tally('mul')
+            r[v[0]] = (r[v[0]] * r[v[1]]) & _MASK
+            if setflags:
+                self._nz(r[v[0]])
+        elif op in ('sdiv', 'udiv'):
+            self._tally('div')
+            n, d = r[v[1]], r[v[2]]
+            if op == 'sdiv':
+                n, d = _signed(n), _signed(d)
+            q = 0 if d == 0 else abs(n) // abs(d) * (1 if (n < 0) == (d < 0) else -1)
+            r[v[0]] = q & _MASK
+        elif op in ('ldr', 'ldrh', 'ldrb', 'str', 'strh', 'strb'):
+            size = {'': 4, 'h': 2, 'b': 1}[op[3:]]
+            addr = (r[a[1][1]] + a[1][2]) & _MASK
+            if op[0] == 'l':
+                self._tally('load')
+                r[v[0]] = mem.read(addr, size)
+            else:
+                self._tally('store')
+                mem.write(addr, size, r[v[0]])
+        elif op == 'push':
+            self._tally('stack', 1 + len(v[0]))
+            stack.extend(r[x] for x in v[0])
+        elif op == 'pop':
+            self._tally('stack', 1 + len(v[0]))
+            if len(stack) < len(v[0]):
+                raise Fault('Line {}: stack underflow'.format(line))
+            vals = stack[-len(v[0]):]
+            del stack[-len(v[0]):]
+            for x, val in zip(v[0], vals):
+                r[x] = val
+        elif op == 'vmov':
+            self._tally('vmov')
+            if kind == ['s', 'r']:
+                s[v[0]] = r[v[1]]
+            elif kind == ['r', 's']:
+                r[v[0]] = s[v[1]]
+            else:
+                s[v[0]] = s[v[1]]
+        elif op in ('vldr', 'vstr'):
+            addr = (r[a[1][1]] + a[1][2]) & _MASK
+            if op == 'vldr':
+                self._tally('vload')
+                s[v[0]] = mem.read(addr, 4)
+            else:
+                self._tally('vstore')
+                mem.write(addr, 4, s[v[0]])
+        elif op in _VFP:
+            self._tally('vdiv' if op == 'vdiv' else 'vfp')
+            s[v[0]] = _bits(_VFP[op](_f32(s[v[1]]), _f32(s[v[2]])))
+        elif op in ('vneg', 'vsqrt'):
+            self._tally('vdiv' if op == 'vsqrt' else 'vfp')
+            f = _f32(s[v[1]])
+            s[v[0]] = _bits(-f if op == 'vneg' else (math.sqrt(f) if f >= 0 else math.nan))
+        elif op == 'vcvt_f32_s32':
+            self._tally('vcvt')
+            s[v[0]] = _bits(float(_signed(s[v[1]])))
+        elif op == 'vcvt_s32_f32':  # Round towards zero, saturating
+            self._tally('vcvt')
+            f = _f32(s[v[1]])
+            if f != f:  # NaN
+                i = 0
+            elif abs(f) == math.inf:
+                i = 0x7fffffff if f > 0 else -0x80000000
+            else:
+                i = max(min(int(f), 0x7fffffff), -0x80000000)
+            s[v[0]] = i & _MASK
+        else:
+            raise Fault('Line {}: unsupported instruction {}'.format(line, op))
+
+
+def main(argv):
+    if len(argv) < 1:
+        print('Usage: python3 thumb_emu.py file.py  # List asm_thumb functions')
+        return
+    emu = Emulator(argv[0])
+    for name, (code, _, nargs) in emu.functions.items():
+        print('{}: {} args, {} instructions'.format(name, nargs, len(code)))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
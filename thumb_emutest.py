@@ -0,0 +1,111 @@
+# thumb_emutest.py Test the assembler kernels using thumb_emu.py
+# Runs under CPython on a PC.
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Results of fir, avg, avg_pico, dcf and dcf_fp are compared with Python
+# reference implementations and cycle counts are reported.
+
+from array import array
+import random
+from thumb_emu import Emulator, Fault, CORTEX_M0P
+
+random.seed(1)
+
+def test_fir():
+    emu = Emulator('fir.py')
+    coeffs = array('i', (random.randint(-4000, 4000) for _ in range(21)))
+    data = array('i', [0] * (len(coeffs) + 3))
+    data[0] = len(coeffs)
+    data[1] = 12
+    hist = [0] * len(coeffs)
+    ok = True
+    for _ in range(100):
+        x = random.randint(-2048, 2047)
+        hist = hist[1:] + [x]  # Oldest first
+        exp = sum((c * v) >> 12 for c, v in zip(coeffs, hist))
+        ok = ok and emu.run('fir', data, coeffs, x) == exp
+    print('fir', 'Pass' if ok else 'FAIL')
+    emu.reset_stats()
+    emu.run('fir', data, coeffs, 0)
+    print(emu.report())
+    return ok
+
+def test_avg(fn, fname, shift, core=None):
+    emu = Emulator(fn) if core is None else Emulator(fn, core)
+    n = 8
+    data = array('i', [0] * (n + 3))
+    data[0] = n + 3
+    hist = [0] * n
+    ok = True
+    for _ in range(50):
+        x = random.randint(-1000, 3000)
+        hist = hist[1:] + [x]
+        s = sum(hist)
+        if shift is None:
+            exp = abs(s) // n * (1 if s >= 0 else -1)  # sdiv truncates towards 0
+            res = emu.run(fname, data, x)
+        else:
+            exp = s >> shift
+            res = emu.run(fname, data, x, shift)
+        ok = ok and res == exp
+    print(fn, 'Pass' if ok else 'FAIL', '({} cycles per call)'.format(emu.total // 50))
+    return ok
+
+def ref_dcf(samples, coeffs, setup, scale):
+    n, nc, flags, dec, offs = setup
+    mean = sum(samples) / n if offs < 0 else offs
+    nres = (n if flags & 1 else n - nc + 1) // max(dec, 1)
+    res = []
+    for j in range(nres):
+        s = n - 1 - (nres - 1 - j) * dec
+        acc = 0.0
+        for t in range(nc):
+            c = coeffs[t] if flags & 4 else coeffs[nc - 1 - t]
+            acc += c * (samples[(s - t) % n] - mean)
+        res.append(acc * (scale if flags & 2 else 1))
+    return res, mean
+
+def test_dcf(fname, tc):
+    emu = Emulator('non_realtime/filt.py')
+    coeffs = array('f', (random.uniform(-1, 1) for _ in range(9)))
+    ok = True
+    for flags in range(16):
+        for dec in (1, 3):
+            for offs in (2048, -1):
+                samples = array(tc, (2048 + random.randint(-1000, 1000) for _ in range(40)))
+                orig = list(samples)
+                op = array('f', [0] * len(samples))
+                op[0] = 1.5
+                setup = array('i', (len(samples), len(coeffs), flags, dec, offs))
+                n = emu.run(fname, samples, op, coeffs, setup)
+                exp, mean = ref_dcf(orig, coeffs, setup, 1.5)
+                good = n == len(exp) and all(abs(op[i] - exp[i]) < 1e-2 for i in range(n))
+                if flags & 8:  # COPY: dcf truncates to 16 bits
+                    for i in range(len(samples)):
+                        v = exp[i] + mean if i < n else mean
+                        err = (samples[i] - int(v)) & 0xffff if tc == 'H' else samples[i] - v
+                        good = good and (err in (0, 1, 0xffff) if tc == 'H' else abs(err) < 1e-2)
+                if not good:
+                    print(fname, 'FAIL flags', flags, 'decimate', dec, 'offset', offs)
+                ok = ok and good
+    print(fname, 'Pass' if ok else 'FAIL')
+    return ok
+
+def test_core():  # sdiv and IT are not available on ARMv6-M
+    try:
+        Emulator('avg.py', CORTEX_M0P).run('avg', array('i', (4, 0, 0, 0)), 1)
+    except Fault:
+        print('avg.py on Cortex-M0+: Fault raised as expected')
+        return True
+    print('avg.py on Cortex-M0+: FAIL no Fault')
+    return False
+
+ok = test_fir()
+ok = test_avg('avg.py', 'avg', None) and ok
+ok = test_avg('avg_pico.py', 'avg', 3) and ok
+ok = test_avg('avg_pico.py', 'avg', 3, CORTEX_M0P) and ok
+ok = test_dcf('dcf', 'H') and ok
+ok = test_dcf('dcf_fp', 'f') and ok
+ok = test_core() and ok
+print('All tests pass' if ok else 'FAILURES')